@@ -0,0 +1,165 @@
+"""
+Backend HTTP falso para benchmarks offline.
+
+Sirve respuestas sintéticas con tamaños y latencia configurables:
+  - listados paginados (/rat, /eipd, /activos/...): {"items", "pages", "total"}
+  - indicadores (*/indicadores): {"total": ..., ...}
+  - catálogos (/catalogos/*, /setup/*, */catalogo): [{"id", "nombre"}]
+  - POST /trazabilidad/consulta: lista de resultados de APIs para el RUN
+  - cualquier otro GET: un registro simple
+
+Uso:
+    backend = FakeBackend(rows=500, catalog_size=2000, latency_ms=20)
+    base_url = backend.start()
+    ...
+    backend.stop()
+"""
+
+import json
+import math
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+
+REGIONES = ["Región de Ñuble", "Región Metropolitana", "Región de Valparaíso", "Región del Biobío"]
+ESTADOS = ["ACTIVO", "INACTIVO", "EN REVISIÓN"]
+
+
+class FakeBackend:
+    def __init__(self, rows=200, catalog_size=500, trace_results=25, latency_ms=0.0, fields=None):
+        self.rows = rows
+        self.catalog_size = catalog_size
+        self.trace_results = trace_results
+        self.latency_ms = latency_ms
+        # Campos extra que deben venir en cada registro (p.ej. las columnas de las grillas)
+        self.fields = list(fields or [])
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._cache = {}
+
+    # ===============================
+    # Ciclo de vida
+    # ===============================
+    def start(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                backend._serve(self, "GET")
+
+            def do_POST(self):
+                backend._serve(self, "POST")
+
+            def do_PUT(self):
+                backend._serve(self, "PUT")
+
+            def log_message(self, *_args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            # El backlog por defecto (5) provoca reintentos de SYN de 1 s bajo concurrencia
+            request_queue_size = 128
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # ===============================
+    # Respuestas sintéticas
+    # ===============================
+    def record(self, i, prefix="reg"):
+        record = {
+            "id": f"{prefix}-{i}",
+            "nombre": f"Registro {i}",
+            "estado": ESTADOS[i % len(ESTADOS)],
+            "region": REGIONES[i % len(REGIONES)],
+            "created_at": "2025-01-01T10:00:00",
+        }
+        for field in self.fields:
+            record.setdefault(field, f"{field} {i}")
+        return record
+
+    def listado(self, path, page, size):
+        total = self.rows
+        start = (page - 1) * size
+        prefix = path.strip("/").split("/")[0] or "reg"
+        items = [self.record(i, prefix) for i in range(start, min(total, start + size))]
+        return {"items": items, "pages": max(1, math.ceil(total / size)), "total": total, "page": page}
+
+    def catalogo(self, path):
+        name = path.rstrip("/").rsplit("/", 1)[-1]
+        return [{"id": f"{name}-{i}", "nombre": f"{name.replace('-', ' ').title()} {i} {REGIONES[i % 4]}"}
+                for i in range(self.catalog_size)]
+
+    def trazabilidad(self, run):
+        return [
+            {
+                "origen": ["Registro Civil", "IPS", "SII"][i % 3],
+                "api_nombre": f"API_{i}_CONSULTA",
+                "tipo": "API",
+                "fecha_consulta": "2025-01-01 10:00",
+                "response_payload": {"data": [{"RUN": run, "DN_NOMBRE": f"Persona {i}", "CD_ESTADO": i}]},
+            }
+            for i in range(self.trace_results)
+        ]
+
+    def _route(self, method, path, query, body):
+        if method == "POST" and path.startswith("/trazabilidad/consulta"):
+            return self.trazabilidad((body or {}).get("run", ""))
+        if method in ("POST", "PUT"):
+            return {"id": "nuevo-1", **(body or {})}
+        if path.endswith("/indicadores"):
+            return {"total": self.rows, "activos": self.rows // 2, "pendientes": self.rows // 4}
+        if path.startswith(("/catalogos", "/setup")) or path.endswith("/catalogo"):
+            return self.catalogo(path)
+        if path == "/users/me":
+            return {"id": "bench", "nombre_completo": "Benchmark"}
+        if path.endswith("/permissions"):
+            return {"privileges": []}
+        if "page" in query or path.count("/") == 1 or path.endswith("/catalogos"):
+            return self.listado(path, int(query.get("page", 1)), int(query.get("size", 10)))
+        return self.record(0, path.strip("/").split("/")[0])
+
+    def _serve(self, handler, method):
+        with self._lock:
+            self.hits += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+
+        parts = urlsplit(handler.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        body = None
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            try:
+                body = json.loads(handler.rfile.read(length))
+            except ValueError:
+                body = None
+
+        # Las respuestas GET se serializan una vez por URL: se mide al cliente, no al servidor
+        key = (method, handler.path) if method == "GET" else None
+        data = self._cache.get(key) if key else None
+        if data is None:
+            data = json.dumps(self._route(method, parts.path, query, body), ensure_ascii=False).encode("utf-8")
+            if key:
+                self._cache[key] = data
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
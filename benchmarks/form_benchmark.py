@@ -0,0 +1,323 @@
+"""
+Benchmark de construcción e hidratación de formularios (Qt offscreen, sin backend).
+
+Arma cada diálogo a partir de cada config de src/config/formularios/ con datos
+enlatados (catálogos sintéticos y un registro generado desde la propia config)
+y reporta tiempo y asignaciones de memoria por fase:
+
+  init_ui             GenericFormDialog._init_ui (construcción de widgets)
+  show                primer show() + procesamiento de eventos (layout/pintado)
+  combo_loading       desde _init_async_load hasta que no quedan cargas pendientes (pared)
+  on_combo_data       suma de _on_combo_data en el hilo de UI
+  try_set_values      suma de _try_set_values (hidratación en edición)
+  validate_progress   suma de _validate_steps_progress
+  payload             _build_generic_payload / _build_eipd_payload
+
+Las fases son inclusivas (p.ej. on_combo_data puede contener try_set_values).
+Las asignaciones se miden en una pasada aparte con tracemalloc para no
+distorsionar los tiempos.
+
+Uso:
+    python -m benchmarks.form_benchmark
+    python -m benchmarks.form_benchmark --only eipd.json --mode edit --repeat 5
+    python -m benchmarks.form_benchmark --catalog-size 5000 --json form_bench.json
+"""
+
+import argparse
+import glob
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+from benchmarks.run_benchmarks import ROOT_DIR, percentile, wait_until
+
+FORMS_DIR = os.path.join(ROOT_DIR, "src", "config", "formularios")
+PHASES = ["init_ui", "show", "combo_loading", "on_combo_data", "try_set_values", "validate_progress", "payload"]
+
+# Config -> (diálogo, tipo_rat del registro en edición para expandir la extensión)
+DIALOGS = {
+    "activos.json": ("ActivoDialog", None),
+    "eipd.json": ("EipdDialog", None),
+    "rat.json": ("RatDialog", None),
+    "rat_ia.json": ("RatDialog", "IA"),
+    "rat_institucional.json": ("RatDialog", "PROCESO"),
+    "rat_simplificado.json": ("RatDialog", "SIMPLIFICADO"),
+}
+
+
+class PhaseRecorder:
+    """Acumula tiempo (y memoria neta si tracemalloc está activo) por fase."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.times = {}
+        self.calls = {}
+        self.allocs = {}
+
+    @contextmanager
+    def track(self, phase):
+        tracing = tracemalloc.is_tracing()
+        mem_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[phase] = self.times.get(phase, 0.0) + time.perf_counter() - started
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+            if tracing:
+                delta = tracemalloc.get_traced_memory()[0] - mem_before
+                self.allocs[phase] = self.allocs.get(phase, 0) + delta
+
+
+RECORDER = PhaseRecorder()
+
+
+def instrument(cls, method_name, phase):
+    original = getattr(cls, method_name)
+    # Los métodos conectados a señales reciben argumentos extra que Qt descarta
+    # según la firma; el wrapper genérico debe hacer lo mismo
+    params = inspect.signature(original).parameters.values()
+    varargs = any(p.kind == p.VAR_POSITIONAL for p in params)
+    max_args = None if varargs else sum(
+        1 for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)) - 1
+
+    @wraps(original)
+    def wrapper(self, *args, **kwargs):
+        if max_args is not None:
+            args = args[:max_args]
+        with RECORDER.track(phase):
+            return original(self, *args, **kwargs)
+
+    setattr(cls, method_name, wrapper)
+
+
+# ===============================
+# Datos enlatados
+# ===============================
+def iter_fields(fields):
+    for field in fields or []:
+        if field.get("type") == "group":
+            yield from iter_fields(field.get("fields", []))
+        else:
+            yield field
+
+
+def catalog_for(endpoint, size):
+    name = str(endpoint).split("?")[0].rstrip("/").rsplit("/", 1)[-1] or "catalogo"
+    return [{"id": f"{name}-{i}", "nombre": f"{name.replace('-', ' ').title()} {i}"} for i in range(size)]
+
+
+def synthetic_record(configs, catalog_size, tipo_rat=None):
+    """Un valor plausible por campo, con ids que existen en los catálogos enlatados."""
+    record = {"id": "bench-1", "estado": "EN_EDICION"}
+    for config in configs:
+        for section in config.get("sections", []):
+            for field in iter_fields(section.get("fields", [])):
+                key, ftype = field.get("key"), field.get("type")
+                if not key or key in record:
+                    continue
+                if ftype in ("combo", "combo_text") and field.get("source"):
+                    ids = [c["id"] for c in catalog_for(field["source"], max(3, min(catalog_size, 3)))]
+                    record[key] = ids[:2] if field.get("multiple") else ids[1]
+                elif ftype in ("combo_static", "combo_text"):
+                    options = field.get("options") or field.get("combo_static_options") or []
+                    ids = [o.get("id") for o in options]
+                    if ids:
+                        record[key] = ids[:2] if field.get("multiple") else ids[0]
+                elif ftype == "editable_table":
+                    columns = [c["key"] for c in field.get("columns", [])]
+                    record[key] = [{c: f"{c} {i}" for c in columns} for i in range(3)]
+                elif ftype == "text":
+                    record[key] = "2025-01-01" if field.get("control") == "calendar" else f"Texto {key}"
+                elif ftype in ("textarea", "file_textarea"):
+                    record[key] = f"Descripción de {key}. " * 8
+    if tipo_rat:
+        record["tipo_rat"] = tipo_rat
+    return record
+
+
+def install_fakes(catalog_size, record_provider):
+    """Catálogos y registro enlatados: ninguna llamada sale a la red."""
+    from src.core.api_client import ApiClient
+    from src.services.catalogo_service import CatalogoService
+
+    catalogs = {}
+
+    def get_catalogo(self, endpoint, cache_key=None):
+        # Misma lista por endpoint: igual que la caché real, permite compartir modelos
+        if endpoint not in catalogs:
+            catalogs[endpoint] = catalog_for(endpoint, catalog_size)
+        return catalogs[endpoint]
+
+    def api_get(self, path):
+        record = record_provider()
+        if record is not None and "/bench-1" in path:
+            return record
+        if path.split("?")[0].endswith("/full"):
+            # Detalle de un registro relacionado (p.ej. el RAT que precarga la EIPD)
+            return dict(record or {}, id=path.split("/")[-2])
+        return get_catalogo(None, path)
+
+    CatalogoService.get_catalogo = get_catalogo
+    ApiClient.get = api_get
+
+
+# ===============================
+# Ejecución
+# ===============================
+def build_dialog(app, config_name, mode):
+    from src.components.dialog_registry import get_dialog_class
+
+    dialog_name, _tipo = DIALOGS[config_name]
+    DialogClass = get_dialog_class(dialog_name)
+    record_id = "bench-1" if mode == "edit" else None
+
+    RECORDER.reset()
+    dialog = DialogClass(None, record_id)
+    with RECORDER.track("show"):
+        dialog.show()
+        app.processEvents()
+
+    with RECORDER.track("combo_loading"):
+        wait_until(app, lambda: dialog.pending_loads <= 0 and not dialog._hydrating, timeout=60)
+
+    with RECORDER.track("payload"):
+        if dialog.config.get("endpoint") == "/eipd":
+            dialog._build_eipd_payload()
+        else:
+            dialog._build_generic_payload()
+
+    dialog.close()
+    dialog.deleteLater()
+    app.processEvents()
+    return dict(RECORDER.times), dict(RECORDER.calls), dict(RECORDER.allocs)
+
+
+def run_case(app, config_name, mode, args):
+    samples = {phase: [] for phase in PHASES}
+    calls = {}
+    build_dialog(app, config_name, mode)  # warmup
+    for _ in range(args.repeat):
+        times, calls, _allocs = build_dialog(app, config_name, mode)
+        for phase in PHASES:
+            samples[phase].append(times.get(phase, 0.0))
+
+    allocs = {}
+    peak = 0
+    if not args.no_alloc:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        _times, _calls, allocs = build_dialog(app, config_name, mode)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    result = {"phases": {}, "peak_kb": peak / 1024}
+    for phase in PHASES:
+        values = sorted(samples[phase])
+        result["phases"][phase] = {
+            "p50_ms": percentile(values, 50) * 1000,
+            "max_ms": values[-1] * 1000 if values else 0.0,
+            "calls": calls.get(phase, 0),
+            "alloc_kb": allocs.get(phase, 0) / 1024,
+        }
+    return result
+
+
+def print_report(results, show_allocs=True):
+    header = f"{'formulario':26} {'modo':5} " + " ".join(f"{p[:14]:>14}" for p in PHASES) + f" {'peak KB':>9}"
+    print(header)
+    for (config_name, mode), result in results.items():
+        if "error" in result:
+            print(f"{config_name:26} {mode:5} ERROR: {result['error']}")
+            continue
+        cells = []
+        for phase in PHASES:
+            stats = result["phases"][phase]
+            cells.append(f"{stats['p50_ms']:8.1f}ms/{stats['calls']:<3d}"[:14].rjust(14))
+        print(f"{config_name:26} {mode:5} " + " ".join(cells) + f" {result['peak_kb']:9.0f}")
+
+    if not show_allocs:
+        return
+    print("\nAsignaciones netas por fase (KB, pasada con tracemalloc):")
+    for (config_name, mode), result in results.items():
+        if "error" in result:
+            continue
+        allocs = ", ".join(f"{p}={result['phases'][p]['alloc_kb']:.0f}" for p in PHASES)
+        print(f"  {config_name} [{mode}]: {allocs}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempos de construcción e hidratación de formularios")
+    parser.add_argument("--catalog-size", type=int, default=500, help="Opciones por catálogo enlatado")
+    parser.add_argument("--repeat", type=int, default=3, help="Muestras por formulario y modo")
+    parser.add_argument("--mode", choices=["new", "edit", "both"], default="both")
+    parser.add_argument("--only", action="append", help="Solo estos archivos de config (p.ej. eipd.json)")
+    parser.add_argument("--no-alloc", action="store_true", help="Omitir la pasada con tracemalloc")
+    parser.add_argument("--json", dest="json_out", help="Escribir los resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # Cualquier llamada no simulada falla rápido en vez de esperar un timeout
+    os.environ["API_BASE_URL"] = "http://127.0.0.1:9"
+    os.environ["API_RETRY_MAX"] = "0"
+
+    from PySide6.QtCore import QStandardPaths
+    from PySide6.QtWidgets import QApplication
+
+    QStandardPaths.setTestModeEnabled(True)
+    app = QApplication.instance() or QApplication([])
+
+    from src.components.generic_form_dialog import GenericFormDialog
+
+    instrument(GenericFormDialog, "_init_ui", "init_ui")
+    instrument(GenericFormDialog, "_on_combo_data", "on_combo_data")
+    instrument(GenericFormDialog, "_try_set_values", "try_set_values")
+    instrument(GenericFormDialog, "_validate_steps_progress", "validate_progress")
+
+    current = {"record": None}
+    install_fakes(args.catalog_size, lambda: current["record"])
+
+    rat_base = json.load(open(os.path.join(FORMS_DIR, "rat.json"), encoding="utf-8"))
+    config_names = sorted(os.path.basename(p) for p in glob.glob(os.path.join(FORMS_DIR, "*.json")))
+    modes = ["new", "edit"] if args.mode == "both" else [args.mode]
+
+    results = {}
+    for config_name in config_names:
+        if args.only and config_name not in args.only:
+            continue
+        if config_name not in DIALOGS:
+            print(f"Aviso: {config_name} no tiene diálogo asociado; se omite.")
+            continue
+        _dialog, tipo_rat = DIALOGS[config_name]
+        with open(os.path.join(FORMS_DIR, config_name), encoding="utf-8") as f:
+            config = json.load(f)
+        configs = [rat_base, config] if tipo_rat else [config]
+
+        for mode in modes:
+            if tipo_rat and mode == "new":
+                # Las extensiones de RAT solo se cargan al hidratar un registro de ese tipo
+                continue
+            current["record"] = synthetic_record(configs, args.catalog_size, tipo_rat) if mode == "edit" else None
+            try:
+                results[(config_name, mode)] = run_case(app, config_name, mode, args)
+            except Exception as e:
+                results[(config_name, mode)] = {"error": f"{type(e).__name__}: {e}"}
+
+    print_report(results, show_allocs=not args.no_alloc)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({f"{name}:{mode}": result for (name, mode), result in results.items()}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
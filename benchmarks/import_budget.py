@@ -0,0 +1,201 @@
+"""
+Presupuesto de tiempo de importación del arranque (python -X importtime).
+
+Mide, en procesos nuevos, lo que cuesta importar:
+  - main:         lo que se carga antes de mostrar el login
+  - main_window:  lo que se agrega al entrar (con main ya importado)
+  - activos_view: la primera vista que se construye tras el login
+
+y falla si se pasa del presupuesto o si aparece en el arranque algún módulo
+que debe cargarse recién al usarse (impresión/PDF, diálogos, visor de detalle,
+vistas aún no visitadas, perfilador).
+
+Uso:
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --repeat 9 --top 25
+    python -m benchmarks.import_budget --budget main=450 --budget activos_view=80 --json imports.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from benchmarks.run_benchmarks import ROOT_DIR
+
+# Módulos diferidos: no deben importarse en ese punto del arranque
+PRINTING = ["PySide6.QtPrintSupport"]
+DIALOGS = [
+    "src.components.generic_form_dialog",
+    "src.components.activo_dialog",
+    "src.components.eipd_dialog",
+    "src.components.rat_dialog",
+    "src.views.trazabilidad.api_detail_dialog",
+]
+LATER_VIEWS = [
+    "src.views.eipd.eipd_view",
+    "src.views.usuarios.usuarios_view",
+    "src.views.rat.rat_view",
+    "src.views.trazabilidad.trazabilidad_view",
+]
+PROFILER = ["cProfile", "pstats"]
+
+TARGETS = {
+    "main": {
+        "module": "main",
+        "preload": [],
+        "budget_ms": 500.0,
+        "deferred": PRINTING + DIALOGS + LATER_VIEWS + PROFILER + [
+            "src.views.main_window",
+            "src.views.activos.activos_view",
+            "src.components.generic_grid_view",
+        ],
+    },
+    "main_window": {
+        "module": "src.views.main_window",
+        "preload": ["main"],
+        "budget_ms": 50.0,
+        "deferred": PRINTING + DIALOGS + LATER_VIEWS + PROFILER + ["src.views.activos.activos_view"],
+    },
+    "activos_view": {
+        "module": "src.views.activos.activos_view",
+        "preload": ["main", "src.views.main_window"],
+        "budget_ms": 100.0,
+        "deferred": PRINTING + DIALOGS + LATER_VIEWS + PROFILER,
+    },
+}
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def run_importtime(module, preload):
+    statements = [f"import {name}" for name in preload]
+    # importtime solo reporta la primera importación: lo precargado no cuenta para el objetivo
+    statements.append(f"import {module}")
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = ROOT_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(statements)],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import falló")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            entries.append({
+                "name": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    return entries
+
+
+def modules_for_target(entries, module):
+    """Las líneas que importó el objetivo: sus hijos aparecen justo antes que él."""
+    for i, entry in enumerate(entries):
+        if entry["name"] == module and entry["depth"] == 0:
+            start = i
+            while start > 0 and entries[start - 1]["depth"] > 0:
+                start -= 1
+            return entries[start:i + 1]
+    return []
+
+
+def measure_target(spec, repeat):
+    totals = []
+    cumulative = {}
+    self_times = {}
+    imported = set()
+    for _ in range(repeat):
+        own = modules_for_target(run_importtime(spec["module"], spec["preload"]), spec["module"])
+        if not own:
+            raise RuntimeError(f"{spec['module']} no aparece en la salida de importtime")
+        totals.append(own[-1]["cumulative_us"] / 1000)
+        for entry in own:
+            imported.add(entry["name"])
+            cumulative.setdefault(entry["name"], []).append(entry["cumulative_us"] / 1000)
+            self_times.setdefault(entry["name"], []).append(entry["self_us"] / 1000)
+
+    return {
+        "total_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "cumulative_ms": {name: statistics.median(v) for name, v in cumulative.items()},
+        "self_ms": {name: statistics.median(v) for name, v in self_times.items()},
+        "imported": imported,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Presupuesto de tiempo de importación del arranque")
+    parser.add_argument("--repeat", type=int, default=5, help="Procesos por objetivo (se usa la mediana)")
+    parser.add_argument("--top", type=int, default=15, help="Módulos más caros a listar")
+    parser.add_argument("--only", action="append", choices=sorted(TARGETS), help="Solo estos objetivos")
+    parser.add_argument("--budget", action="append", default=[], metavar="OBJETIVO=MS",
+                        help="Reemplaza el presupuesto de un objetivo (0 = sin límite de tiempo)")
+    parser.add_argument("--json", dest="json_out", help="Escribir los resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    budgets = {name: spec["budget_ms"] for name, spec in TARGETS.items()}
+    for item in args.budget:
+        name, _, value = item.partition("=")
+        if name not in TARGETS:
+            parser.error(f"Objetivo desconocido: {name}")
+        budgets[name] = float(value)
+
+    failures = []
+    report = {}
+    for name, spec in TARGETS.items():
+        if args.only and name not in args.only:
+            continue
+        result = measure_target(spec, max(1, args.repeat))
+        budget = budgets[name]
+        leaked = sorted(m for m in spec["deferred"] if m in result["imported"])
+
+        print(f"\n=== {name} (import {spec['module']}"
+              + (f" tras {', '.join(spec['preload'])}" if spec["preload"] else "") + ") ===")
+        print(f"  total: {result['total_ms']:.1f} ms (mín {result['min_ms']:.1f} ms)"
+              + (f" / presupuesto {budget:.0f} ms" if budget else ""))
+        print(f"  módulos importados: {len(result['imported'])}")
+        print(f"  top {args.top} por tiempo acumulado:")
+        ranked = sorted(result["cumulative_ms"].items(), key=lambda kv: kv[1], reverse=True)
+        for module, ms in ranked[:args.top]:
+            print(f"    {ms:8.1f} ms  (propio {result['self_ms'][module]:6.1f})  {module}")
+
+        if budget and result["total_ms"] > budget:
+            failures.append(f"{name}: {result['total_ms']:.1f} ms > presupuesto {budget:.0f} ms")
+        for module in leaked:
+            failures.append(f"{name}: importa {module}, que debe cargarse recién al usarse")
+
+        report[name] = {
+            "total_ms": round(result["total_ms"], 2),
+            "min_ms": round(result["min_ms"], 2),
+            "budget_ms": budget,
+            "modules": len(result["imported"]),
+            "leaked_deferred": leaked,
+            "top": [{"module": m, "cumulative_ms": round(ms, 2)} for m, ms in ranked[:args.top]],
+        }
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if failures:
+        print("\nFUERA DE PRESUPUESTO:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nDentro del presupuesto.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
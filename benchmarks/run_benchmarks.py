@@ -0,0 +1,363 @@
+"""
+Benchmarks offline del cliente contra un backend falso local (benchmarks/fake_backend.py).
+
+Mide, sin red real y con Qt en modo offscreen:
+  - ApiClient: GET de listados, POST de trazabilidad y GET concurrente (throughput)
+  - CatalogoService/CacheManager: catálogo en frío (red + escritura de caché) y en caliente
+  - CatalogIndex: construcción del índice y búsqueda en catálogos
+  - GenericGridView (activos, rat, eipd): recarga completa, poblado, búsqueda y export CSV
+  - ApiDetailDialog: apertura con una respuesta grande
+
+Uso:
+    python -m benchmarks.run_benchmarks                      # compara con baseline.json si existe
+    python -m benchmarks.run_benchmarks --update-baseline    # guarda los resultados como baseline
+    python -m benchmarks.run_benchmarks --rows 2000 --latency-ms 30 --only grid
+
+La baseline depende de la máquina: se genera en el equipo de referencia con
+--update-baseline y solo se compara si el tamaño de la carga coincide.
+Sale con código 1 si el p50 o el p90 de algún caso empeora más que --tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+GRIDS = ["activos", "rat", "eipd"]
+SEARCH_QUERIES = ["nuble", "region metro", "valpo", "12", "biob", "registro 1", "zzz"]
+
+
+# ===============================
+# Estadística
+# ===============================
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(samples, ops_per_sample=1):
+    values = sorted(samples)
+    total = sum(values)
+    return {
+        "samples": len(values),
+        "min_ms": values[0] * 1000,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p90_ms": percentile(values, 90) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": values[-1] * 1000,
+        "mean_ms": total / len(values) * 1000,
+        "ops_per_s": (len(values) * ops_per_sample / total) if total else 0.0,
+    }
+
+
+def measure(func, repeat, warmup=1, setup=None):
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+# ===============================
+# Entorno
+# ===============================
+def prepare_environment(args):
+    """Levanta el backend falso y configura Qt/ApiClient antes de importar src."""
+    sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)  # los iconos y configs se resuelven relativos a la raíz
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from benchmarks.fake_backend import FakeBackend
+
+    backend = FakeBackend(
+        rows=args.rows,
+        catalog_size=args.catalog_size,
+        trace_results=args.trace_results,
+        latency_ms=args.latency_ms,
+        fields=grid_fields(),
+    )
+    base_url = backend.start()
+    os.environ["API_BASE_URL"] = base_url
+    os.environ["API_RETRY_MAX"] = "0"
+
+    from PySide6.QtCore import QStandardPaths
+    from PySide6.QtWidgets import QApplication
+
+    # Cachés y outbox en un directorio de prueba: no se toca la caché real del usuario
+    QStandardPaths.setTestModeEnabled(True)
+    app = QApplication.instance() or QApplication([])
+    return app, backend
+
+
+def grid_fields():
+    fields = set()
+    for grid_id in GRIDS:
+        config = load_grid_config(grid_id)
+        fields.add(config.get("campo_id", "id"))
+        fields.update(col["campo_api"] for col in config.get("columnas", []))
+    return sorted(fields)
+
+
+def load_grid_config(grid_id):
+    with open(os.path.join(ROOT_DIR, "src", "config", "grillas", f"{grid_id}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def wait_until(app, predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("El benchmark no terminó a tiempo")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+# ===============================
+# Casos
+# ===============================
+def bench_api(app, backend, args):
+    from src.core.api_client import ApiClient
+
+    client = ApiClient()
+    results = {}
+    results["api.get_listado"] = summarize(measure(
+        lambda: client.get(f"/rat?page=1&size={args.rows}"), args.repeat
+    ))
+    results["api.post_trazabilidad"] = summarize(measure(
+        lambda: client.post("/trazabilidad/consulta", {"run": "12345678-5"}), args.repeat
+    ))
+
+    concurrency = 8
+    batch = concurrency * 4
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        def burst():
+            list(pool.map(lambda i: client.get(f"/activos/catalogos?page={i % 5 + 1}&size=50"), range(batch)))
+        results["api.concurrent_get"] = summarize(measure(burst, max(3, args.repeat // 4)), ops_per_sample=batch)
+    return results
+
+
+def bench_catalogs(app, backend, args):
+    from src.services.catalogo_service import CatalogoService
+    from src.services.catalog_models import CatalogIndex
+
+    service = CatalogoService()
+    endpoint, key = "/catalogos/regiones", "bench_regiones"
+    results = {}
+    results["catalog.get_cold"] = summarize(measure(
+        lambda: service.get_catalogo(endpoint, key), args.repeat,
+        setup=lambda: service.invalidate_cache_key(key)
+    ))
+    service.get_catalogo(endpoint, key)
+    results["catalog.get_warm"] = summarize(measure(lambda: service.get_catalogo(endpoint, key), args.repeat))
+
+    data = service.get_catalogo(endpoint, key)
+    entries = [(entry["nombre"], entry["id"]) for entry in data]
+    results["catalog.index_build"] = summarize(measure(lambda: CatalogIndex(entries), args.repeat))
+
+    index = CatalogIndex(entries)
+    results["catalog.search"] = summarize(
+        measure(lambda: [index.search(q) for q in SEARCH_QUERIES], args.repeat),
+        ops_per_sample=len(SEARCH_QUERIES),
+    )
+    service.invalidate_cache_key(key)
+    return results
+
+
+def bench_grids(app, backend, args):
+    from src.components.generic_grid_view import GenericGridView
+
+    results = {}
+    tmp_dir = tempfile.mkdtemp(prefix="singdap_bench_")
+    for grid_id in GRIDS:
+        config_path = os.path.join(ROOT_DIR, "src", "config", "grillas", f"{grid_id}.json")
+        grid = GenericGridView(config_path)
+        grid.resize(1400, 900)
+        grid.show()
+        wait_until(app, lambda: grid._last_listado is not None)
+
+        def reload():
+            # Cada listado recibido es un objeto nuevo: así se detecta que terminó el ciclo completo
+            previous = grid._last_listado
+            grid._reload_all()
+            wait_until(app, lambda: grid._last_listado is not previous)
+
+        results[f"grid.{grid_id}.reload"] = summarize(measure(reload, args.repeat))
+
+        # Dos páginas alternadas: cada poblado cambia todas las celdas
+        listado = backend.listado(grid.config["endpoints"]["listado"], 1, args.rows)
+        shifted = dict(listado, items=listado["items"][1:] + listado["items"][:1])
+        pages = [listado, shifted]
+        counter = [0]
+
+        def populate():
+            counter[0] += 1
+            grid._populate_table(pages[counter[0] % 2])
+
+        results[f"grid.{grid_id}.populate"] = summarize(measure(populate, args.repeat))
+
+        grid.search_input.blockSignals(True)
+        grid.search_input.setText("registro 1")
+        results[f"grid.{grid_id}.search"] = summarize(measure(populate, args.repeat))
+        grid.search_input.setText("")
+        grid.search_input.blockSignals(False)
+        grid._populate_table(listado)
+
+        csv_path = os.path.join(tmp_dir, f"{grid_id}.csv")
+        results[f"grid.{grid_id}.export_csv"] = summarize(measure(lambda: grid._write_csv(csv_path), args.repeat))
+
+        grid.close()
+        grid.deleteLater()
+        app.processEvents()
+    return results
+
+
+def bench_detail_dialog(app, backend, args):
+    from src.views.trazabilidad.api_detail_dialog import ApiDetailDialog
+
+    payload = {"data": [backend.record(i) for i in range(args.rows * 5)]}
+
+    def open_dialog():
+        dialog = ApiDetailDialog(payload, title="Benchmark")
+        dialog.show()
+        app.processEvents()
+        dialog.close()
+        dialog.deleteLater()
+
+    return {"detail_dialog.open": summarize(measure(open_dialog, max(3, args.repeat // 2)))}
+
+
+SUITES = {
+    "api": bench_api,
+    "catalog": bench_catalogs,
+    "grid": bench_grids,
+    "detail": bench_detail_dialog,
+}
+
+
+# ===============================
+# Baseline
+# ===============================
+def workload(args):
+    return {
+        "rows": args.rows,
+        "catalog_size": args.catalog_size,
+        "trace_results": args.trace_results,
+        "latency_ms": args.latency_ms,
+        "repeat": args.repeat,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Lista de (caso, métrica, baseline, actual) que empeoraron más que la tolerancia."""
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference:
+            continue
+        for metric in ("p50_ms", "p90_ms"):
+            # Bajo 1 ms el ruido domina: se exige además 0.5 ms de diferencia absoluta
+            limit = reference[metric] * (1 + tolerance)
+            if current[metric] > limit and current[metric] - reference[metric] > 0.5:
+                regressions.append((name, metric, reference[metric], current[metric]))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    reference = (baseline or {}).get("results", {})
+    print(f"{'caso':34} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'ops/s':>10} {'vs base':>9}")
+    for name, stats in results.items():
+        delta = ""
+        if name in reference and reference[name]["p50_ms"]:
+            delta = f"{(stats['p50_ms'] / reference[name]['p50_ms'] - 1) * 100:+.0f}%"
+        print(f"{name:34} {stats['p50_ms']:9.2f} {stats['p90_ms']:9.2f} {stats['p99_ms']:9.2f} "
+              f"{stats['ops_per_s']:10.1f} {delta:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks offline del cliente SINGDAP")
+    parser.add_argument("--rows", type=int, default=200, help="Registros por listado")
+    parser.add_argument("--catalog-size", type=int, default=2000, help="Opciones por catálogo")
+    parser.add_argument("--trace-results", type=int, default=25, help="Resultados por RUN en trazabilidad")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latencia simulada por solicitud")
+    parser.add_argument("--repeat", type=int, default=15, help="Muestras por caso")
+    parser.add_argument("--only", action="append", choices=sorted(SUITES), help="Ejecutar solo estas suites")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Regresión tolerada (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Archivo de baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Guardar estos resultados como baseline")
+    parser.add_argument("--json", dest="json_out", help="Escribir los resultados en este archivo")
+    args = parser.parse_args(argv)
+
+    app, backend = prepare_environment(args)
+    try:
+        results = {}
+        for name in args.only or list(SUITES):
+            results.update(SUITES[name](app, backend, args))
+    finally:
+        backend.stop()
+
+    from PySide6 import __version__ as pyside_version
+    from src.core import json_codec
+
+    report = {
+        "workload": workload(args),
+        "environment": {
+            "python": platform.python_version(),
+            "pyside6": pyside_version,
+            "platform": platform.platform(),
+            "json_backend": json_codec.BACKEND,
+        },
+        "results": results,
+    }
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("workload") != report["workload"]:
+            print("Aviso: la baseline se generó con otra carga; no se compara.")
+            baseline = None
+
+    print_table(results, baseline)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline actualizada: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("\nSin baseline comparable: ejecute con --update-baseline en el equipo de referencia.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegresiones (> {args.tolerance:.0%}):")
+        for name, metric, before, after in regressions:
+            print(f"  {name} {metric}: {before:.2f} ms -> {after:.2f} ms")
+        return 1
+    print("\nSin regresiones respecto de la baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
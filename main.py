@@ -12,6 +12,7 @@ from src.core.api_client import ApiClient
 from src.services.auth_service import AuthService
 from src.viewmodels.login_viewmodel import LoginViewModel
 from src.views.login_view import LoginView
+from src.core.profiling import StallWatchdog
 from utils import load_styles, icon
 print("All imports completed.")
 
@@ -42,6 +43,9 @@ def main():
 
     load_styles(app)
 
+    # Opt-in (STALL_WATCHDOG_MS > 0): registra en Log/ el stack de la UI cuando se congela
+    StallWatchdog.instance().start()
+
     api_client = ApiClient()
     auth_service = AuthService(api_client)
     login_vm = LoginViewModel(auth_service)
@@ -6,7 +6,17 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('src/resources', 'src/resources')],
-    hiddenimports=[],
+    # Cargados con importlib (dialog_registry, MainWindow._view_factories): PyInstaller no los ve
+    hiddenimports=[
+        'src.components.activo_dialog',
+        'src.components.eipd_dialog',
+        'src.components.rat_dialog',
+        'src.views.activos.activos_view',
+        'src.views.eipd.eipd_view',
+        'src.views.usuarios.usuarios_view',
+        'src.views.rat.rat_view',
+        'src.views.trazabilidad.trazabilidad_view',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
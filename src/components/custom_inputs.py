@@ -1,87 +1,210 @@
-from PySide6.QtWidgets import QComboBox, QStyledItemDelegate
-from PySide6.QtGui import QStandardItem, QStandardItemModel, QPalette, QBrush, QColor
-from PySide6.QtCore import Qt, Signal, QEvent
+from PySide6.QtWidgets import QComboBox, QCompleter, QToolTip
+from PySide6.QtGui import QStandardItem, QStandardItemModel, QPalette, QBrush
+from PySide6.QtCore import Qt, Signal, QEvent, QIdentityProxyModel, QSortFilterProxyModel, QModelIndex, QTimer
+
+from src.services.catalog_models import CatalogModelRegistry
+
+
+def _is_checked(value):
+    # PySide puede entregar el CheckState como enum o como int
+    return value == Qt.Checked or value == Qt.Checked.value
+
+
+class CheckableProxyModel(QIdentityProxyModel):
+    """
+    Checks por combo sobre un modelo de catálogo que puede ser compartido.
+    El estado vive aquí (ids marcados) y nunca se escribe en el modelo fuente.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._checked = set()   # str(id)
+        self._index = None
+        # Cualquier cambio de filas invalida el índice id -> fila
+        self.sourceModelChanged.connect(self._invalidate_index)
+        self.rowsInserted.connect(self._invalidate_index)
+        self.rowsRemoved.connect(self._invalidate_index)
+        self.modelReset.connect(self._invalidate_index)
+
+    def _invalidate_index(self, *_args):
+        self._index = None
+
+    def catalog_index(self):
+        if self._index is None:
+            self._index = CatalogModelRegistry.instance().index_for(self.sourceModel())
+        return self._index
+
+    def _key(self, index):
+        return str(super().data(index, Qt.UserRole))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.CheckStateRole and index.isValid():
+            return Qt.Checked if self._key(index) in self._checked else Qt.Unchecked
+        return super().data(index, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        key = self._key(index)
+        if _is_checked(value):
+            self._checked.add(key)
+        else:
+            self._checked.discard(key)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def checked_keys(self):
+        return set(self._checked)
+
+    def checked_rows(self):
+        # O(seleccionados) gracias al índice, en el orden del catálogo
+        row_by_key = self.catalog_index().row_by_key
+        return sorted(row_by_key[k] for k in self._checked if k in row_by_key)
+
+    def set_checked_keys(self, keys):
+        # Un solo dataChanged para todo el lote
+        self._checked = set(keys)
+        rows = self.rowCount()
+        if rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, 0), [Qt.CheckStateRole])
+
 
 class CheckableComboBox(QComboBox):
     # Custom signal if needed, though usually model signal is enough
     selectionChanged = Signal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, searchable=False):
         super().__init__(parent)
         self.setEditable(True)
         self.lineEdit().setReadOnly(True)
-        
+        self._searchable = searchable
+        self._search_buffer = ""
+
         # Use a custom palette for the lineEdit to make it look like a normal combo label
         palette = self.lineEdit().palette()
         palette.setBrush(QPalette.Base, QBrush(Qt.transparent))
         self.lineEdit().setPalette(palette)
-        
-        self.setModel(QStandardItemModel(self))
+
+        self._proxy = CheckableProxyModel(self)
+        self._proxy.setSourceModel(QStandardItemModel(self))
+        self.setModel(self._proxy)
         self.view().viewport().installEventFilter(self)
-        self.model().dataChanged.connect(self.updateText)
-        
+        if searchable:
+            self.view().installEventFilter(self)
+        self._proxy.dataChanged.connect(self.updateText)
+
         # Placeholder
         self._placeholder_text = "Seleccione..."
         self.lineEdit().setPlaceholderText(self._placeholder_text)
 
+    def setCatalogModel(self, model):
+        """Engancha un modelo de catálogo (posiblemente compartido) sin copiar filas."""
+        self._proxy.set_checked_keys(())
+        self._proxy.setSourceModel(model)
+        self.updateText()
+
+    def replaceCatalogModel(self, model):
+        """Nueva versión del mismo catálogo: los checks (por id) se conservan."""
+        self._proxy.setSourceModel(model)
+        self.updateText()
+
+    def _own_source(self):
+        source = self._proxy.sourceModel()
+        if source is None or source.property("catalog_shared"):
+            source = QStandardItemModel(self)
+            self._proxy.setSourceModel(source)
+        return source
+
     def addItem(self, text, userData=None):
         item = QStandardItem(text)
         item.setData(userData, Qt.UserRole)
-        item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
-        item.setData(Qt.Unchecked, Qt.CheckStateRole)
-        self.model().appendRow(item)
+        item.setFlags(Qt.ItemIsEnabled)
+        self._own_source().appendRow(item)
 
     def addItems(self, texts):
         for text in texts:
             self.addItem(text)
-            
+
+    def clear(self):
+        # Nunca se vacía el modelo fuente: puede ser el catálogo compartido
+        self._proxy.set_checked_keys(())
+        self._proxy.setSourceModel(QStandardItemModel(self))
+        self.updateText()
+
     def currentData(self):
         # Return list of selected IDs
-        res = []
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            if item.checkState() == Qt.Checked:
-                res.append(item.data(Qt.UserRole))
-        return res
+        ids = self._proxy.catalog_index().ids
+        return [ids[row] for row in self._proxy.checked_rows()]
+
+    def selectedTexts(self):
+        labels = self._proxy.catalog_index().labels
+        return [labels[row] for row in self._proxy.checked_rows()]
 
     def setCurrentData(self, data_list):
         # Data list should be a list of IDs
         if not isinstance(data_list, list):
             data_list = [data_list]
-            
-        data_set = set(str(d) for d in data_list) # Compare strings to be safe
-        
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            val = str(item.data(Qt.UserRole))
-            if val in data_set:
-                item.setCheckState(Qt.Checked)
-            else:
-                item.setCheckState(Qt.Unchecked)
-        self.updateText()
+
+        self._proxy.set_checked_keys(str(d) for d in data_list) # Compare strings to be safe
+        if not self._proxy.rowCount():
+            # Sin filas no hay dataChanged que refresque el texto
+            self.updateText()
 
     def updateText(self):
-        selected_items = []
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            if item.checkState() == Qt.Checked:
-                selected_items.append(item.text())
-                
-        text = ", ".join(selected_items)
+        text = ", ".join(self.selectedTexts())
         self.lineEdit().setText(text)
         self.selectionChanged.emit()
 
+    # --- Búsqueda por teclado con el popup abierto (modo searchable) ---
+    def _apply_search(self):
+        rows = self._proxy.catalog_index().search(self._search_buffer)
+        visible = None if rows is None else set(rows)
+        view = self.view()
+        for row in range(self._proxy.rowCount()):
+            view.setRowHidden(row, visible is not None and row not in visible)
+
+        if self._search_buffer:
+            QToolTip.showText(
+                self.mapToGlobal(self.rect().bottomLeft()),
+                f"Buscar: {self._search_buffer}", self
+            )
+        else:
+            QToolTip.hideText()
+
+    def _handle_search_key(self, event):
+        key = event.key()
+        if key == Qt.Key_Backspace:
+            if not self._search_buffer:
+                return False
+            self._search_buffer = self._search_buffer[:-1]
+        elif key == Qt.Key_Escape and self._search_buffer:
+            self._search_buffer = ""
+        elif event.text().isprintable() and event.text() and (key != Qt.Key_Space or self._search_buffer):
+            self._search_buffer += event.text()
+        else:
+            return False
+        self._apply_search()
+        return True
+
     def eventFilter(self, widget, event):
+        if self._searchable and widget == self.view() and event.type() == QEvent.KeyPress:
+            if self._handle_search_key(event):
+                return True
+
         # Prevent popup closing when clicking an item
         if widget == self.view().viewport():
             if event.type() == QEvent.MouseButtonRelease:
                 index = self.view().indexAt(event.pos())
-                item = self.model().itemFromIndex(index)
-                if item.flags() & Qt.ItemIsUserCheckable:
-                    if item.checkState() == Qt.Checked:
-                        item.setCheckState(Qt.Unchecked)
-                    else:
-                        item.setCheckState(Qt.Checked)
+                if index.isValid() and index.flags() & Qt.ItemIsUserCheckable:
+                    checked = _is_checked(index.data(Qt.CheckStateRole))
+                    self._proxy.setData(
+                        index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole
+                    )
                 return True
         return super().eventFilter(widget, event)
 
@@ -92,4 +215,98 @@ class CheckableComboBox(QComboBox):
 
     def hidePopup(self):
         super().hidePopup()
+        if self._search_buffer:
+            self._search_buffer = ""
+            self._apply_search()
         self.updateText()
+
+
+class CatalogFilterProxy(QSortFilterProxyModel):
+    """Filtra un catálogo con su CatalogIndex: cada fila se resuelve en O(1)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._index = None
+        self._visible = None    # None = todas
+
+    def set_index(self, index):
+        self._index = index
+        self.set_query("")
+
+    def set_query(self, query):
+        rows = self._index.search(query) if self._index else None
+        self._visible = None if rows is None else set(rows)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._visible is None or source_row in self._visible
+
+
+class SearchableComboBox(QComboBox):
+    """
+    Combo simple con búsqueda: se escribe en el combo y un completer muestra
+    las coincidencias (sin tildes, por prefijo de palabra o subcadena) usando
+    el índice precalculado del catálogo.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.NoInsert)
+
+        self._filter = CatalogFilterProxy(self)
+        self._completer = QCompleter(self)
+        self._completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self._completer.setModel(self._filter)
+        self._completer.activated[QModelIndex].connect(self._on_completion)
+        self.setCompleter(self._completer)
+
+        self.lineEdit().textEdited.connect(self._on_text_edited)
+        self.lineEdit().editingFinished.connect(self._restore_text)
+        self._rebind_index()
+
+    def setModel(self, model):
+        super().setModel(model)
+        # QComboBox.setModel re-apunta el completer al modelo crudo: se le devuelve el filtro
+        self._completer.setModel(self._filter)
+        self._rebind_index()
+
+    def setPlaceholderText(self, text):
+        super().setPlaceholderText(text)
+        self.lineEdit().setPlaceholderText(text)
+
+    def _rebind_index(self):
+        model = self.model()
+        self._filter.setSourceModel(model)
+        self._filter.set_index(None)
+        self._index_dirty = True
+        # addItem sobre un modelo propio cambia las filas: se reindexa al buscar
+        if not CatalogModelRegistry.instance().is_shared(model):
+            model.rowsInserted.connect(self._mark_index_dirty)
+
+    def _mark_index_dirty(self, *_args):
+        self._index_dirty = True
+
+    def _on_text_edited(self, text):
+        if self._index_dirty:
+            self._filter.set_index(CatalogModelRegistry.instance().index_for(self.model()))
+            self._index_dirty = False
+        self._filter.set_query(text)
+        if text:
+            self._completer.complete()
+
+    def _on_completion(self, index):
+        # El índice viene del modelo de completado del completer, no del filtro
+        filter_index = self._completer.completionModel().mapToSource(index)
+        source_index = self._filter.mapToSource(filter_index)
+        if source_index.isValid():
+            self.setCurrentIndex(source_index.row())
+        # QComboBox también atiende activated y mapea a través del filtro: limpiar la
+        # búsqueda ahora le haría elegir otra fila
+        QTimer.singleShot(0, self._restore_text)
+
+    def _restore_text(self):
+        # El texto libre no es un valor: se vuelve a mostrar la opción elegida
+        current = self.currentIndex()
+        self.lineEdit().setText(self.itemText(current) if current >= 0 else "")
+        self._filter.set_query("")
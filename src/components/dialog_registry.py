@@ -1,12 +1,22 @@
-from src.components.activo_dialog import ActivoDialog
-from src.components.eipd_dialog import EipdDialog
-from src.components.rat_dialog import RatDialog
+import importlib
 
+# Nombre -> "módulo:Clase". Los diálogos (y todo lo que arrastra GenericFormDialog)
+# se importan recién al abrir el primero, no al cargar las grillas.
+# Al agregar uno nuevo, sumarlo también a hiddenimports en main.spec.
 DIALOG_REGISTRY = {
-    "ActivoDialog": ActivoDialog,
-    "EipdDialog": EipdDialog,
-    "RatDialog": RatDialog,
+    "ActivoDialog": "src.components.activo_dialog:ActivoDialog",
+    "EipdDialog": "src.components.eipd_dialog:EipdDialog",
+    "RatDialog": "src.components.rat_dialog:RatDialog",
 }
 
+_loaded = {}
+
 def get_dialog_class(name: str):
-    return DIALOG_REGISTRY.get(name)
+    dialog_class = _loaded.get(name)
+    if dialog_class is None:
+        target = DIALOG_REGISTRY.get(name)
+        if not target:
+            return None
+        module_path, class_name = target.split(":")
+        dialog_class = _loaded[name] = getattr(importlib.import_module(module_path), class_name)
+    return dialog_class
@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView
 )
 from PySide6.QtCore import Qt, QTimer, QThreadPool, QDate, Signal
+from PySide6.QtGui import QStandardItemModel
 
 from src.components.risk_matrix_widget import RiskMatrixWidget
 from src.core.api_client import ApiClient
@@ -20,7 +21,10 @@ from src.services.catalogo_service import CatalogoService
 from src.workers.combo_loader import ComboLoaderRunnable
 from src.workers.api_worker import ApiWorker
 from src.services.logger_service import LoggerService
-from src.components.custom_inputs import CheckableComboBox
+from src.services.outbox_service import OutboxService
+from src.components.custom_inputs import CheckableComboBox, SearchableComboBox
+from src.services.catalog_models import CatalogModelRegistry
+from src.core.profiling import start_profile
 
 EIPD_AMBITOS = [
     "Lícitud y Lealtad",
@@ -135,10 +139,11 @@ class ComboTextWidget(QWidget):
         layout.setSpacing(8)
 
         # Combo
+        searchable = field_config.get("searchable", False)
         if self._is_multiple:
-            self.combo = CheckableComboBox()
+            self.combo = CheckableComboBox(searchable=searchable)
         else:
-            self.combo = QComboBox()
+            self.combo = SearchableComboBox() if searchable else QComboBox()
             self.combo.setPlaceholderText("Seleccione...")
 
         # Static options
@@ -372,8 +377,16 @@ class EditableTableWidget(QWidget):
                     inp.setReadOnly(read_only)
 
 class GenericFormDialog(QDialog):
+    # {"id", "record", "created"}: la grilla parchea solo esa fila
+    record_saved = Signal(dict)
+
     def __init__(self, config_path, parent=None, record_id=None):
         super().__init__(parent)
+
+        # Perfil opt-in de la apertura: desde aquí hasta que terminan las cargas iniciales
+        self._open_profile = start_profile(f"dialog.open.{os.path.splitext(os.path.basename(str(config_path)))[0]}")
+        # Perfil opt-in del guardado: de _submit hasta que el worker responde
+        self._submit_profile = None
         
         # Load Config
         with open(config_path, 'r', encoding='utf-8') as f:
@@ -385,11 +398,18 @@ class GenericFormDialog(QDialog):
         # Services
         self.api = ApiClient()
         self.catalogo_service = CatalogoService()
+        self.outbox = OutboxService()
         self.thread_pool = QThreadPool.globalInstance()
         self._active_runnables = [] # Keep refs
         self.asset_data = None
         self.pending_loads = 0
         self._allow_asset_reapply = self.is_edit
+        # Hidratación en edición: cada campo se aplica una vez, cuando sus opciones están listas
+        self._hydrating = False
+        self._hydrated = {}             # key -> widget ya hidratado
+        self._pending_catalogs = set()  # combos esperando su catálogo
+        self._visibility_dirty = set()
+        self._submitting = False
 
         # UI Setup
         self.setObjectName("genericFormDialog")
@@ -434,6 +454,22 @@ class GenericFormDialog(QDialog):
         
         title_log = self.config.get("title_edit", "Editar") if self.is_edit else self.config.get("title_new", "Nuevo")
         LoggerService().log_event(f"Abriendo formulario genérico: {title_log}")
+        if self._open_profile is not None:
+            self.finished.connect(self._stop_open_profile)
+
+    def _stop_open_profile(self, *_args):
+        if self._open_profile is not None:
+            self._open_profile.stop(modo="edición" if self.is_edit else "nuevo")
+            self._open_profile = None
+
+    def _start_submit_profile(self, name):
+        self._stop_submit_profile(resultado="reemplazado")
+        self._submit_profile = start_profile(name)
+
+    def _stop_submit_profile(self, **extra):
+        if self._submit_profile is not None:
+            self._submit_profile.stop(modo="edición" if self.is_edit else "nuevo", **extra)
+            self._submit_profile = None
 
     def _init_ui(self):
         # Layout principal (Vertical: Top Header + Body)
@@ -786,6 +822,10 @@ class GenericFormDialog(QDialog):
 
     def _check_visibility(self, source_key):
         if source_key not in self.visibility_map: return
+        if self._hydrating:
+            # Se evalúa una sola vez al terminar la hidratación
+            self._visibility_dirty.add(source_key)
+            return
         
         # Verify inputs integrity
         if source_key not in self.inputs: return
@@ -823,14 +863,11 @@ class GenericFormDialog(QDialog):
                     if isinstance(val, list):
                         # val is list of IDs; check display names in the source widget
                         source_widget_local = self.inputs.get(source_key)
-                        if source_widget_local and hasattr(source_widget_local, 'model'):
-                            model = source_widget_local.model()
-                            for i in range(model.rowCount()):
-                                item = model.item(i)
-                                if item and item.checkState() == Qt.Checked:
-                                    if contains_val.lower() in item.text().lower():
-                                        match = True
-                                        break
+                        if source_widget_local and hasattr(source_widget_local, 'selectedTexts'):
+                            for text in source_widget_local.selectedTexts():
+                                if contains_val.lower() in text.lower():
+                                    match = True
+                                    break
                         else:
                             match = str(contains_val) in str(val)
                     else:
@@ -903,11 +940,13 @@ class GenericFormDialog(QDialog):
             
         elif ftype == "combo" or ftype == "combo_static":
             is_multiple = field.get("multiple", False)
+            searchable = field.get("searchable", False)
             
             if is_multiple:
-                inp = CheckableComboBox()
+                inp = CheckableComboBox(searchable=searchable)
             else:
-                inp = QComboBox()
+                # Catálogos grandes: se puede escribir para filtrar
+                inp = SearchableComboBox() if searchable else QComboBox()
                 inp.setPlaceholderText("Seleccione...")
                 
             if ftype == "combo_static" and "options" in field:
@@ -957,6 +996,8 @@ class GenericFormDialog(QDialog):
         return QLineEdit()
 
     def _validate_steps_progress(self):
+        if self._hydrating:
+            return
         # Iterate all sections
         sections = self.config.get("sections", [])
         
@@ -1113,6 +1154,11 @@ class GenericFormDialog(QDialog):
         if self.config.get("endpoint") == "/eipd":
             data = self._flatten_eipd_data(data)
 
+        # Si hay una edición encolada sin enviar, prevalece sobre lo del servidor
+        draft = self._pending_draft()
+        if draft:
+            data = {**(data or {}), **draft}
+
         self.asset_data = data
         self._try_set_values()
         # Trigger validation after loading data
@@ -1194,76 +1240,100 @@ class GenericFormDialog(QDialog):
 
         if self.pending_loads <= 0:
             self._allow_asset_reapply = False
+            self._end_hydration()
             self.loading_overlay.hide_loading()
             # Initial validation for "New" mode (might be 0/X)
             self._validate_steps_progress()
+            self._stop_open_profile()
+
+    # ===============================
+    # Hidratación (modo edición)
+    # ===============================
+    def _begin_hydration(self):
+        self._hydrating = True
+        self._visibility_dirty.clear()
+
+    def _end_hydration(self):
+        if not self._hydrating:
+            return
+        # Último pase: campos cuyo catálogo falló o llegó sin el valor
+        self._hydrate_fields(include_pending=True)
+        self._hydrating = False
+
+        for source_key in list(self._visibility_dirty):
+            self._check_visibility(source_key)
+        self._visibility_dirty.clear()
+
+    def _is_field_ready(self, key, widget):
+        combo = widget.combo if isinstance(widget, ComboTextWidget) else widget
+        return combo not in self._pending_catalogs
 
     def _try_set_values(self):
+        self._hydrate_fields()
+
+    def _hydrate_fields(self, include_pending=False):
         if not self.asset_data: return
-        
-        # Special first pass: Trigger fields
-        # If we have dependencies, we might need to load them first.
-        # For simplicity in this generic version, we just try to set everything.
-        # If a combo depends on another, setting the parent might trigger the load.
-        
+
         # Use a snapshot to avoid "dictionary changed size during iteration"
         # when signal handlers trigger re-entrant updates.
         for key, widget in list(self.inputs.items()):
+            if self._hydrated.get(key) is widget:
+                continue
+            # Los combos dependientes se aplican en _on_dependent_data
+            if key in self.dependency_configs:
+                continue
+            if not include_pending and not self._is_field_ready(key, widget):
+                continue
             value = self.asset_data.get(key)
             if value is None: continue
-            
-            if isinstance(widget, QLineEdit):
-                widget.setText(str(value))
-            elif isinstance(widget, QPlainTextEdit):
-                widget.setPlainText(str(value))
-            elif isinstance(widget, QDateEdit):
-                # Assume value comes as "yyyy-MM-dd" string from API
-                if value:
-                    d = QDate.fromString(str(value), "yyyy-MM-dd")
-                    if d.isValid():
-                        widget.setDate(d)
-            elif isinstance(widget, FilePickerWidget):
-                widget.setText(str(value))
-            elif isinstance(widget, FileTextWidget):
-                widget.set_data(value)
-            elif isinstance(widget, EditableTableWidget):
-                widget.set_data(value)
-            elif isinstance(widget, CheckableComboBox):
-                # value puede venir como JSON string o list
-                if isinstance(value, str):
-                    try:
-                        value = json.loads(value)
-                    except Exception:
-                        value = []
 
-                if not isinstance(value, list):
-                    value = []
+            self._apply_value(key, widget, value)
+            self._hydrated[key] = widget
 
-                # Marcar checks según itemData
-                for i in range(widget.count()):
-                    item_data = widget.itemData(i)
-                    item = widget.model().item(i, 0)
+    def _apply_value(self, key, widget, value):
+        if isinstance(widget, QLineEdit):
+            widget.setText(str(value))
+        elif isinstance(widget, QPlainTextEdit):
+            widget.setPlainText(str(value))
+        elif isinstance(widget, QDateEdit):
+            # Assume value comes as "yyyy-MM-dd" string from API
+            if value:
+                d = QDate.fromString(str(value), "yyyy-MM-dd")
+                if d.isValid():
+                    widget.setDate(d)
+        elif isinstance(widget, FilePickerWidget):
+            widget.setText(str(value))
+        elif isinstance(widget, FileTextWidget):
+            widget.set_data(value)
+        elif isinstance(widget, EditableTableWidget):
+            widget.set_data(value)
+        elif isinstance(widget, CheckableComboBox):
+            # value puede venir como JSON string o list
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except Exception:
+                    value = []
 
-                    if item_data in value:
-                        item.setCheckState(Qt.Checked)
-                    else:
-                        item.setCheckState(Qt.Unchecked)
+            if not isinstance(value, list):
+                value = []
 
-                widget.updateText()
+            # Marcar checks según itemData (un solo lote en el proxy)
+            widget.setCurrentData(value)
 
-            elif isinstance(widget, RiskMatrixWidget):
-                widget.set_data(value)
+        elif isinstance(widget, RiskMatrixWidget):
+            widget.set_data(value)
 
-            elif isinstance(widget, ComboTextWidget):
-                widget.set_data(value)
+        elif isinstance(widget, ComboTextWidget):
+            widget.set_data(value)
 
-            elif isinstance(widget, QComboBox):
-                self._set_combo_value(widget, value)
-                
-                # Check if this key triggers others
-                # Force trigger update if needed
-                if key in self.dependencies:
-                     self._on_trigger_changed(key, widget.currentIndex())
+        elif isinstance(widget, QComboBox):
+            previous_index = widget.currentIndex()
+            self._set_combo_value(widget, value)
+            
+            # Si el índice no cambió, currentIndexChanged no disparó la carga de dependientes
+            if key in self.dependencies and widget.currentIndex() == previous_index:
+                 self._on_trigger_changed(key, widget.currentIndex())
 
     def _set_combo_value(self, combo, value):
         index = combo.findData(value)
@@ -1318,6 +1388,7 @@ class GenericFormDialog(QDialog):
         self.pending_loads = len(combos_to_load)
         if self.is_edit:
             self.pending_loads += 1
+            self._begin_hydration()
             
         # Launch Combo Loaders
         for combo, endpoint, cache_key in combos_to_load:
@@ -1329,12 +1400,14 @@ class GenericFormDialog(QDialog):
             
         if self.pending_loads == 0:
              self.loading_overlay.hide_loading()
+             self._stop_open_profile()
 
     def _start_combo_loader(self, combo, endpoint, cache_key, track_pending=True):
+        self._pending_catalogs.add(combo)
         worker = ComboLoaderRunnable(self.catalogo_service.get_catalogo, endpoint, cache_key)
         self._active_runnables.append(worker)
         
-        worker.signals.result.connect(partial(self._on_combo_data, combo))
+        worker.signals.result.connect(partial(self._on_combo_data, combo, cache_key=cache_key))
         worker.signals.error.connect(self._on_load_error)
         if track_pending:
             worker.signals.finished.connect(self._check_finished)
@@ -1351,14 +1424,105 @@ class GenericFormDialog(QDialog):
         
         worker = ApiWorker(lambda: self.api.get(url), parent=self)
         worker.finished.connect(self._on_record_data)
-        worker.error.connect(self._on_load_error)
+        worker.error.connect(self._on_record_error)
         worker.start()
 
-    def _on_combo_data(self, combo, data):
-        combo.clear()
-        if data:
-            for item in data:
-                combo.addItem(item["nombre"], item["id"])
+    def _on_record_error(self, error):
+        # Sin conexión: abrir con el borrador local si existe
+        draft = self._pending_draft()
+        if draft:
+            LoggerService().log_event(f"Registro {self.record_id} abierto desde borrador local")
+            self._on_record_data(dict(draft))
+            return
+        self._on_load_error(error)
+
+    def _notify_saved_offline(self):
+        AlertDialog(
+            title="Guardado sin conexión",
+            message=(
+                "No fue posible contactar al servidor.\n\n"
+                "Los cambios quedaron guardados en este equipo y se enviarán "
+                "automáticamente cuando se recupere la conexión."
+            ),
+            icon_path="src/resources/icons/alert_warning.svg",
+            confirm_text="Aceptar",
+            parent=self
+        ).exec()
+
+    def _draft_key(self):
+        if not self.is_edit:
+            return None
+        return OutboxService.draft_key_for(self.config.get("endpoint"), self.record_id)
+
+    def _pending_draft(self):
+        if not self.is_edit:
+            return None
+        try:
+            return self.outbox.get_draft(self._draft_key())
+        except Exception as e:
+            LoggerService().log_error("Error leyendo borrador local", e)
+            return None
+
+    def _flush_outbox_before_write(self, draft_key):
+        """Corre en el worker: lo encolado antes para este registro debe llegar primero."""
+        if not draft_key:
+            return
+        try:
+            self.outbox.replay(draft_key=draft_key, blocking=True)
+        except Exception as e:
+            LoggerService().log_error("Error reenviando escrituras encoladas del registro", e)
+
+    def _discard_draft_after_save(self, draft_key):
+        if not draft_key:
+            return
+        try:
+            self.outbox.discard_draft(draft_key)
+        except Exception as e:
+            LoggerService().log_error("Error descartando borrador local", e)
+
+    # ===============================
+    # Catálogos compartidos
+    # ===============================
+    def _attach_catalog(self, combo, data, cache_key=None):
+        # Todas las vistas del mismo catálogo comparten un único modelo
+        registry = CatalogModelRegistry.instance()
+        model = registry.model_for(cache_key, data, owner=combo)
+        if isinstance(combo, CheckableComboBox):
+            combo.setCatalogModel(model)
+        else:
+            combo.setModel(model)
+            # Igual que al poblar con addItem: queda el primero seleccionado
+            combo.setCurrentIndex(0 if combo.count() else -1)
+        registry.attach(combo, cache_key if registry.is_shared(model) else None, self._repoint_catalog)
+
+    @staticmethod
+    def _repoint_catalog(combo, model):
+        # Otra versión del catálogo reemplaza al modelo que muestra el combo: se conserva la selección
+        if isinstance(combo, CheckableComboBox):
+            combo.replaceCatalogModel(model)
+            return
+        current = combo.currentData()
+        combo.blockSignals(True)
+        combo.setModel(model)
+        index = combo.findData(current) if current is not None else -1
+        combo.setCurrentIndex(index)
+        combo.blockSignals(False)
+        if current is not None and index < 0:
+            # La opción elegida ya no existe: los dependientes deben enterarse
+            combo.currentIndexChanged.emit(-1)
+
+    def _detach_catalog(self, combo):
+        CatalogModelRegistry.instance().detach(combo)
+        # clear() sobre un modelo compartido vaciaría los combos de otros diálogos
+        if isinstance(combo, QComboBox) and not isinstance(combo, CheckableComboBox) \
+                and CatalogModelRegistry.instance().is_shared(combo.model()):
+            combo.setModel(QStandardItemModel(combo))
+        else:
+            combo.clear()
+
+    def _on_combo_data(self, combo, data, cache_key=None):
+        self._attach_catalog(combo, data, cache_key)
+        self._pending_catalogs.discard(combo)
                 
         # Logic for selection state
         if isinstance(combo, CheckableComboBox):
@@ -1370,8 +1534,8 @@ class GenericFormDialog(QDialog):
                  combo.setCurrentIndex(-1)
                  
         if self.asset_data and self._allow_asset_reapply:
-            # Re-try setting value if data is already here (Edit mode)
-            self._try_set_values()
+            # Solo se hidratan los campos que acaban de quedar listos (este combo)
+            self._hydrate_fields()
 
     # ===============================
     # Dependency Logic
@@ -1393,7 +1557,7 @@ class GenericFormDialog(QDialog):
 
             # If trigger is empty, clear dependent and skip load
             if not trigger_val:
-                dep_widget.clear()
+                self._detach_catalog(dep_widget)
                 if isinstance(dep_widget, QComboBox) and not dep_widget.isEditable():
                      dep_widget.setCurrentIndex(-1)
                 continue
@@ -1413,23 +1577,20 @@ class GenericFormDialog(QDialog):
 
     def _load_dependent_combo(self, combo, url, cache_key=None):
         # Create a worker just for this
-        combo.clear()
+        self._detach_catalog(combo)
         
         # Use CatalogoService to leverage cache if available
         worker = ComboLoaderRunnable(self.catalogo_service.get_catalogo, url, cache_key)
         self._active_runnables.append(worker)
         
-        worker.signals.result.connect(partial(self._on_dependent_data, combo))
+        worker.signals.result.connect(partial(self._on_dependent_data, combo, cache_key=cache_key))
         worker.signals.error.connect(self._on_load_error)
         # We don't increment pending_loads for dynamic reloads to avoid showing the overlay
         # but we do want to cleanup
         self.thread_pool.start(worker)
 
-    def _on_dependent_data(self, combo, data):
-        combo.clear()
-        if data:
-            for item in data:
-                 combo.addItem(item["nombre"], item["id"])
+    def _on_dependent_data(self, combo, data, cache_key=None):
+        self._attach_catalog(combo, data, cache_key)
                  
         # If we have asset data pending for this combo (e.g. during initial load), set it now
         # We need to know which key this combo belongs to...
@@ -1509,6 +1670,10 @@ class GenericFormDialog(QDialog):
     # Submit
     # ===============================
     def _submit(self):
+        if self._submitting:
+            return
+        self._start_submit_profile("form.submit")
+
         # Determine payload based on form type
         if self.config.get("endpoint") == "/eipd":
              payload = self._build_eipd_payload()
@@ -1529,45 +1694,142 @@ class GenericFormDialog(QDialog):
                     confirm_text="Entendido",
                     parent=self
                 ).exec()
+                self._stop_submit_profile(resultado="validación")
                 return # Abort submission
 
+        # Defaults que no están en los combos ni en memoria: se resuelven en el worker
+        deferred = {}
         if not self.is_edit:
             if endpoint == "/activos":
-                payload = self._apply_activo_create_defaults(payload)
+                payload = self._apply_activo_create_defaults(payload, deferred)
             elif endpoint == "/eipd":
-                payload = self._apply_eipd_create_defaults(payload)
+                payload = self._apply_eipd_create_defaults(payload, deferred)
             else:
-                payload = self._apply_generic_required_defaults(payload)
-        
+                payload = self._apply_generic_required_defaults(payload, deferred)
+
+        if self.is_edit:
+            method, path = "PUT", f"{endpoint}/{self.record_id}"
+        else:
+            method, path = "POST", endpoint
+
+        # Todo lo que lee widgets se toma aquí; el worker solo hace red, caché y outbox
+        draft_values = self._collect_draft_values()
+        self._set_submitting(True, "Guardando...")
+        self.submit_worker = ApiWorker(
+            self._write_record, method, path, payload, deferred, draft_values, parent=self
+        )
+        self.submit_worker.finished.connect(self._on_submit_done)
+        self.submit_worker.error.connect(self._on_submit_error)
+        self.submit_worker.start()
+
+    def _write_record(self, method, path, payload, deferred, draft_values):
+        """Corre en un ApiWorker: no toca widgets."""
+        self._resolve_deferred_defaults(payload, deferred)
+        endpoint = self.config.get("endpoint")
+        draft_key = self._draft_key()
+        self._flush_outbox_before_write(draft_key)
+        try:
+            if method == "PUT":
+                response = self.api.put(path, payload)
+            else:
+                response = self.api.post(path, payload)
+            self._discard_draft_after_save(draft_key)
+            return {"status": "saved", "response": response}
+        except Exception as e:
+            if not OutboxService.is_offline_error(e):
+                raise
+
         try:
             if self.is_edit:
-                self.api.put(f"{endpoint}/{self.record_id}", payload)
-                msg = f"{self.config.get('title_edit', 'Registro')} actualizado correctamente."
+                self.outbox.enqueue(
+                    method, path, payload,
+                    endpoint=endpoint, record_id=self.record_id, draft_values=draft_values,
+                )
             else:
-                self.api.post(endpoint, payload)
-                msg = f"{self.config.get('title_new', 'Registro')} creado correctamente."
+                self.outbox.enqueue(method, path, payload, endpoint=endpoint, draft_values=draft_values)
+        except Exception as e:
+            LoggerService().log_error("Error encolando escritura offline", e)
+            return {"status": "offline_failed", "error": str(e)}
+        return {"status": "offline"}
 
-            LoggerService().log_event(msg)
-            
-            AlertDialog(
-                title="Éxito",
-                message=msg,
-                icon_path="src/resources/icons/alert_success.svg",
-                confirm_text="Aceptar",
-                parent=self
-            ).exec()
-            
+    def _on_submit_done(self, result):
+        self._set_submitting(False)
+        status = result.get("status")
+        self._stop_submit_profile(resultado=status)
+
+        if status == "offline":
+            self._notify_saved_offline()
             self.accept()
-            
-        except Exception as e:
-            LoggerService().log_error("Error guardar form", e)
+            return
+        if status == "offline_failed":
             AlertDialog(
                 title="Error",
-                message=str(e),
+                message=f"No se pudo guardar localmente: {result.get('error')}",
                 icon_path="src/resources/icons/alert_error.svg",
                 confirm_text="Aceptar",
                 parent=self
             ).exec()
+            return
+
+        if self.is_edit:
+            msg = f"{self.config.get('title_edit', 'Registro')} actualizado correctamente."
+        else:
+            msg = f"{self.config.get('title_new', 'Registro')} creado correctamente."
+        LoggerService().log_event(msg)
+        self._emit_saved(result.get("response"), created=not self.is_edit)
+
+        AlertDialog(
+            title="Éxito",
+            message=msg,
+            icon_path="src/resources/icons/alert_success.svg",
+            confirm_text="Aceptar",
+            parent=self
+        ).exec()
+
+        self.accept()
+
+    def _on_submit_error(self, error):
+        self._set_submitting(False)
+        self._stop_submit_profile(resultado="error")
+        LoggerService().log_error("Error guardar form", error)
+        AlertDialog(
+            title="Error",
+            message=str(error),
+            icon_path="src/resources/icons/alert_error.svg",
+            confirm_text="Aceptar",
+            parent=self
+        ).exec()
+
+    def _set_submitting(self, submitting, message="Guardando..."):
+        self._submitting = submitting
+        self.setEnabled(not submitting)
+        if submitting:
+            self.loading_overlay.show_loading(message)
+        else:
+            self.loading_overlay.hide_loading()
+
+    def reject(self):
+        # Cerrar con Esc o la X mientras se guarda dejaría el worker sin diálogo
+        if self._submitting:
+            return
+        super().reject()
+
+    def _emit_saved(self, record=None, created=False):
+        self.record_saved.emit({
+            "id": self.record_id,
+            "record": record if isinstance(record, dict) else None,
+            "created": created,
+        })
+
+    def _collect_draft_values(self):
+        """Valores del formulario en el formato que entiende _try_set_values."""
+        values = self._build_generic_payload()
+        values.pop("creado_por_usuario_id", None)
+        for key, widget in self.inputs.items():
+            if isinstance(widget, (QTextEdit, QPlainTextEdit)):
+                text = widget.toPlainText().strip()
+                values[key] = text if text else None
+        return {k: v for k, v in values.items() if v is not None}
 
     def _first_combo_id(self, key):
         widget = self.inputs.get(key)
@@ -1575,9 +1837,24 @@ class GenericFormDialog(QDialog):
             return widget.itemData(0)
         return None
 
-    def _first_id_from_endpoint(self, endpoint):
+    def _field_cache_key(self, key):
+        for section in self.config.get("sections", []):
+            for field in self._iter_fields(section.get("fields", [])):
+                if field.get("key") == key:
+                    return field.get("cache_key", f"cache_{key}")
+        return None
+
+    def _default_id(self, key, cache_key=None):
+        """Primer id sin tocar la red: el combo ya cargado o el catálogo en memoria."""
+        return (
+            self._first_combo_id(key)
+            or CatalogModelRegistry.instance().first_id(cache_key or self._field_cache_key(key))
+        )
+
+    def _first_id_from_endpoint(self, endpoint, cache_key=None):
+        # Corre en el worker de guardado: catálogo en caché en disco o, si no está, el backend
         try:
-            items = self.api.get(endpoint)
+            items = self.catalogo_service.get_catalogo(endpoint, cache_key)
             if isinstance(items, list) and items:
                 first = items[0]
                 if isinstance(first, dict):
@@ -1586,7 +1863,11 @@ class GenericFormDialog(QDialog):
             return None
         return None
 
-    def _apply_activo_create_defaults(self, payload):
+    def _resolve_deferred_defaults(self, payload, deferred):
+        for key, (endpoint, cache_key, fallback) in deferred.items():
+            payload[key] = self._first_id_from_endpoint(endpoint, cache_key) or fallback
+
+    def _apply_activo_create_defaults(self, payload, deferred):
         payload["nombre_activo"] = payload.get("nombre_activo") or "Activo sin nombre"
         payload["responsable"] = payload.get("responsable") or "Sin responsable"
         payload["rol"] = payload.get("rol") or self._first_combo_id("rol") or "Sin rol"
@@ -1598,7 +1879,9 @@ class GenericFormDialog(QDialog):
         }
         for key, endpoint in fk_defaults.items():
             if not payload.get(key):
-                payload[key] = self._first_combo_id(key) or self._first_id_from_endpoint(endpoint)
+                payload[key] = self._default_id(key)
+                if not payload[key]:
+                    deferred[key] = (endpoint, self._field_cache_key(key), None)
 
         payload["creado_por_usuario_id"] = (
             payload.get("creado_por_usuario_id")
@@ -1606,12 +1889,12 @@ class GenericFormDialog(QDialog):
         )
         return payload
 
-    def _apply_eipd_create_defaults(self, payload):
+    def _apply_eipd_create_defaults(self, payload, deferred):
         if not payload.get("rat_id"):
-            payload["rat_id"] = (
-                self._first_combo_id("identificacion_rat_catalogo")
-                or self._first_id_from_endpoint("/rat/catalogo")
-            )
+            cache_key = self._field_cache_key("identificacion_rat_catalogo")
+            payload["rat_id"] = self._default_id("identificacion_rat_catalogo", cache_key)
+            if not payload["rat_id"]:
+                deferred["rat_id"] = ("/rat/catalogo", cache_key, None)
         return payload
 
     def _is_missing_value(self, value):
@@ -1630,7 +1913,7 @@ class GenericFormDialog(QDialog):
             else:
                 yield field
 
-    def _apply_generic_required_defaults(self, payload):
+    def _apply_generic_required_defaults(self, payload, deferred):
         sections = self.config.get("sections", [])
         for section in sections:
             for field in self._iter_fields(section.get("fields", [])):
@@ -1649,13 +1932,16 @@ class GenericFormDialog(QDialog):
                 default_value = None
 
                 if ftype in ["combo", "combo_static"]:
-                    default_value = self._first_combo_id(key)
-                    if default_value is None and field.get("source"):
-                        default_value = self._first_id_from_endpoint(field["source"])
-                    if default_value is None and field.get("options"):
+                    default_value = self._default_id(key, field.get("cache_key", f"cache_{key}"))
+                    fallback = None
+                    if field.get("options"):
                         opts = field.get("options") or []
                         if opts:
-                            default_value = opts[0].get("id")
+                            fallback = opts[0].get("id")
+                    if default_value is None and field.get("source"):
+                        deferred[key] = (field["source"], field.get("cache_key", f"cache_{key}"), fallback)
+                    elif default_value is None:
+                        default_value = fallback
                 elif ftype in ["text", "textarea"]:
                     default_value = "Pendiente"
                 elif ftype == "file":
@@ -1,5 +1,6 @@
 import json
 from functools import partial
+from urllib.parse import urlencode
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
@@ -8,20 +9,21 @@ from PySide6.QtWidgets import (
     QFrame, QHeaderView, QMenu, QFileDialog,
     QAbstractScrollArea, QAbstractItemView
 )
-from PySide6.QtGui import QTextDocument, QActionGroup
-from PySide6.QtPrintSupport import QPrinter
-import csv
+from PySide6.QtGui import QActionGroup
 from PySide6.QtCore import Qt, QTimer, QDateTime, QLocale, QThreadPool, QPoint
 
 from src.core.api_client import ApiClient
 from src.services.catalogo_service import CatalogoService
+from src.services.snapshot_store import SnapshotStore
 from src.services.logger_service import LoggerService
 from src.workers.api_worker import ApiWorker
 from src.workers.combo_loader import ComboLoaderRunnable
 from src.components.alert_dialog import AlertDialog
 from src.components.loading_overlay import LoadingOverlay
 from src.components.dialog_registry import get_dialog_class
-from src.services.user_service import UserService
+from src.services.session_service import SessionService
+from src.core.ui_scheduler import UiScheduler
+from src.core.profiling import profile_scope
 from src.workers.api_worker import ApiWorker
 
 from utils import icon
@@ -45,7 +47,31 @@ class GenericGridView(QWidget):
         self.total_pages = 1
         self.row_height = 44
         self.column_filters = {}
+        self.sort_state = None  # (campo_api, "asc" | "desc")
         self._raw_items = []
+        self._has_loaded = False
+        self._reload_pending = False
+        self._rendered_items = []
+        self._revalidating = False
+        self._reload_seq = 0
+        self._last_listado = None
+        self._last_indicadores = None
+        # Registros de la última consulta + token para sincronización incremental
+        self._sync_store = None
+        # Tras editar un registro los indicadores se refrescan con calma, no por cada guardado
+        self._indicators_stale = False
+        self._indicators_timer = QTimer(self)
+        self._indicators_timer.setSingleShot(True)
+        self._indicators_timer.setInterval(2000)
+        self._indicators_timer.timeout.connect(self._refresh_indicators_if_visible)
+        # Última primera página vista (por usuario) para pintar al instante al abrir
+        self.snapshot_cache = SnapshotStore()
+        # Recarga + indicadores + ediciones seguidas dejan un solo snapshot por ráfaga
+        self._pending_snapshot = None
+        self._snapshot_timer = QTimer(self)
+        self._snapshot_timer.setSingleShot(True)
+        self._snapshot_timer.setInterval(500)
+        self._snapshot_timer.timeout.connect(self._flush_snapshot)
 
         # UI Elements Storage (for later access)
         self.filters_ui = {} # Map filter_id -> QComboBox
@@ -62,18 +88,12 @@ class GenericGridView(QWidget):
         QTimer.singleShot(0, self._init_async_filters)
         
         LoggerService().log_event(f"Usuario accedió a {self.config.get('titulo', 'Vista Genérica')}")
+        self._paint_snapshot()
         self._reload_all()
-        self.user_service = UserService()
-        self._load_current_user()
+        SessionService.instance().subscribe(self._on_profile_changed, self._on_user_error)
 
-    def _load_current_user(self):
-        def do_load():
-            return self.user_service.get_me()
-
-        self.user_worker = ApiWorker(do_load)
-        self.user_worker.finished.connect(self._on_user_loaded)
-        self.user_worker.error.connect(self._on_user_error)
-        self.user_worker.start()
+    def _on_profile_changed(self, profile: dict):
+        self._on_user_loaded(profile.get("user") or {})
     
     def _on_user_loaded(self, user: dict):
         nombre = user.get("nombre_completo") or "Usuario"
@@ -93,6 +113,14 @@ class GenericGridView(QWidget):
             self.loading_overlay.resize(event.size())
         super().resizeEvent(event)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Recarga diferida mientras la vista estaba oculta en el stack
+        if self._reload_pending:
+            QTimer.singleShot(0, self._reload_all)
+        elif self._indicators_stale:
+            QTimer.singleShot(0, self._refresh_indicators_if_visible)
+
     # ======================================================
     # UI Builder
     # ======================================================
@@ -107,6 +135,14 @@ class GenericGridView(QWidget):
         title = QLabel(self.config.get("titulo", ""))
         title.setObjectName("pageTitle")
         header_top.addWidget(title)
+
+        # Estado de revalidación (datos guardados mientras llega la respuesta)
+        self.sync_status_label = QLabel("")
+        self.sync_status_label.setObjectName("gridSyncStatus")
+        self.sync_status_label.setStyleSheet("color: #64748b; font-size: 12px; font-style: italic;")
+        self.sync_status_label.hide()
+        header_top.addSpacing(12)
+        header_top.addWidget(self.sync_status_label)
         header_top.addStretch()
         
         self.user_label = QLabel("Cargando...") 
@@ -318,9 +354,8 @@ class GenericGridView(QWidget):
         )
 
     def _start_datetime_timer(self):
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._update_datetime)
-        self._timer.start(1000)
+        # Reloj compartido: se detiene solo cuando la vista está oculta en el stack
+        UiScheduler.instance().subscribe_clock(self, self._update_datetime)
 
     # ======================================================
     # Filters Logic
@@ -349,6 +384,7 @@ class GenericGridView(QWidget):
         self.search_input.clear()
         self.column_filter_combo.setCurrentIndex(0)
         self.column_filters.clear()
+        self.sort_state = None
             
         self.current_page = 1
         self._reload_all()
@@ -370,59 +406,223 @@ class GenericGridView(QWidget):
     # ======================================================
 
     def _reload_all(self):
-        self.loading_overlay.show_loading()
+        if self._has_loaded and not self.isVisible():
+            self._reload_pending = True
+            return
+        self._reload_pending = False
+        self._has_loaded = True
+
+        # Con datos guardados en pantalla no se bloquea la grilla: se revalida en segundo plano
+        if not self._revalidating:
+            self.loading_overlay.show_loading()
         
         # State capture
         page = self.current_page
         size = self.page_size
         
-        # Build Filters Dict
-        filters = {}
-        search_param = self.config.get("buscador", {}).get("param_api")
-        selected_column = self.column_filter_combo.currentData()
-        if search_param:
-            # If user filters by a specific column, apply search locally to avoid backend/global mismatch.
-            if selected_column == "__all__":
-                filters[search_param] = self.search_input.text()
-            
-        # Task closure
-        def fetch_task():
-            # Build URL
-            base_url = self.config["endpoints"]["listado"]
-            url = f"{base_url}?page={page}&size={size}"
-            
-            for param, value in filters.items():
-                if value:
-                    url += f"&{param}={value}"
-            
-            main_data = self.api.get(url)
-            
-            indicadores_data = None
-            if self.config.get("endpoints", {}).get("indicadores"):
-                indicadores_data = self.api.get(self.config["endpoints"]["indicadores"])
-                
-            return {
-                "listado": main_data,
-                "indicadores": indicadores_data
-            }
+        # Búsqueda, filtros de cabecera y orden mapeados a parámetros del backend
+        params = self._build_query_params(page, size)
+
+        # Listado e indicadores son independientes: se piden en paralelo y
+        # cada uno se pinta apenas llega. _reload_seq descarta respuestas viejas.
+        self._reload_seq += 1
+        seq = self._reload_seq
 
-        self.worker = ApiWorker(fetch_task, parent=self)
-        self.worker.finished.connect(self._on_reload_finished)
-        self.worker.error.connect(self._on_reload_error)
+        self.worker = ApiWorker(self._fetch_listado, params, self._sync_store, parent=self)
+        self.worker.finished.connect(partial(self._on_listado_loaded, seq))
+        self.worker.error.connect(partial(self._on_reload_error, seq))
         self.worker.start()
 
-    def _on_reload_finished(self, data):
-        self._populate_table(data["listado"])
-        if data.get("indicadores"):
-            self._populate_indicators(data["indicadores"])
-        self.loading_overlay.hide_loading()
+        self._refresh_indicators(seq)
+
+    def _refresh_indicators(self, seq):
+        indicadores_endpoint = self.config.get("endpoints", {}).get("indicadores")
+        if not indicadores_endpoint:
+            return
+        self._indicators_stale = False
+        self._indicators_timer.stop()
+        self.indicators_worker = ApiWorker(self.api.get, indicadores_endpoint, parent=self)
+        self.indicators_worker.finished.connect(partial(self._on_indicadores_loaded, seq))
+        self.indicators_worker.error.connect(partial(self._on_indicadores_error, seq))
+        self.indicators_worker.start()
+
+    def _refresh_indicators_if_visible(self):
+        if not self.isVisible():
+            self._indicators_stale = True
+            return
+        self._refresh_indicators(self._reload_seq)
 
-    def _on_reload_error(self, error):
+    def _on_listado_loaded(self, seq, result):
+        if seq != self._reload_seq:
+            return
+        data = result["listado"]
+        self._sync_store = result["sync"]
+        self._last_listado = data
+        with profile_scope(f"grid.reload.{self.config.get('id')}"):
+            self._populate_table(data)
+            self.loading_overlay.hide_loading()
+            self._end_revalidation()
+            self._save_snapshot()
+
+    def _on_indicadores_loaded(self, seq, data):
+        if seq != self._reload_seq:
+            return
+        self._last_indicadores = data
+        if data:
+            self._populate_indicators(data)
+        self._save_snapshot()
+
+    def _on_indicadores_error(self, seq, error):
+        if seq != self._reload_seq:
+            return
+        LoggerService().log_error(f"Error cargando indicadores de grilla {self.config['id']}", error)
+
+    def _on_reload_error(self, seq, error):
+        if seq != self._reload_seq:
+            return
         self.loading_overlay.hide_loading()
+        if self._revalidating:
+            self._revalidating = False
+            self.sync_status_label.setText("Sin conexión · mostrando datos guardados")
         LoggerService().log_error(f"Error cargando grilla {self.config['id']}", error)
         # TODO: Show alert? Original view just logged and printed
         print(f"Error reloading: {error}")
 
+    # ======================================================
+    # Sincronización incremental (updated-since)
+    # ======================================================
+
+    def _sync_config(self):
+        sync = self.config.get("sincronizacion") or {}
+        return sync if sync.get("habilitado") else None
+
+    def _fetch_listado(self, params, store):
+        # Corre en el worker: no toca widgets ni muta el store recibido
+        base_url = self.config["endpoints"]["listado"]
+        query = urlencode(params)
+        sync = self._sync_config()
+
+        if sync and store and store["query"] == query:
+            delta_params = dict(params)
+            delta_params[sync.get("param_desde", "updated_since")] = store["token"]
+            delta = self.api.get(f"{base_url}?{urlencode(delta_params)}")
+            merged = self._merge_delta(store, delta, sync)
+            if merged is not None:
+                return merged
+
+        response = self.api.get(f"{base_url}?{query}")
+        return {"listado": response, "sync": self._build_sync_store(query, response, sync)}
+
+    def _build_sync_store(self, query, response, sync):
+        # Sin token en la respuesta el backend no soporta delta: se queda en modo completo
+        if not sync or not isinstance(response, dict):
+            return None
+        token = response.get(sync.get("campo_token", "sync_token"))
+        if not token:
+            return None
+        return {
+            "query": query,
+            "token": token,
+            "items": list(response.get("items", [])),
+            "pages": response.get("pages", 1),
+        }
+
+    def _merge_delta(self, store, delta, sync):
+        # None = no se puede aplicar el delta con seguridad; se pide la página completa
+        if not isinstance(delta, dict):
+            return None
+        token = delta.get(sync.get("campo_token", "sync_token"))
+        if not token:
+            return None
+        # Un delta paginado trae solo la primera tanda de cambios: aplicarlo perdería el resto
+        if (delta.get("pages") or 1) > 1:
+            return None
+
+        id_field = self.config["campo_id"]
+        items = list(store["items"])
+        positions = {item.get(id_field): i for i, item in enumerate(items)}
+
+        for changed in delta.get("items") or []:
+            pos = positions.get(changed.get(id_field))
+            if pos is None:
+                # Registro nuevo: su posición depende del orden/paginación del backend
+                return None
+            items[pos] = changed
+
+        deleted = set(delta.get(sync.get("campo_eliminados", "deleted_ids")) or [])
+        if deleted & positions.keys():
+            # Con más páginas, la siguiente correría filas hacia esta
+            if store["pages"] > 1:
+                return None
+            items = [item for item in items if item.get(id_field) not in deleted]
+
+        # "pages" del delta pagina los cambios, no el listado: se conserva el del store
+        pages = store["pages"]
+        listado = {"items": items, "pages": pages}
+        new_store = {"query": store["query"], "token": token, "items": items, "pages": pages}
+        return {"listado": listado, "sync": new_store}
+
+    # ======================================================
+    # Snapshot local (stale-while-revalidate)
+    # ======================================================
+
+    def _snapshot_key(self):
+        user_id = self.api.user_id
+        if not user_id:
+            return None
+        return f"{user_id}:{self.config.get('id')}"
+
+    def _is_default_query(self):
+        # Solo se guarda/pinta la vista por defecto: página 1 sin búsqueda ni filtros
+        return (
+            self.current_page == 1
+            and not self.search_input.text().strip()
+            and not self.column_filters
+            and self.sort_state is None
+        )
+
+    def _paint_snapshot(self):
+        key = self._snapshot_key()
+        if not key:
+            return
+        try:
+            snapshot = self.snapshot_cache.get(key)
+        except Exception:
+            snapshot = None
+        if not snapshot:
+            return
+
+        self._last_listado = snapshot.get("listado")
+        self._last_indicadores = snapshot.get("indicadores")
+        self._populate_table(self._last_listado)
+        if self._last_indicadores:
+            self._populate_indicators(self._last_indicadores)
+        self._revalidating = True
+        self.sync_status_label.setText("Mostrando datos guardados · actualizando…")
+        self.sync_status_label.show()
+
+    def _end_revalidation(self):
+        self._revalidating = False
+        self.sync_status_label.hide()
+
+    def _save_snapshot(self):
+        # La consulta se evalúa ahora; la escritura (en otro hilo) sale al vencer el debounce
+        key = self._snapshot_key()
+        if not key or not self._is_default_query() or self._last_listado is None:
+            return
+        self._pending_snapshot = (key, {
+            "listado": self._last_listado,
+            "indicadores": self._last_indicadores,
+        })
+        self._snapshot_timer.start()
+
+    def _flush_snapshot(self):
+        if self._pending_snapshot is None:
+            return
+        key, data = self._pending_snapshot
+        self._pending_snapshot = None
+        self.snapshot_cache.set_async(key, data)
+
     def _populate_table(self, response):
         if not response:
             items = []
@@ -436,45 +636,67 @@ class GenericGridView(QWidget):
         self._raw_items = list(items)
         items = self._apply_local_search(self._raw_items)
         items = self._apply_column_header_filters(items)
+        items = self._apply_local_sort(items)
         
+        self._render_rows(items)
+
+        if hasattr(self, "page_label"):
+            self.page_label.setText(f"Página {self.current_page} de {self.total_pages}")
+        self._refresh_header_filter_icons()
+
+    def _render_rows(self, items):
+        # Solo se repintan las filas que cambiaron respecto de lo que ya está en pantalla
+        previous = self._rendered_items
         self.table.setRowCount(len(items))
-        
+
+        for row, item in enumerate(items):
+            old = previous[row] if row < len(previous) else None
+            if old == item:
+                continue
+            self._render_row(row, item, old)
+
+        self._rendered_items = list(items)
+
+    def _render_row(self, row, item, old=None):
         columns = self.columns
         id_field = self.config["campo_id"]
         null_value = self.config.get("valor_nulo", "—")
-        
-        for row, item in enumerate(items):
-            # Data cells
-            for col_idx, col_config in enumerate(columns):
-                val = item.get(col_config["campo_api"])
-                text = self._format_cell_value(col_config, val, null_value)
-                item_widget = QTableWidgetItem(text)
-                
-                # Check for specific alignment in config later? 
-                # For now, align center-left or center based on type usually looks best.
-                # User asked for "alineada", implying it's misaligned. 
-                # Usually QTableWidget defaults to Left-Center. Titles are usually Center or Left.
-                # If they say "name of field... and info appears misaligned", it might mean headers vs content.
-                # Headers are usually centered. Let's align content to Center-Left (VCenter | Left) 
-                # OR if they want strict column alignment, maybe everything Left?
-                # But headers are centered by default in many themes.
-                # Let's try centering everything vertically, and Left horizontally for text, Center for short IDs.
-                # To be safe and generic: AlignCenter for everything usually solves "misaligned vs header".
-                # Or better: VCenter | HCenter
-                item_widget.setTextAlignment(Qt.AlignCenter)
-                
-                self.table.setItem(row, col_idx, item_widget)
+
+        # Data cells
+        for col_idx, col_config in enumerate(columns):
+            val = item.get(col_config["campo_api"])
+            text = self._format_cell_value(col_config, val, null_value)
+            existing = self.table.item(row, col_idx)
+            if existing is not None:
+                if existing.text() != text:
+                    existing.setText(text)
+                continue
+            item_widget = QTableWidgetItem(text)
+            
+            # Check for specific alignment in config later? 
+            # For now, align center-left or center based on type usually looks best.
+            # User asked for "alineada", implying it's misaligned. 
+            # Usually QTableWidget defaults to Left-Center. Titles are usually Center or Left.
+            # If they say "name of field... and info appears misaligned", it might mean headers vs content.
+            # Headers are usually centered. Let's align content to Center-Left (VCenter | Left) 
+            # OR if they want strict column alignment, maybe everything Left?
+            # But headers are centered by default in many themes.
+            # Let's try centering everything vertically, and Left horizontally for text, Center for short IDs.
+            # To be safe and generic: AlignCenter for everything usually solves "misaligned vs header".
+            # Or better: VCenter | HCenter
+            item_widget.setTextAlignment(Qt.AlignCenter)
             
-            # Actions cell
-            if self.config.get("acciones"):
-                record_id = item.get(id_field)
+            self.table.setItem(row, col_idx, item_widget)
+        
+        # Actions cell (los botones solo dependen del id del registro)
+        if self.config.get("acciones"):
+            record_id = item.get(id_field)
+            if old is None or old.get(id_field) != record_id or self.table.cellWidget(row, len(columns)) is None:
                 self._add_actions_cell(row, len(columns), record_id)
 
-        if hasattr(self, "page_label"):
-            self.page_label.setText(f"Página {self.current_page} de {self.total_pages}")
-        self._refresh_header_filter_icons()
-
     def _apply_local_search(self, items):
+        # También con la búsqueda enviada al backend: es idempotente y cubre un
+        # backend que ignore el parámetro (devolvería la página sin filtrar)
         query = self.search_input.text().strip().lower()
         if not query:
             return items
@@ -503,6 +725,7 @@ class GenericGridView(QWidget):
         for item in items:
             include = True
             for field, expected in self.column_filters.items():
+                # Se aplica aunque el filtro haya ido al backend (red de seguridad idempotente)
                 if expected is None:
                     continue
                 value = item.get(field)
@@ -513,6 +736,66 @@ class GenericGridView(QWidget):
                 filtered.append(item)
         return filtered
 
+    def _apply_local_sort(self, items):
+        if not self.sort_state:
+            return items
+        field, direction = self.sort_state
+        if self._sort_is_remote(field):
+            return items
+        # Los vacíos quedan siempre al final
+        present = [i for i in items if i.get(field) not in (None, "")]
+        missing = [i for i in items if i.get(field) in (None, "")]
+        present.sort(key=lambda i: str(i.get(field)).lower(), reverse=(direction == "desc"))
+        return present + missing
+
+    # ======================================================
+    # Pushdown al backend (búsqueda, filtros de cabecera, orden)
+    # ======================================================
+
+    def _column_config(self, field):
+        for col in self.columns:
+            if col["campo_api"] == field:
+                return col
+        return {}
+
+    def _search_param(self):
+        # Parámetro del backend para la búsqueda actual; None = se filtra localmente
+        if not self.search_input.text().strip():
+            return None
+        selected_column = self.column_filter_combo.currentData()
+        if selected_column == "__all__":
+            return self.config.get("buscador", {}).get("param_api")
+        return self._column_config(selected_column).get("busqueda_api")
+
+    def _header_filter_param(self, field, expected):
+        # "—" representa nulos en el menú: no hay forma de pedirlo al backend
+        if expected is None or expected == "—":
+            return None
+        return self._column_config(field).get("filtro_api")
+
+    def _sort_is_remote(self, field):
+        return bool(self.config.get("orden_api") and self._column_config(field).get("orden_api"))
+
+    def _build_query_params(self, page, size):
+        params = {"page": page, "size": size}
+
+        search_param = self._search_param()
+        if search_param:
+            params[search_param] = self.search_input.text().strip()
+
+        for field, expected in self.column_filters.items():
+            param = self._header_filter_param(field, expected)
+            if param:
+                params[param] = expected
+
+        if self.sort_state and self._sort_is_remote(self.sort_state[0]):
+            field, direction = self.sort_state
+            sort_config = self.config["orden_api"]
+            params[sort_config.get("param_campo", "sort_by")] = self._column_config(field)["orden_api"]
+            params[sort_config.get("param_direccion", "sort_dir")] = sort_config.get(direction, direction)
+
+        return params
+
     def _on_header_clicked(self, section_index):
         if section_index < 0 or section_index >= len(self.columns):
             return
@@ -525,6 +808,17 @@ class GenericGridView(QWidget):
         group = QActionGroup(menu)
         group.setExclusive(True)
 
+        current_sort = self.sort_state[1] if self.sort_state and self.sort_state[0] == field else None
+        sort_actions = {}
+        for direction, label in (("asc", "Ordenar ascendente"), ("desc", "Ordenar descendente")):
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(current_sort == direction)
+            sort_actions[action] = direction
+        if current_sort:
+            sort_actions[menu.addAction("Quitar orden")] = None
+        menu.addSeparator()
+
         current_filter = self.column_filters.get(field, None)
         all_action = menu.addAction("Todos")
         all_action.setCheckable(True)
@@ -556,12 +850,28 @@ class GenericGridView(QWidget):
         if selected is None:
             return
 
-        data = selected.data()
-        if data is None:
-            self.column_filters.pop(field, None)
+        if selected in sort_actions:
+            direction = sort_actions[selected]
+            previous = self.sort_state
+            self.sort_state = (field, direction) if direction else None
+            remote = any(s and self._sort_is_remote(s[0]) for s in (previous, self.sort_state))
         else:
-            self.column_filters[field] = data
-        self._populate_table({"items": self._raw_items, "pages": self.total_pages})
+            data = selected.data()
+            previous = self.column_filters.get(field)
+            if data is None:
+                self.column_filters.pop(field, None)
+            else:
+                self.column_filters[field] = data
+            remote = bool(
+                self._header_filter_param(field, previous) or self._header_filter_param(field, data)
+            )
+
+        if remote:
+            # El backend filtra/ordena sobre todas las páginas: se vuelve a la primera
+            self.current_page = 1
+            self._reload_all()
+        else:
+            self._populate_table({"items": self._raw_items, "pages": self.total_pages})
 
     def _refresh_header_filter_icons(self):
         for i, col in enumerate(self.columns):
@@ -571,6 +881,8 @@ class GenericGridView(QWidget):
             base = col["etiqueta"]
             field = col["campo_api"]
             suffix = "  ▼" if field not in self.column_filters else "  ●"
+            if self.sort_state and self.sort_state[0] == field:
+                suffix = ("  ↑" if self.sort_state[1] == "asc" else "  ↓") + suffix
             header_item.setText(f"{base}{suffix}")
 
     def _toggle_column_visibility(self, col_index, checked):
@@ -623,6 +935,75 @@ class GenericGridView(QWidget):
         if self.config.get("id") == "rat":
             self.catalogo_service.invalidate_cache_key("catalogo_rat_id")
 
+    # ======================================================
+    # Actualización puntual tras guardar en un diálogo
+    # ======================================================
+
+    def _run_record_dialog(self, dialog):
+        saved = []
+        if hasattr(dialog, "record_saved"):
+            dialog.record_saved.connect(saved.append)
+        if not dialog.exec():
+            return
+
+        self._invalidate_rat_catalog_cache_if_needed()
+        # Un registro nuevo depende del orden/paginación del backend: recarga normal
+        if saved and not saved[-1].get("created") and saved[-1].get("id") is not None:
+            self._refresh_record(saved[-1])
+        else:
+            self._reload_all()
+
+    def _refresh_record(self, saved):
+        record = saved.get("record")
+        if self._is_row_record(record):
+            self._patch_row(record)
+            return
+
+        fila = self.config.get("endpoints", {}).get("fila")
+        if fila:
+            self.row_worker = ApiWorker(self.api.get, fila.format(id=saved["id"]), parent=self)
+            self.row_worker.finished.connect(self._patch_row)
+            self.row_worker.error.connect(self._on_row_error)
+            self.row_worker.start()
+            return
+
+        # Sin endpoint de fila: con sincronización incremental solo viaja lo cambiado
+        self._reload_all()
+
+    def _is_row_record(self, record):
+        # Solo sirve si trae la forma del listado (id + todas las columnas)
+        if not isinstance(record, dict) or record.get(self.config["campo_id"]) is None:
+            return False
+        return all(col["campo_api"] in record for col in self.columns)
+
+    def _patch_row(self, record):
+        id_field = self.config["campo_id"]
+        record_id = record.get(id_field) if isinstance(record, dict) else None
+        positions = {item.get(id_field): i for i, item in enumerate(self._raw_items)}
+        if record_id is None or record_id not in positions:
+            self._reload_all()
+            return
+
+        pos = positions[record_id]
+        self._raw_items[pos] = {**self._raw_items[pos], **record}
+        if self._sync_store:
+            self._sync_store = {
+                **self._sync_store,
+                "items": [
+                    self._raw_items[pos] if item.get(id_field) == record_id else item
+                    for item in self._sync_store["items"]
+                ],
+            }
+
+        self._last_listado = {"items": list(self._raw_items), "pages": self.total_pages}
+        self._populate_table(self._last_listado)
+        self._save_snapshot()
+        self._indicators_timer.start()
+
+    def _on_row_error(self, error):
+        LoggerService().log_error(f"Error actualizando fila de grilla {self.config['id']}", error)
+        self._reload_all()
+
     # ======================================================
     # Actions
     # ======================================================
@@ -676,9 +1057,7 @@ class GenericGridView(QWidget):
                     kwargs["record_id"] = record_id # Future proofing
                     
                 dialog = DialogClass(self, **kwargs)
-                if dialog.exec():
-                    self._invalidate_rat_catalog_cache_if_needed()
-                    self._reload_all()
+                self._run_record_dialog(dialog)
             else:
                 print(f"Unknown dialog class: {dialog_class_name}")
 
@@ -818,6 +1197,7 @@ class GenericGridView(QWidget):
             file_path += '.csv'
             
         try:
+            import csv
             with open(file_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 
@@ -884,9 +1264,7 @@ class GenericGridView(QWidget):
         if DialogClass:
             # New mode usually implies no ID argument
             dialog = DialogClass(self)
-            if dialog.exec():
-                self._invalidate_rat_catalog_cache_if_needed()
-                self._reload_all()
+            self._run_record_dialog(dialog)
 
     # ======================================================
     # Lógica de Exportación
@@ -914,39 +1292,43 @@ class GenericGridView(QWidget):
             file_path += '.csv'
 
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # Prepara encabezados
-                headers = []
-                visible_cols = []
-                
-                for col in range(self.table.columnCount()):
-                    if self.table.isColumnHidden(col):
-                        continue
-                        
-                    header_item = self.table.horizontalHeaderItem(col)
-                    label = header_item.text() if header_item else ""
-                    if label == "Acciones":
-                        continue
-                        
-                    headers.append(label)
-                    visible_cols.append(col)
-                
-                writer.writerow(headers)
-                
-                # Prepara filas
-                for row in range(self.table.rowCount()):
-                    row_data = []
-                    for col in visible_cols:
-                        item = self.table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
-                    
+            self._write_csv(file_path)
         except Exception as e:
             LoggerService().log_error("Error exportando a CSV", e)
             self._show_export_error(f"Error al exportar: {str(e)}")
 
+    def _write_csv(self, file_path):
+        # Columnas visibles de la grilla tal como se ven en pantalla (sin "Acciones")
+        import csv
+        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            
+            # Prepara encabezados
+            headers = []
+            visible_cols = []
+            
+            for col in range(self.table.columnCount()):
+                if self.table.isColumnHidden(col):
+                    continue
+                    
+                header_item = self.table.horizontalHeaderItem(col)
+                label = header_item.text() if header_item else ""
+                if label == "Acciones":
+                    continue
+                    
+                headers.append(label)
+                visible_cols.append(col)
+            
+            writer.writerow(headers)
+            
+            # Prepara filas
+            for row in range(self.table.rowCount()):
+                row_data = []
+                for col in visible_cols:
+                    item = self.table.item(row, col)
+                    row_data.append(item.text() if item else "")
+                writer.writerow(row_data)
+
     def _export_pdf(self):
         if self.table.rowCount() == 0:
             self._show_export_error()
@@ -960,6 +1342,10 @@ class GenericGridView(QWidget):
             file_path += '.pdf'
             
         try:
+            # QtPrintSupport solo se carga al exportar: no pesa en el arranque
+            from PySide6.QtGui import QTextDocument
+            from PySide6.QtPrintSupport import QPrinter
+
             doc = QTextDocument()
             
             # Estilo HTML simple
@@ -1057,9 +1443,7 @@ class GenericGridView(QWidget):
         if DialogClass:
             # Modo creación generalmente no implica argumento ID
             dialog = DialogClass(self)
-            if dialog.exec():
-                self._invalidate_rat_catalog_cache_if_needed()
-                self._reload_all()
+            self._run_record_dialog(dialog)
 
     def _execute_action(self, action_config, record_id):
         action_type = action_config.get("tipo")
@@ -1080,9 +1464,7 @@ class GenericGridView(QWidget):
                     kwargs["record_id"] = record_id # A futuro
                     
                 dialog = DialogClass(self, **kwargs)
-                if dialog.exec():
-                    self._invalidate_rat_catalog_cache_if_needed()
-                    self._reload_all()
+                self._run_record_dialog(dialog)
             else:
                 print(f"Unknown dialog class: {dialog_class_name}")
 
@@ -1220,6 +1602,7 @@ class GenericGridView(QWidget):
             file_path += '.csv'
             
         try:
+            import csv
             with open(file_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 
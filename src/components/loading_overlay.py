@@ -2,6 +2,8 @@ from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QPainter, QColor, QPen
 
+from src.core.ui_scheduler import UiScheduler
+
 class LoadingOverlay(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -10,22 +12,24 @@ class LoadingOverlay(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
         
         self.angle = 0
+        self.message = "Cargando..."
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.rotate)
         self.hide()
+        # El spinner gira solo mientras el overlay es visible (página activa, ventana no minimizada)
+        UiScheduler.instance().bind_timer(self, self.timer, 50)
 
     def rotate(self):
         self.angle = (self.angle + 10) % 360
         self.update()
 
-    def show_loading(self):
+    def show_loading(self, message="Cargando..."):
+        self.message = message
         self.resize(self.parent().size())
         self.show()
         self.raise_()
-        self.timer.start(50)
 
     def hide_loading(self):
-        self.timer.stop()
         self.hide()
 
     def paintEvent(self, event):
@@ -56,7 +60,7 @@ class LoadingOverlay(QWidget):
         font.setBold(True)
         painter.setFont(font)
         # Position text below the spinner (which is roughly -20 to 20)
-        painter.drawText(-100, 30, 200, 30, Qt.AlignCenter, "Cargando...")
+        painter.drawText(-100, 30, 200, 30, Qt.AlignCenter, self.message)
         
         painter.end()
 
@@ -6,6 +6,9 @@ import json
 
 # Ajusta el import según tu estructura real
 from src.core.api_client import ApiClient
+from src.services.outbox_service import OutboxService
+from src.services.logger_service import LoggerService
+from src.workers.api_worker import ApiWorker
 
 class RatDialog(GenericFormDialog):
     RAT_CATALOGO_CACHE_KEY = "catalogo_rat_id"
@@ -302,6 +305,7 @@ class RatDialog(GenericFormDialog):
 )
 
             self._invalidate_rat_catalog_cache()
+            self._emit_saved()
 
             QApplication.restoreOverrideCursor()
 
@@ -323,6 +327,7 @@ class RatDialog(GenericFormDialog):
             {"estado": "APROBADO"}
         )
         self._invalidate_rat_catalog_cache()
+        self._emit_saved()
         QMessageBox.information(self, "RAT aprobado", "El RAT fue aprobado.")
         self.accept()
         
@@ -344,6 +349,7 @@ class RatDialog(GenericFormDialog):
                 }
             )
             self._invalidate_rat_catalog_cache()
+            self._emit_saved()
             QMessageBox.information(self, "RAT rechazado", "El RAT fue rechazado.")
             self.accept()
 
@@ -390,6 +396,11 @@ class RatDialog(GenericFormDialog):
             if backend_key in data and form_key not in data:
                 data[form_key] = data.get(backend_key)
 
+        # Edición encolada sin conexión: el borrador local prevalece
+        draft = self._pending_draft()
+        if draft:
+            data.update(draft)
+
         # Expandir secciones según tipo
         tid = data.get("tipo_tratamiento")
         tipo_rat = data.get("tipo_rat")
@@ -431,6 +442,8 @@ class RatDialog(GenericFormDialog):
     # =========================================================================
 
     def _submit(self):
+        if self._submitting:
+            return
         if self.record_id and self.rat_estado != "EN_EDICION":
             QMessageBox.warning(
                 self,
@@ -438,113 +451,149 @@ class RatDialog(GenericFormDialog):
                 f"Este RAT no se puede editar en estado {self._estado_label(self.rat_estado)}."
             )
             return
+        self._start_submit_profile("rat.submit")
 
         # 1. Obtenemos datos LIMPIOS (None si están vacíos)
         form_data = self._get_all_form_values()
+        payload_create = None
+        deferred = {}
+        draft_values = None
+
+        if self.record_id:
+            # Solo en edición se guarda sin conexión; el borrador se toma ahora, en el hilo de UI
+            draft_values = self._collect_draft_values()
+        else:
+            # MODO CREACIÓN: defaults desde los combos o catálogos ya cargados;
+            # lo que falte se resuelve en el worker
+            subsecretaria_id = form_data.get("subsecretaria") or self._default_id("subsecretaria")
+            if not subsecretaria_id:
+                deferred["subsecretaria_id"] = (
+                    "/setup/subsecretarias", self._field_cache_key("subsecretaria"), None
+                )
+            tipo_tratamiento = form_data.get("tipo_tratamiento") or self._default_id("tipo_tratamiento")
+            if not tipo_tratamiento:
+                deferred["tipo_tratamiento"] = (
+                    "/catalogos/rat/tipo-tratamiento", self._field_cache_key("tipo_tratamiento"), None
+                )
+            division_id = form_data.get("division") or self._first_combo_id("division")
+
+            if self._current_extension == "ia":
+                tipo_rat = "IA"
+            elif self._current_extension == "institucional":
+                tipo_rat = "PROCESO"
+            elif self._current_extension == "simplificado":
+                tipo_rat = "SIMPLIFICADO"
+            else:
+                tipo_rat = "IA"  # fallback seguro
+
+
+            payload_create = {
+                "nombre_tratamiento": form_data.get("nombre_tratamiento") or "RAT sin nombre",
+                "tipo_tratamiento": tipo_tratamiento,
+                "subsecretaria_id": subsecretaria_id,
+                "division_id": division_id,
+                "departamento": form_data.get("departamento"),
+                "responsable_tratamiento": form_data.get("nombre_responsable"),
+                "cargo_responsable": form_data.get("cargo_responsable"),
+                "email_responsable": form_data.get("email_responsable"),
+                "telefono_responsable": form_data.get("telefono_responsable"),
+
+                "encargado_tratamiento": form_data.get("nombre_encargado"),
+                "cargo_encargado": form_data.get("cargo_encargado"),
+                "email_encargado": form_data.get("email_encargado"),
+                "telefono_encargado": form_data.get("telefono_encargado"),
+                "estado": "EN_EDICION",
+                "tipo_rat": tipo_rat,  # Tu backend probablemente exige esto
+                "tipo_tratamiento_otro": "N/A"
+                
+            }
 
+        self._set_submitting(True, "Guardando RAT...")
+        self.submit_worker = ApiWorker(
+            self._write_rat, form_data, payload_create, deferred, draft_values, parent=self
+        )
+        self.submit_worker.finished.connect(self._on_rat_submit_done)
+        self.submit_worker.error.connect(self._on_rat_submit_error)
+        self.submit_worker.start()
+
+    def _write_rat(self, form_data, payload_create, deferred, draft_values):
+        """Corre en un ApiWorker: PUT/POST principal y secciones, sin tocar widgets."""
+        created = not self.record_id
+        draft_key = self._draft_key()
         try:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            
             if self.record_id:
                 # MODO EDICIÓN
+                self._flush_outbox_before_write(draft_key)
                 self.client.put(f"/rat/{self.record_id}", form_data)
                 self._save_sections_by_type(form_data)
+                self._discard_draft_after_save(draft_key)
             else:
-                # MODO CREACIÓN
-                subsecretaria_id = (
-                    form_data.get("subsecretaria")
-                    or self._first_combo_id("subsecretaria")
-                    or self._first_id_from_endpoint("/setup/subsecretarias")
-                )
-                tipo_tratamiento = (
-                    form_data.get("tipo_tratamiento")
-                    or self._first_combo_id("tipo_tratamiento")
-                    or self._first_id_from_endpoint("/catalogos/rat/tipo-tratamiento")
-                )
-                division_id = form_data.get("division") or self._first_combo_id("division")
-
-                if not division_id and subsecretaria_id:
+                self._resolve_deferred_defaults(payload_create, deferred)
+                subsecretaria_id = payload_create.get("subsecretaria_id")
+                if not payload_create.get("division_id") and subsecretaria_id:
                     try:
                         divisiones = self.client.get(
                             f"/setup/divisiones?subsecretaria_id={subsecretaria_id}"
                         )
                         if isinstance(divisiones, list) and divisiones:
-                            division_id = divisiones[0].get("id")
+                            payload_create["division_id"] = divisiones[0].get("id")
                     except Exception:
                         pass
 
-                if self._current_extension == "ia":
-                    tipo_rat = "IA"
-                elif self._current_extension == "institucional":
-                    tipo_rat = "PROCESO"
-                elif self._current_extension == "simplificado":
-                    tipo_rat = "SIMPLIFICADO"
-                else:
-                    tipo_rat = "IA"  # fallback seguro
-
-
-                payload_create = {
-                    "nombre_tratamiento": form_data.get("nombre_tratamiento") or "RAT sin nombre",
-                    "tipo_tratamiento": tipo_tratamiento,
-                    "subsecretaria_id": subsecretaria_id,
-                    "division_id": division_id,
-                    "departamento": form_data.get("departamento"),
-                    "responsable_tratamiento": form_data.get("nombre_responsable"),
-                    "cargo_responsable": form_data.get("cargo_responsable"),
-                    "email_responsable": form_data.get("email_responsable"),
-                    "telefono_responsable": form_data.get("telefono_responsable"),
-
-                    "encargado_tratamiento": form_data.get("nombre_encargado"),
-                    "cargo_encargado": form_data.get("cargo_encargado"),
-                    "email_encargado": form_data.get("email_encargado"),
-                    "telefono_encargado": form_data.get("telefono_encargado"),
-                    "estado": "EN_EDICION",
-                    "tipo_rat": tipo_rat,  # Tu backend probablemente exige esto
-                    "tipo_tratamiento_otro": "N/A"
-                    
-                }
-                
-                
-  
-                
                 # Imprimimos payload para debug si vuelve a fallar
                 print(f"Enviando POST /rat: {payload_create}")
 
                 res = self.client.post("/rat", payload_create)
+                # El diálogo está deshabilitado mientras corre el worker: nadie más lee record_id
                 self.record_id = res.get("rat_id")
                 
                 if self.record_id:
                     self._save_sections_by_type(form_data)
 
-            self._invalidate_rat_catalog_cache()
-            QApplication.restoreOverrideCursor()
-            QMessageBox.information(self, "Éxito", "Guardado correctamente.")
+        except Exception as e:
+            if not (self.record_id and OutboxService.is_offline_error(e)):
+                raise
+            return self._queue_offline_rat(form_data, draft_values)
+
+        self._invalidate_rat_catalog_cache()
+        return {"status": "saved", "created": created}
+
+    def _on_rat_submit_done(self, result):
+        self._set_submitting(False)
+        status = result.get("status")
+        self._stop_submit_profile(resultado=status)
+        if status == "offline":
+            self._notify_saved_offline()
             self.accept()
+            return
+        if status == "offline_failed":
+            QMessageBox.critical(self, "Error", f"No se pudo guardar localmente:\n{result.get('error')}")
+            return
 
-        except Exception as e:
-            QApplication.restoreOverrideCursor()
-            print(f"Error submit: {e}")
-            # Mostrar mensaje amigable si es error de validación
-            msg = str(e)
-            if "422" in msg: msg = "Faltan campos obligatorios o el formato es incorrecto."
-            QMessageBox.critical(self, "Error", f"No se pudo guardar:\n{msg}")
-
-    def _first_combo_id(self, key):
-        widget = self.inputs.get(key)
-        if isinstance(widget, QComboBox) and widget.count() > 0:
-            return widget.itemData(0)
-        return None
+        self._emit_saved(created=result.get("created", False))
+        QMessageBox.information(self, "Éxito", "Guardado correctamente.")
+        self.accept()
 
-    def _first_id_from_endpoint(self, endpoint):
+    def _on_rat_submit_error(self, error):
+        self._set_submitting(False)
+        self._stop_submit_profile(resultado="error")
+        LoggerService().log_error("Error guardando RAT", error)
+        # Mostrar mensaje amigable si es error de validación
+        msg = str(error)
+        if "422" in msg: msg = "Faltan campos obligatorios o el formato es incorrecto."
+        QMessageBox.critical(self, "Error", f"No se pudo guardar:\n{msg}")
+
+    def _queue_offline_rat(self, form_data, draft_values):
+        """Encola el PUT principal y las secciones; los adjuntos esperan al próximo guardado en línea."""
+        # Corre en el worker: el writer se pasa explícito, la UI sigue usando self.client
+        writer = self.outbox.writer("/rat", self.record_id, draft_values)
         try:
-            items = self.client.get(endpoint)
-            if isinstance(items, list) and items:
-                first = items[0]
-                if isinstance(first, dict):
-                    return first.get("id")
-        except Exception:
-            return None
-        return None
+            writer.put(f"/rat/{self.record_id}", form_data)
+            self._save_sections_by_type(form_data, client=writer)
+        except Exception as e:
+            LoggerService().log_error("Error encolando RAT offline", e)
+            return {"status": "offline_failed", "error": str(e)}
+        return {"status": "offline"}
 
     def _invalidate_rat_catalog_cache(self):
         self.catalogo_service.invalidate_cache_key(self.RAT_CATALOGO_CACHE_KEY)
@@ -606,7 +655,8 @@ class RatDialog(GenericFormDialog):
         return missing
 
     # --- Helpers Guardado ---
-    def _save_gobierno_datos(self, data):
+    def _save_gobierno_datos(self, data, client=None):
+        client = client or self.client
         payload = {
             "fecha_elaboracion": data.get("fecha_elaboracion"),
             "responsable_informe": data.get("responsable_informe"),
@@ -614,9 +664,10 @@ class RatDialog(GenericFormDialog):
             "equipo_validacion_contenidos": data.get("equipo_validacion"),
             "revision_aprobacion_final": data.get("revision_aprobacion")
         }
-        self.client.put(f"/rat/{self.record_id}/gobierno-datos", payload)
+        client.put(f"/rat/{self.record_id}/gobierno-datos", payload)
 
-    def _save_seccion_ia(self, data):
+    def _save_seccion_ia(self, data, client=None):
+        client = client or self.client
         base = f"/rat/{self.record_id}/ia"
         payload_finalidad = {
             "finalidad_principal_uso_ia": data.get("finalidad_principal_ia"),
@@ -624,14 +675,14 @@ class RatDialog(GenericFormDialog):
             "alcance_impacto": data.get("alcance_impacto_ia"),
             "efectos_juridicos_significativos": data.get("efectos_juridicos_ia"),
         }
-        self.client.put(f"{base}/finalidad", payload_finalidad)
+        client.put(f"{base}/finalidad", payload_finalidad)
 
         payload_flujo = {
             "descripcion_flujo_ia": data.get("descripcion_resumida_flujo_ia"),
             "puntos_intervencion_humana": data.get("puntos_intervencion_ia"),
             "sistemas_repositorios_involucrados": data.get("sistemas_repositorios_ia"),
         }
-        self.client.put(f"{base}/flujo", payload_flujo)
+        client.put(f"{base}/flujo", payload_flujo)
 
         datos_sensibles = self._to_bool_or_none(data.get("datos_sensibles_entrenamiento_ia"))
         payload_entrenamiento = {
@@ -643,14 +694,14 @@ class RatDialog(GenericFormDialog):
             "volumen_y_periodo": data.get("volumen_periodo_ia"),
             "poblaciones_especiales": data.get("poblaciones_vulnerables_entrenamiento_ia"),
         }
-        self.client.put(f"{base}/entrenamiento", payload_entrenamiento)
+        client.put(f"{base}/entrenamiento", payload_entrenamiento)
 
         payload_operacional = {
             "datos_entrada": data.get("datos_entrada_ia"),
             "datos_salida": data.get("datos_salida_ia"),
             "monitoreo_modelo": data.get("monitoreo_modelo_ia"),
         }
-        self.client.put(f"{base}/operacional", payload_operacional)
+        client.put(f"{base}/operacional", payload_operacional)
 
         payload_modelo = {
             "tipo_modelo": data.get("tipo_modelo_ia"),
@@ -659,7 +710,7 @@ class RatDialog(GenericFormDialog):
             "reentrenamiento": data.get("reentrenamiento_ia"),
             "controles_acceso": data.get("controles_acceso_ia"),
         }
-        self.client.put(f"{base}/modelo", payload_modelo)
+        client.put(f"{base}/modelo", payload_modelo)
 
         payload_explicabilidad = {
             "campo": "general",
@@ -668,9 +719,10 @@ class RatDialog(GenericFormDialog):
             "intervencion_humana": data.get("intervencion_humana_ia"),
             "documentacion_explicabilidad_path": data.get("documentacion_explicabilidad_ia"),
         }
-        self.client.put(f"{base}/explicabilidad", payload_explicabilidad)
+        client.put(f"{base}/explicabilidad", payload_explicabilidad)
 
-    def _save_seccion_simplificado(self, data):
+    def _save_seccion_simplificado(self, data, client=None):
+        client = client or self.client
         # 1. Guardamos la parte principal (Simplificado)
         payload_simp = {
         # =========================
@@ -718,11 +770,12 @@ class RatDialog(GenericFormDialog):
     
     }
         
-        self.client.put(f"/rat/{self.record_id}/simplificado", payload_simp)
+        client.put(f"/rat/{self.record_id}/simplificado", payload_simp)
         self._upsert_adjunto_seccion(
             seccion="simplificado_descripcion",
             path_archivo=data.get("archivos_adjuntos"),
             descripcion="Adjunto descripción tratamiento simplificado",
+            client=client,
         )
         
         # 2. Guardamos la sección de Titulares
@@ -764,12 +817,13 @@ class RatDialog(GenericFormDialog):
                     str(data.get("decisiones_automatizadas")).lower() in ["si", "true", "1"]
                 ),
             }
-            self.client.put(f"/rat/{self.record_id}/titulares", payload_titulares)
+            client.put(f"/rat/{self.record_id}/titulares", payload_titulares)
             
         except Exception as e:
             print(f"Error guardando titulares: {e}")
             
-    def _save_seccion_institucional(self, data):
+    def _save_seccion_institucional(self, data, client=None):
+        client = client or self.client
         flujos_val = data.get("descripcion_flujos")
         flujos_descripcion = None
         flujos_archivo = None
@@ -815,16 +869,18 @@ class RatDialog(GenericFormDialog):
             "documentos_respaldo": data.get("documentos_respaldo"),
         }
         # Llamada al endpoint específico de Institucional
-        self.client.put(f"/rat/{self.record_id}/proceso", payload)
+        client.put(f"/rat/{self.record_id}/proceso", payload)
         self._upsert_adjunto_seccion(
             seccion="institucional_descripcion",
             path_archivo=data.get("adjuntos_descripcion"),
             descripcion="Adjunto descripción tratamiento institucional",
+            client=client,
         )
         self._upsert_adjunto_seccion(
             seccion="institucional_flujos",
             path_archivo=flujos_archivo,
             descripcion="Adjunto flujos de información",
+            client=client,
         )
         
          # Categorías de datos personales (MULTI)
@@ -855,10 +911,11 @@ class RatDialog(GenericFormDialog):
                     str(data.get("decisiones_automatizadas")).lower() in ["si", "true", "1"]
                 ),
             }
-        self.client.put(f"/rat/{self.record_id}/titulares", payload_titulares)
+        client.put(f"/rat/{self.record_id}/titulares", payload_titulares)
             
 
-    def _save_riesgos(self, data):
+    def _save_riesgos(self, data, client=None):
+        client = client or self.client
         rows = data.get("riesgos_identificados") or []
         if not isinstance(rows, list):
             rows = []
@@ -877,18 +934,19 @@ class RatDialog(GenericFormDialog):
                 "descripcion_riesgo": descripcion,
             })
 
-        self.client.put(f"/rat/{self.record_id}/riesgos", {"riesgos": riesgos})
+        client.put(f"/rat/{self.record_id}/riesgos", {"riesgos": riesgos})
 
-    def _upsert_adjunto_seccion(self, seccion, path_archivo, descripcion=None):
+    def _upsert_adjunto_seccion(self, seccion, path_archivo, descripcion=None, client=None):
+        client = client or self.client
         if not self.record_id:
             return
 
-        existing = self.client.get(f"/rat/{self.record_id}/adjuntos") or []
+        existing = client.get(f"/rat/{self.record_id}/adjuntos") or []
         for adj in existing:
             if not isinstance(adj, dict):
                 continue
             if adj.get("seccion") == seccion and adj.get("adjunto_id"):
-                self.client.delete(f"/rat/adjuntos/{adj.get('adjunto_id')}")
+                client.delete(f"/rat/adjuntos/{adj.get('adjunto_id')}")
 
         if self._is_non_empty(path_archivo):
             payload = {
@@ -896,9 +954,10 @@ class RatDialog(GenericFormDialog):
                 "path_archivo": path_archivo,
                 "descripcion": descripcion,
             }
-            self.client.post(f"/rat/{self.record_id}/adjuntos", payload)
+            client.post(f"/rat/{self.record_id}/adjuntos", payload)
         
-    def _save_conclusion(self, data):
+    def _save_conclusion(self, data, client=None):
+        client = client or self.client
         corresponde_value = self._to_bool_or_none(data.get("corresponde_eipd"))
 
         payload = {
@@ -907,7 +966,7 @@ class RatDialog(GenericFormDialog):
             "justificacion": data.get("justificacion"),
         }
 
-        self.client.put(f"/rat/{self.record_id}/conclusion", payload)
+        client.put(f"/rat/{self.record_id}/conclusion", payload)
 
     def _get_all_form_values(self):
         """Recolector de datos BLINDADO contra 422."""
@@ -932,21 +991,24 @@ class RatDialog(GenericFormDialog):
                 vals[k] = f[0] if f else None
         return vals
     
-    def _save_sections_by_type(self, form_data):
+    def _save_sections_by_type(self, form_data, client=None):
+        # `client`: ApiClient o el OutboxWriter del guardado offline (nunca se cambia self.client)
+        client = client or self.client
+
         # Sección común
-        self._try_save_section("gobierno_datos", lambda: self._save_gobierno_datos(form_data))
+        self._try_save_section("gobierno_datos", lambda: self._save_gobierno_datos(form_data, client))
 
         # Sección específica según tipo
         if self._current_extension == "ia":
-            self._try_save_section("seccion_ia", lambda: self._save_seccion_ia(form_data))
+            self._try_save_section("seccion_ia", lambda: self._save_seccion_ia(form_data, client))
         elif self._current_extension == "institucional":
-            self._try_save_section("seccion_institucional", lambda: self._save_seccion_institucional(form_data))
+            self._try_save_section("seccion_institucional", lambda: self._save_seccion_institucional(form_data, client))
         elif self._current_extension == "simplificado":
-            self._try_save_section("seccion_simplificado", lambda: self._save_seccion_simplificado(form_data))
+            self._try_save_section("seccion_simplificado", lambda: self._save_seccion_simplificado(form_data, client))
 
         # Secciones finales comunes
-        self._try_save_section("riesgos", lambda: self._save_riesgos(form_data))
-        self._try_save_section("conclusion", lambda: self._save_conclusion(form_data))
+        self._try_save_section("riesgos", lambda: self._save_riesgos(form_data, client))
+        self._try_save_section("conclusion", lambda: self._save_conclusion(form_data, client))
 
     def _try_save_section(self, section_name, fn):
         try:
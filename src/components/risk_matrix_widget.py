@@ -1,9 +1,258 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
-    QHeaderView, QTextEdit, QComboBox, QMessageBox, QLabel
+    QWidget, QVBoxLayout, QTableView, QHeaderView, QComboBox, QPlainTextEdit,
+    QMessageBox, QStyledItemDelegate, QStyle, QStyleOptionComboBox, QApplication,
+    QAbstractItemView
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QColor, QBrush
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRectF
+from PySide6.QtGui import QFont, QColor, QPen
+
+
+COL_AMBITO = 0
+COL_DESCRIPCION = 1
+COL_NIVEL_DESARROLLO = 2
+COL_RIESGO_TRANSVERSAL = 3
+COL_PROBABILIDAD = 4
+COL_IMPACTO = 5
+COL_NIVEL_RIESGO = 6
+
+HEADERS = [
+    "Ámbito",
+    "Descripción",
+    "Nivel desarrollo",
+    "Riesgo transversal",
+    "Probabilidad",
+    "Impacto",
+    "Nivel de riesgo"
+]
+
+NIVEL_DESARROLLO_OPTIONS = ["Inicial", "Intermedio", "Avanzado"]
+ESCALA_OPTIONS = ["Despreciable", "Limitado", "Significativo", "Máximo"]
+NIVEL_RIESGO_OPTIONS = ["Bajo", "Medio", "Alto", "Muy Alto"]
+
+# Colores del badge de nivel de riesgo (fondo)
+RISK_COLORS = {
+    "Bajo": QColor("#22c55e"),    # Green
+    "Medio": QColor("#eab308"),   # Yellow
+    "Alto": QColor("#f97316"),    # Orange
+    "Muy Alto": QColor("#ef4444") # Red
+}
+
+# Campo de get_data/set_data por columna
+FIELDS = {
+    COL_NIVEL_DESARROLLO: "nivel_desarrollo",
+    COL_RIESGO_TRANSVERSAL: "riesgo_transversal",
+    COL_PROBABILIDAD: "probabilidad",
+    COL_IMPACTO: "impacto",
+    COL_NIVEL_RIESGO: "nivel_riesgo",
+}
+
+
+class RiskMatrixModel(QAbstractTableModel):
+    """Filas de la matriz como dicts; cada cambio emite dataChanged solo de esa celda."""
+
+    def __init__(self, read_only=False, parent=None):
+        super().__init__(parent)
+        self.read_only = read_only
+        self._rows = []
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self._ambito_color = QColor("#0f172a")
+        self._desc_color = QColor("#475569")
+        self._text_color = QColor("#1e293b")
+
+    def load_ambitos(self, ambitos, descriptions):
+        self.beginResetModel()
+        self._rows = []
+        for ambito in ambitos:
+            if self.read_only:
+                # Resumen de la Sección 1: se sincroniza desde los ámbitos
+                prob, imp, risk = "...", "...", "Pendiente"
+            else:
+                prob, imp, risk = ESCALA_OPTIONS[0], ESCALA_OPTIONS[0], NIVEL_RIESGO_OPTIONS[0]
+            self._rows.append({
+                "ambito": ambito,
+                "descripcion": descriptions.get(ambito, ""),
+                "nivel_desarrollo": NIVEL_DESARROLLO_OPTIONS[0],
+                "riesgo_transversal": "",
+                "probabilidad": prob,
+                "impacto": imp,
+                "nivel_riesgo": risk,
+            })
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return str(section + 1)
+
+    def row(self, row):
+        return self._rows[row]
+
+    def is_editable(self, column):
+        if column in (COL_NIVEL_DESARROLLO, COL_RIESGO_TRANSVERSAL):
+            return True
+        if column in (COL_PROBABILIDAD, COL_IMPACTO, COL_NIVEL_RIESGO):
+            return not self.read_only
+        return False
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self.is_editable(index.column()):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == COL_AMBITO:
+                return row["ambito"]
+            if column == COL_DESCRIPCION:
+                return row["descripcion"]
+            return row[FIELDS[column]]
+        if role == Qt.ToolTipRole and column == COL_DESCRIPCION:
+            return "Haga clic para ver descripción completa"
+        if role == Qt.FontRole and column == COL_AMBITO:
+            return self._bold
+        if role == Qt.ForegroundRole:
+            if column == COL_AMBITO:
+                return self._ambito_color
+            if column == COL_DESCRIPCION:
+                return self._desc_color
+            return self._text_color
+        if role == Qt.TextAlignmentRole:
+            if column in (COL_AMBITO, COL_DESCRIPCION, COL_RIESGO_TRANSVERSAL):
+                return int(Qt.AlignVCenter | Qt.AlignLeft)
+            return int(Qt.AlignCenter)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() not in FIELDS:
+            return False
+        return self.set_value(index.row(), index.column(), value)
+
+    def set_value(self, row, column, value):
+        field = FIELDS[column]
+        value = "" if value is None else str(value)
+        if self._rows[row][field] == value:
+            return False
+        self._rows[row][field] = value
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+
+class _ComboDelegate(QStyledItemDelegate):
+    """Pinta la celda como un combo y solo crea el QComboBox real al editar."""
+
+    def __init__(self, options, parent=None):
+        super().__init__(parent)
+        self.options = options
+
+    def paint(self, painter, option, index):
+        if not index.flags() & Qt.ItemIsEditable:
+            super().paint(painter, option, index)
+            return
+        combo_opt = QStyleOptionComboBox()
+        combo_opt.rect = option.rect.adjusted(4, 12, -4, -12)
+        combo_opt.state = option.state | QStyle.State_Enabled
+        combo_opt.currentText = index.data(Qt.DisplayRole) or ""
+        combo_opt.frame = True
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawComplexControl(QStyle.CC_ComboBox, combo_opt, painter, option.widget)
+        style.drawControl(QStyle.CE_ComboBoxLabel, combo_opt, painter, option.widget)
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(self.options)
+        # Se confirma apenas se elige, sin esperar a que pierda el foco
+        editor.activated.connect(lambda *_: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        current = index.data(Qt.EditRole)
+        editor.setCurrentIndex(editor.findText(current) if current else -1)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect.adjusted(4, 12, -4, -12))
+
+
+class _RiskLevelDelegate(_ComboDelegate):
+    """Badge de color para el nivel de riesgo (editable como combo si corresponde)."""
+
+    def __init__(self, parent=None):
+        super().__init__(NIVEL_RIESGO_OPTIONS, parent)
+        self._empty_border = QColor("#e2e8f0")
+        self._empty_text = QColor("#64748b")
+        self._font = QFont()
+        self._font.setBold(True)
+        self._font.setPixelSize(11)
+
+    def paint(self, painter, option, index):
+        level = index.data(Qt.DisplayRole) or ""
+        color = RISK_COLORS.get(level)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        rect = QRectF(option.rect.adjusted(8, 14, -8, -14))
+        if color is not None:
+            painter.setPen(QPen(color))
+            painter.setBrush(color)
+        else:
+            painter.setPen(QPen(self._empty_border))
+            painter.setBrush(Qt.white)
+        painter.drawRoundedRect(rect, 4, 4)
+
+        painter.setFont(self._font)
+        painter.setPen(Qt.white if color is not None else self._empty_text)
+        painter.drawText(rect, Qt.AlignCenter, level)
+        painter.restore()
+
+
+class _TextDelegate(QStyledItemDelegate):
+    """Texto multilínea: se dibuja como texto y se edita con un QPlainTextEdit temporal."""
+
+    def __init__(self, placeholder, parent=None):
+        super().__init__(parent)
+        self.placeholder = placeholder
+        self._placeholder_color = QColor("#94a3b8")
+
+    def paint(self, painter, option, index):
+        if index.data(Qt.DisplayRole):
+            super().paint(painter, option, index)
+            return
+        super().paint(painter, option, index)
+        painter.save()
+        painter.setPen(self._placeholder_color)
+        painter.drawText(option.rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignLeft, self.placeholder)
+        painter.restore()
+
+    def createEditor(self, parent, option, index):
+        editor = QPlainTextEdit(parent)
+        editor.setPlaceholderText(self.placeholder)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setPlainText(index.data(Qt.EditRole) or "")
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.toPlainText(), Qt.EditRole)
 
 
 class RiskMatrixWidget(QWidget):
@@ -13,29 +262,36 @@ class RiskMatrixWidget(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
-        self.table = QTableWidget(9, 7, self)
-        self.table.setHorizontalHeaderLabels([
-            "Ámbito",
-            "Descripción",
-            "Nivel desarrollo",
-            "Riesgo transversal",
-            "Probabilidad",
-            "Impacto",
-            "Nivel de riesgo"
-        ])
+        self.model = RiskMatrixModel(read_only=read_only, parent=self)
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
 
         self.table.verticalHeader().setVisible(True)
         self.table.horizontalHeader().setStretchLastSection(True)
-        
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        # Un clic abre el editor de la celda (combo o texto) solo mientras se usa
+        self.table.setEditTriggers(
+            QAbstractItemView.CurrentChanged | QAbstractItemView.SelectedClicked
+            | QAbstractItemView.DoubleClicked
+        )
+
+        # Delegates: una instancia por tipo de columna, nada por celda
+        escala = _ComboDelegate(ESCALA_OPTIONS, self.table)
+        self.table.setItemDelegateForColumn(COL_NIVEL_DESARROLLO, _ComboDelegate(NIVEL_DESARROLLO_OPTIONS, self.table))
+        self.table.setItemDelegateForColumn(COL_RIESGO_TRANSVERSAL, _TextDelegate("Describa riesgos...", self.table))
+        self.table.setItemDelegateForColumn(COL_PROBABILIDAD, escala)
+        self.table.setItemDelegateForColumn(COL_IMPACTO, escala)
+        self.table.setItemDelegateForColumn(COL_NIVEL_RIESGO, _RiskLevelDelegate(self.table))
+
         # Connect click for description preview
-        self.table.itemClicked.connect(self._on_item_clicked)
+        self.table.clicked.connect(self._on_item_clicked)
 
         layout.addWidget(self.table)
 
-    def _on_item_clicked(self, item):
+    def _on_item_clicked(self, index):
         """Show full description in a dialog if the description column is clicked."""
-        if item.column() == 1: # Descripción column
-            text = item.text()
+        if index.column() == COL_DESCRIPCION: # Descripción column
+            text = index.data(Qt.DisplayRole)
             if text:
                 msg = QMessageBox(self)
                 msg.setWindowTitle("Descripción del Ámbito")
@@ -64,12 +320,12 @@ class RiskMatrixWidget(QWidget):
     # Precargar los 9 ámbitos (desde EIPD)
     # --------------------------------------------------
     def preload_ambitos(self, ambitos: list[str], descriptions: dict = None):
-        self.table.setRowCount(len(ambitos))
         descriptions = descriptions or {}
-        
-        # UI Tweak: Stylesheet for Table
+        self.model.load_ambitos(ambitos, descriptions)
+
+        # UI Tweak: Stylesheet for Table (una sola vez)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 color: #1e293b;
                 gridline-color: #e2e8f0;
@@ -97,205 +353,45 @@ class RiskMatrixWidget(QWidget):
         # Dimensions
         row_height = 60 # Reduced back to standard height
         header_height = self.table.horizontalHeader().height() if self.table.horizontalHeader().height() > 0 else 40
-        total_height = (row_height * len(ambitos)) + header_height + 40 
+        total_height = (row_height * len(ambitos)) + header_height + 40
         self.table.setMinimumHeight(total_height)
-        
-        self.table.verticalHeader().setDefaultSectionSize(row_height) 
+
+        self.table.verticalHeader().setDefaultSectionSize(row_height)
         self.table.setWordWrap(False) # Disable word wrap for cleaner look, use elide
-        
+
         # Column Widths
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, header.ResizeMode.ResizeToContents) 
-        header.setSectionResizeMode(1, header.ResizeMode.Stretch) # Description takes space
-        header.setSectionResizeMode(3, header.ResizeMode.Stretch) # Risk takes space
-        
-        # Fixed widths
-        self.table.setColumnWidth(2, 140) # Nivel desarrollo
-        self.table.setColumnWidth(4, 130) # Prob
-        self.table.setColumnWidth(5, 130) # Impacto
-        self.table.setColumnWidth(6, 140) # Nivel Riesgo
-
-        for row, ambito in enumerate(ambitos):
-            # 0: Ámbito (Static Title)
-            item_ambito = QTableWidgetItem(ambito)
-            item_ambito.setFlags(item_ambito.flags() & ~Qt.ItemIsEditable)
-            item_ambito.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft) 
-            item_ambito.setFont(self._bold_font())
-            item_ambito.setForeground(QColor("#0f172a")) # Darker
-            self.table.setItem(row, 0, item_ambito)
-
-            # 1: Descripción (Static text from eipd.json)
-            desc_text = descriptions.get(ambito, "")
-            item_desc = QTableWidgetItem(desc_text)
-            item_desc.setFlags(item_desc.flags() & ~Qt.ItemIsEditable)
-            item_desc.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-            item_desc.setForeground(QColor("#475569")) # Slate 600
-            item_desc.setToolTip("Haga clic para ver descripción completa")
-            self.table.setItem(row, 1, item_desc)
-
-            # 2: Nivel desarrollo - ALWAYS INTERACTIVE (Not in Section 1)
-            nivel_combo = QComboBox()
-            nivel_combo.addItems(["Inicial", "Intermedio", "Avanzado"])
-            nivel_combo.setStyleSheet(self._combo_style())
-            self.table.setCellWidget(row, 2, nivel_combo)
-
-            # 3: Riesgo transversal - ALWAYS INTERACTIVE (Not in Section 1)
-            riesgo_edit = QTextEdit()
-            riesgo_edit.setPlaceholderText("Describa riesgos...")
-            riesgo_edit.setStyleSheet(self._input_custom_style())
-            self.table.setCellWidget(row, 3, riesgo_edit)
-
-            # 4: Probabilidad - SYNCED (Read-only if read_only=True)
-            if self.read_only:
-                item = QTableWidgetItem("...")
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setForeground(QColor("#1e293b"))
-                self.table.setItem(row, 4, item)
-            else:
-                prob_combo = QComboBox()
-                prob_combo.addItems(["Despreciable", "Limitado", "Significativo", "Máximo"])
-                prob_combo.setStyleSheet(self._combo_style())
-                self.table.setCellWidget(row, 4, prob_combo)
+        header.setSectionResizeMode(COL_AMBITO, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COL_DESCRIPCION, QHeaderView.Stretch) # Description takes space
+        header.setSectionResizeMode(COL_RIESGO_TRANSVERSAL, QHeaderView.Stretch) # Risk takes space
 
-            # 5: Impacto - SYNCED
-            if self.read_only:
-                item = QTableWidgetItem("...")
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                item.setTextAlignment(Qt.AlignCenter)
-                item.setForeground(QColor("#1e293b"))
-                self.table.setItem(row, 5, item)
-            else:
-                impact_combo = QComboBox()
-                impact_combo.addItems(["Despreciable", "Limitado", "Significativo", "Máximo"])
-                impact_combo.setStyleSheet(self._combo_style())
-                self.table.setCellWidget(row, 5, impact_combo)
-
-            # 6: Nivel de riesgo - SYNCED
-            if self.read_only:
-                self._apply_risk_color(row, "Pendiente")
-            else:
-                riesgo_combo = QComboBox()
-                riesgo_combo.addItems(["Bajo", "Medio", "Alto", "Muy Alto"])
-                riesgo_combo.setStyleSheet(self._combo_style())
-                self.table.setCellWidget(row, 6, riesgo_combo)
-        
+        # Fixed widths
+        self.table.setColumnWidth(COL_NIVEL_DESARROLLO, 140) # Nivel desarrollo
+        self.table.setColumnWidth(COL_PROBABILIDAD, 130) # Prob
+        self.table.setColumnWidth(COL_IMPACTO, 130) # Impacto
+        self.table.setColumnWidth(COL_NIVEL_RIESGO, 140) # Nivel Riesgo
 
     def update_row(self, row_index, data):
         """Update a row with fresh data from Section 1."""
-        if row_index < 0 or row_index >= self.table.rowCount():
+        if row_index < 0 or row_index >= self.model.rowCount():
             return
 
         if self.read_only:
-            # Update items directly (textual summary)
-            # Probabilidad
-            val_prob = data.get("probabilidad") or "..."
-            item_prob = QTableWidgetItem(str(val_prob))
-            item_prob.setTextAlignment(Qt.AlignCenter)
-            item_prob.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            item_prob.setForeground(QColor("#1e293b"))
-            self.table.setItem(row_index, 4, item_prob)
-
-            # Impacto
-            val_imp = data.get("impacto") or "..."
-            item_imp = QTableWidgetItem(str(val_imp))
-            item_imp.setTextAlignment(Qt.AlignCenter)
-            item_imp.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            item_imp.setForeground(QColor("#1e293b"))
-            self.table.setItem(row_index, 5, item_imp)
-
-            # Nivel Riesgo - Use the Label Widget via _apply_risk_color
-            val_risk = data.get("nivel_riesgo") or "Pendiente"
-            self._apply_risk_color(row_index, val_risk)
-            
+            # Resumen textual; el badge se repinta solo si cambió el nivel
+            self.model.set_value(row_index, COL_PROBABILIDAD, data.get("probabilidad") or "...")
+            self.model.set_value(row_index, COL_IMPACTO, data.get("impacto") or "...")
+            self.model.set_value(row_index, COL_NIVEL_RIESGO, data.get("nivel_riesgo") or "Pendiente")
         else:
-            # Update widgets (standard editable mode)
-            # (Leaving original logic here for completeness)
-            widget_prob = self.table.cellWidget(row_index, 4)
-            if isinstance(widget_prob, QComboBox):
-                self._set_combo_text(widget_prob, data.get("probabilidad"))
-
-            widget_imp = self.table.cellWidget(row_index, 5)
-            if isinstance(widget_imp, QComboBox):
-                self._set_combo_text(widget_imp, data.get("impacto"))
-
-            widget_risk = self.table.cellWidget(row_index, 6)
-            if isinstance(widget_risk, QComboBox):
-                self._set_combo_text(widget_risk, data.get("nivel_riesgo"))
-
-    def _apply_risk_color(self, row, level):
-        """Creates a styled QLabel for the risk level cell to ensure visibility on macOS."""
-        colors = {
-            "Bajo": "#22c55e", # Green
-            "Medio": "#eab308", # Yellow
-            "Alto": "#f97316", # Orange
-            "Muy Alto": "#ef4444" # Red
-        }
-        
-        bg_color = colors.get(level, "#ffffff")
-        text_color = "white" if level in colors else "#64748b"
-        border_color = bg_color if level in colors else "#e2e8f0"
-        
-        container = QWidget()
-        layout = QVBoxLayout(container)
-        layout.setContentsMargins(4, 4, 4, 4)
-        
-        lbl = QLabel(str(level))
-        lbl.setAlignment(Qt.AlignCenter)
-        lbl.setStyleSheet(f"""
-            QLabel {{
-                background-color: {bg_color};
-                color: {text_color};
-                border: 1px solid {border_color};
-                border-radius: 4px;
-                font-weight: bold;
-                font-size: 11px;
-                padding: 2px;
-            }}
-        """)
-        layout.addWidget(lbl)
-        self.table.setCellWidget(row, 6, container)
+            self._set_option(row_index, COL_PROBABILIDAD, ESCALA_OPTIONS, data.get("probabilidad"))
+            self._set_option(row_index, COL_IMPACTO, ESCALA_OPTIONS, data.get("impacto"))
+            self._set_option(row_index, COL_NIVEL_RIESGO, NIVEL_RIESGO_OPTIONS, data.get("nivel_riesgo"))
 
-    def _bold_font(self):
-        f = QFont()
-        f.setBold(True)
-        return f
-
-    def _read_only_style(self):
-        return """
-            QTextEdit {
-                border: 0px;
-                background-color: transparent;
-                color: #475569;
-            }
-        """
-
-    def _input_custom_style(self):
-        return """
-            QTextEdit {
-                border: 1px solid #e2e8f0;
-                border-radius: 4px;
-                padding: 4px;
-                background-color: #ffffff;
-                font-size: 12px;
-            }
-            QTextEdit:focus {
-                border: 1px solid #3b82f6;
-            }
-        """
-
-    def _combo_style(self):
-        return """
-            QComboBox {
-                border: 1px solid #e2e8f0;
-                border-radius: 4px;
-                padding: 2px 4px;
-                background-color: #ffffff;
-            }
-            QComboBox::drop-down {
-                border: 0px;
-            }
-        """
+    def _set_option(self, row, column, options, text):
+        # Mismo criterio que un combo: vacío limpia, un valor desconocido se ignora
+        if not text:
+            self.model.set_value(row, column, "")
+        elif str(text) in options:
+            self.model.set_value(row, column, str(text))
 
     # --------------------------------------------------
     # Obtener data (para POST más adelante)
@@ -303,15 +399,17 @@ class RiskMatrixWidget(QWidget):
     def get_data(self):
         data = []
 
-        for row in range(self.table.rowCount()):
+        for row in range(self.model.rowCount()):
+            values = self.model.row(row)
             row_data = {
-                "ambito": self.table.item(row, 0).text() if self.table.item(row, 0) else None,
-                "descripcion": self._get_text(row, 1),
-                "nivel_desarrollo": self._get_combo(row, 2),
-                "riesgo_transversal": self._get_text(row, 3),
-                "probabilidad": self._get_combo(row, 4),
-                "impacto": self._get_combo(row, 5),
-                "nivel_riesgo": self._get_combo(row, 6), # Now a combo
+                "ambito": values["ambito"],
+                "descripcion": None,
+                "nivel_desarrollo": values["nivel_desarrollo"],
+                "riesgo_transversal": values["riesgo_transversal"],
+                # En modo resumen estas columnas no son editables y no se envían
+                "probabilidad": None if self.read_only else values["probabilidad"],
+                "impacto": None if self.read_only else values["impacto"],
+                "nivel_riesgo": None if self.read_only else values["nivel_riesgo"],
             }
             data.append(row_data)
 
@@ -324,71 +422,15 @@ class RiskMatrixWidget(QWidget):
         # Map by ambito name for easy lookup
         data_map = {item.get("ambito"): item for item in data if item.get("ambito")}
 
-        for row in range(self.table.rowCount()):
-            item_ambito = self.table.item(row, 0)
-            if not item_ambito:
+        for row in range(self.model.rowCount()):
+            row_data = data_map.get(self.model.row(row)["ambito"])
+            if not row_data:
                 continue
-            
-            # Reset combos to -1 first? Or just let them be default (0) if not found?
-            # Default is 0 (first item). Let's keep it safe.
-
-            ambito_name = item_ambito.text()
-            if ambito_name in data_map:
-                row_data = data_map[ambito_name]
-                
-                # Descripcion
-                widget_desc = self.table.cellWidget(row, 1)
-                if isinstance(widget_desc, QTextEdit):
-                    widget_desc.setText(row_data.get("descripcion", ""))
-
-                # Nivel desarrollo
-                widget_nivel = self.table.cellWidget(row, 2)
-                if isinstance(widget_nivel, QComboBox):
-                    self._set_combo_text(widget_nivel, row_data.get("nivel_desarrollo"))
-
-                # Riesgo transversal
-                widget_riesgo = self.table.cellWidget(row, 3)
-                if isinstance(widget_riesgo, QTextEdit):
-                    widget_riesgo.setText(row_data.get("riesgo_transversal", ""))
-
-                # Probabilidad
-                widget_prob = self.table.cellWidget(row, 4)
-                if isinstance(widget_prob, QComboBox):
-                    self._set_combo_text(widget_prob, row_data.get("probabilidad"))
-
-                # Impacto
-                widget_imp = self.table.cellWidget(row, 5)
-                if isinstance(widget_imp, QComboBox):
-                    self._set_combo_text(widget_imp, row_data.get("impacto"))
-                    
-                # Nivel Riesgo
-                widget_risk = self.table.cellWidget(row, 6)
-                if isinstance(widget_risk, QComboBox):
-                   self._set_combo_text(widget_risk, row_data.get("nivel_riesgo"))
-
-    def _set_combo_text(self, combo, text):
-        if not text:
-            combo.setCurrentIndex(-1)
-            return
-        index = combo.findText(str(text))
-        if index != -1:
-            combo.setCurrentIndex(index)
-        else:
-            # Try setting as currentText if editable (default combos usually aren't but good fallback)
-            # Or just ignore if not found
-            pass
 
-    # --------------------------------------------------
-    # Helpers
-    # --------------------------------------------------
-    def _get_text(self, row, col):
-        widget = self.table.cellWidget(row, col)
-        if isinstance(widget, QTextEdit):
-            return widget.toPlainText()
-        return None
+            self._set_option(row, COL_NIVEL_DESARROLLO, NIVEL_DESARROLLO_OPTIONS, row_data.get("nivel_desarrollo"))
+            self.model.set_value(row, COL_RIESGO_TRANSVERSAL, row_data.get("riesgo_transversal") or "")
 
-    def _get_combo(self, row, col):
-        widget = self.table.cellWidget(row, col)
-        if isinstance(widget, QComboBox):
-            return widget.currentText()
-        return None
+            if not self.read_only:
+                self._set_option(row, COL_PROBABILIDAD, ESCALA_OPTIONS, row_data.get("probabilidad"))
+                self._set_option(row, COL_IMPACTO, ESCALA_OPTIONS, row_data.get("impacto"))
+                self._set_option(row, COL_NIVEL_RIESGO, NIVEL_RIESGO_OPTIONS, row_data.get("nivel_riesgo"))
@@ -4,3 +4,60 @@ from dotenv import load_dotenv
 load_dotenv()
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+
+# ===============================
+# Resiliencia HTTP (reintentos / circuit breaker)
+# ===============================
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "30"))
+API_RETRY_MAX = int(os.getenv("API_RETRY_MAX", "3"))
+API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.5"))
+API_RETRY_BACKOFF_MAX = float(os.getenv("API_RETRY_BACKOFF_MAX", "8"))
+API_BREAKER_THRESHOLD = int(os.getenv("API_BREAKER_THRESHOLD", "5"))
+API_BREAKER_COOLDOWN = float(os.getenv("API_BREAKER_COOLDOWN", "30"))
+
+# ===============================
+# Cola offline de escrituras
+# ===============================
+OUTBOX_REPLAY_INTERVAL_MS = int(os.getenv("OUTBOX_REPLAY_INTERVAL_MS", "30000"))
+
+# ===============================
+# Logs (Log/): buffer y rotación
+# ===============================
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "1.0"))
+LOG_FLUSH_BYTES = int(os.getenv("LOG_FLUSH_BYTES", str(64 * 1024)))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "500"))
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_HOURS = float(os.getenv("LOG_ROTATE_HOURS", "24"))
+
+# ===============================
+# Métricas de ApiClient
+# ===============================
+METRICS_EXPORT_INTERVAL = float(os.getenv("METRICS_EXPORT_INTERVAL", "300"))
+
+# ===============================
+# Vistas de MainWindow
+# ===============================
+# Construir en segundo plano las vistas aún no visitadas cuando la app queda ociosa
+PRELOAD_VIEWS_ON_IDLE = os.getenv("PRELOAD_VIEWS_ON_IDLE", "0").lower() in ("1", "true", "yes")
+PRELOAD_VIEWS_DELAY_MS = int(os.getenv("PRELOAD_VIEWS_DELAY_MS", "3000"))
+
+# ===============================
+# Trazabilidad: consulta masiva de RUNs
+# ===============================
+TRAZABILIDAD_BATCH_CONCURRENCY = int(os.getenv("TRAZABILIDAD_BATCH_CONCURRENCY", "4"))
+# Solicitudes por segundo hacia /trazabilidad/consulta (0 = sin límite)
+TRAZABILIDAD_BATCH_RATE = float(os.getenv("TRAZABILIDAD_BATCH_RATE", "5"))
+# Segundos que se reutiliza el resultado de un RUN antes de volver a consultarlo (0 = sin caché)
+TRAZABILIDAD_CACHE_TTL = float(os.getenv("TRAZABILIDAD_CACHE_TTL", "120"))
+
+# ===============================
+# Diagnóstico de rendimiento (opt-in)
+# ===============================
+# "cprofile", "tracemalloc" o ambos separados por coma; vacío = desactivado
+SINGDAP_PROFILE = {m.strip().lower() for m in os.getenv("SINGDAP_PROFILE", "").split(",") if m.strip()}
+# Prefijos de scope a perfilar (p.ej. "dialog.open,grid.reload"); vacío = todos
+SINGDAP_PROFILE_SCOPES = tuple(s.strip() for s in os.getenv("SINGDAP_PROFILE_SCOPES", "").split(",") if s.strip())
+# Bloqueos del hilo de UI más largos que esto (ms) se registran con su stack; 0 = apagado
+STALL_WATCHDOG_MS = int(os.getenv("STALL_WATCHDOG_MS", "0"))
+STALL_WATCHDOG_HEARTBEAT_MS = int(os.getenv("STALL_WATCHDOG_HEARTBEAT_MS", "100"))
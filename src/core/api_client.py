@@ -1,7 +1,22 @@
 import base64
 import json
+import time
+from urllib.parse import urlsplit
+
 import requests
-from src.config.settings import API_BASE_URL
+from urllib3.util.request import ACCEPT_ENCODING
+from src.config.settings import (
+    API_BASE_URL,
+    API_TIMEOUT,
+    API_RETRY_MAX,
+    API_RETRY_BACKOFF,
+    API_RETRY_BACKOFF_MAX,
+    API_BREAKER_THRESHOLD,
+    API_BREAKER_COOLDOWN,
+)
+from src.core.resilience import RetryPolicy, CircuitBreaker
+from src.core import json_codec
+from src.services.metrics_service import MetricsService
 
 
 class ApiClient:
@@ -20,6 +35,18 @@ class ApiClient:
         self.base_url = API_BASE_URL.rstrip('/')
         self.token = None
         self.user_id = None   
+        self.timeout = API_TIMEOUT
+
+        # Solo los métodos idempotentes se reintentan; POST/PATCH fallan a la primera
+        self.retry_policies = {
+            "GET": RetryPolicy(API_RETRY_MAX, API_RETRY_BACKOFF, API_RETRY_BACKOFF_MAX),
+            "PUT": RetryPolicy(min(API_RETRY_MAX, 2), API_RETRY_BACKOFF, API_RETRY_BACKOFF_MAX),
+            "DELETE": RetryPolicy(min(API_RETRY_MAX, 2), API_RETRY_BACKOFF, API_RETRY_BACKOFF_MAX),
+            "POST": RetryPolicy(0),
+            "PATCH": RetryPolicy(0),
+        }
+        self.breaker = CircuitBreaker(API_BREAKER_THRESHOLD, API_BREAKER_COOLDOWN)
+        self.metrics = MetricsService()
         self._initialized = True
 
     def set_token(self, token: str):
@@ -61,6 +88,8 @@ class ApiClient:
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
+            # gzip/deflate siempre; br (y zstd) si urllib3 tiene el decoder instalado
+            "Accept-Encoding": ACCEPT_ENCODING,
         }
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
@@ -70,51 +99,139 @@ class ApiClient:
         # 👉 Evita // y permite query params sin problemas
         return f"{self.base_url}/{path.lstrip('/')}"
 
+    def is_host_available(self) -> bool:
+        """False mientras el circuito del backend está abierto."""
+        return not self.breaker.is_open(urlsplit(self.base_url).netloc)
+
+    # ===============================
+    # Núcleo: reintentos + circuit breaker
+    # ===============================
+    def _request(self, method: str, url: str, headers=None, **kwargs):
+        host = urlsplit(url).netloc
+        policy = self.retry_policies.get(method, RetryPolicy(0))
+        if headers and headers.get("Idempotency-Key"):
+            # Con Idempotency-Key el backend deduplica: POST/PATCH pasan a ser reintentables
+            policy = self.retry_policies["GET"]
+        kwargs["headers"] = {**self._headers(), **(headers or {})}
+        kwargs.setdefault("timeout", self.timeout)
+
+        attempt = 0
+        started = time.perf_counter()
+        response = None
+        failed = True
+        try:
+            while True:
+                # Falla rápido si el host está caído (CircuitOpenError)
+                self.breaker.before_request(host)
+                try:
+                    response = requests.request(method, url, **kwargs)
+                except requests.exceptions.RequestException as exc:
+                    # Todo intento debe registrar un resultado: si no, una prueba
+                    # half-open deja el circuito tomado ("probing") para siempre
+                    self.breaker.record_failure(host)
+                    if not policy.should_retry_exception(exc) or attempt >= policy.max_retries:
+                        raise
+                except BaseException:
+                    self.breaker.release_probe(host)
+                    raise
+                else:
+                    if not policy.should_retry_status(response.status_code):
+                        # 4xx y 2xx confirman que el host responde; 5xx no reintentable es fallo
+                        if response.status_code < 500:
+                            self.breaker.record_success(host)
+                        else:
+                            self.breaker.record_failure(host)
+                        response.raise_for_status()
+                        failed = False
+                        return response
+
+                    self.breaker.record_failure(host)
+                    if attempt >= policy.max_retries:
+                        response.raise_for_status()
+                        failed = False
+                        return response
+                    response.close()
+                    response = None
+
+                time.sleep(policy.delay(attempt))
+                attempt += 1
+        finally:
+            self._record_metrics(method, url, response, started, attempt, failed)
+
+    def _record_metrics(self, method, url, response, started, retries, failed):
+        # requests no expone DNS/connect por separado: elapsed = envío hasta headers (incluye conexión)
+        try:
+            total_ms = (time.perf_counter() - started) * 1000
+            if response is not None:
+                status = response.status_code
+                ttfb_ms = response.elapsed.total_seconds() * 1000
+                if getattr(response, "_content_consumed", False):
+                    size = len(response.content or b"")
+                else:
+                    # stream=True: el cuerpo aún no se lee, se usa lo anunciado
+                    size = int(response.headers.get("Content-Length") or 0)
+            else:
+                status, ttfb_ms, size = 0, None, 0
+            self.metrics.record(method, url, status, total_ms, ttfb_ms, size, retries, failed)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _decode(response):
+        # response.content ya viene descomprimido (gzip/br) por urllib3
+        return json_codec.loads(response.content)
+
     # ===============================
     # GET
     # ===============================
     def get(self, path: str):
         url = self._build_url(path)
-        response = requests.get(url, headers=self._headers())
-        response.raise_for_status()
-        return response.json()
+        response = self._request("GET", url)
+        return self._decode(response)
+
+    def get_raw(self, path: str) -> bytes:
+        """Cuerpo sin parsear (ya descomprimido), para consumidores que decodifican por su cuenta."""
+        url = self._build_url(path)
+        response = self._request("GET", url)
+        return response.content
+
+    def stream(self, path: str, chunk_size: int = 64 * 1024):
+        """Itera el cuerpo en bloques de bytes sin cargarlo entero en memoria."""
+        url = self._build_url(path)
+        response = self._request("GET", url, stream=True)
+        with response:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
 
     # ===============================
     # POST
     # ===============================
-    def post(self, path: str, data: dict):
+    def post(self, path: str, data: dict, headers=None):
         url = f"{self.base_url}{path}"
-        response = requests.post(
-            url,
-            json=data,
-            headers=self._headers()
-        )
-        response.raise_for_status()
-        return response.json()
+        response = self._request("POST", url, headers=headers, data=json_codec.dumps(data))
+        return self._decode(response)
 
     # ===============================
     # DELETE
     # ===============================
     
     def delete(self, endpoint):
-        r = requests.delete(self.base_url + endpoint, headers=self._headers())
-        r.raise_for_status()
-        return r.json() if r.content else None
+        r = self._request("DELETE", self.base_url + endpoint)
+        return self._decode(r) if r.content else None
     
     # ===============================
     # PUT 
     # ===============================
-    def put(self, endpoint: str, payload: dict):
+    def put(self, endpoint: str, payload: dict, headers=None):
         url = f"{self.base_url}{endpoint}"
-        response = requests.put(url, json=payload, headers=self._headers())
-        response.raise_for_status()
-        return response.json()
+        response = self._request("PUT", url, headers=headers, data=json_codec.dumps(payload))
+        return self._decode(response)
 
     # ===============================
     # PATCH
     # ===============================
-    def patch(self, endpoint: str, payload: dict):
+    def patch(self, endpoint: str, payload: dict, headers=None):
         url = f"{self.base_url}{endpoint}"
-        response = requests.patch(url, json=payload, headers=self._headers())
-        response.raise_for_status()
-        return response.json()
+        response = self._request("PATCH", url, headers=headers, data=json_codec.dumps(payload))
+        return self._decode(response)
@@ -0,0 +1,33 @@
+import json
+
+# Decoder rápido opcional: si orjson está instalado se usa, si no la stdlib.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def loads(data):
+    """Decodifica bytes/str JSON con el backend más rápido disponible."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson es estricto (NaN, surrogates...): la stdlib es más permisiva
+            pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serializa a bytes UTF-8 (formato listo para el cuerpo HTTP)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Tipos no soportados por orjson (p.ej. claves no-str): stdlib
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,274 @@
+"""
+Diagnóstico de rendimiento opt-in (apagado por defecto, costo ~0 cuando no se usa).
+
+- profile_scope / start_profile: cProfile y/o tracemalloc alrededor de
+  tramos calientes (abrir diálogos, recargar grillas, guardar). Se activa con
+  SINGDAP_PROFILE=cprofile,tracemalloc y deja un reporte por scope en Log/profile/.
+- StallWatchdog: un latido en el hilo de UI y un hilo monitor que, si el latido
+  se atrasa más de STALL_WATCHDOG_MS, captura el stack Python del hilo principal
+  y lo escribe en Log/stalls_*.log.
+"""
+
+import io
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+
+from PySide6.QtCore import QObject, QTimer, QCoreApplication
+
+from src.config.settings import (
+    SINGDAP_PROFILE,
+    SINGDAP_PROFILE_SCOPES,
+    STALL_WATCHDOG_MS,
+    STALL_WATCHDOG_HEARTBEAT_MS,
+)
+from src.services.logger_service import LoggerService
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Log")
+PROFILE_DIR = os.path.join(LOG_DIR, "profile")
+
+PROFILE_TOP_FUNCTIONS = 40
+PROFILE_TOP_ALLOCATIONS = 25
+
+# Un solo scope activo a la vez: cProfile no admite perfiles anidados en el mismo hilo
+_active = threading.local()
+
+
+def profiling_enabled(name=None):
+    if not SINGDAP_PROFILE:
+        return False
+    if name and SINGDAP_PROFILE_SCOPES:
+        return name.startswith(SINGDAP_PROFILE_SCOPES)
+    return True
+
+
+class ProfileSession:
+    """Un tramo perfilado; puede abarcar varias vueltas del event loop (start/stop en el hilo de UI)."""
+
+    def __init__(self, name):
+        # cProfile/pstats/tracemalloc se importan solo con el perfilado encendido
+        import cProfile
+
+        self.name = name
+        self.profiler = cProfile.Profile() if "cprofile" in SINGDAP_PROFILE else None
+        self.trace_memory = "tracemalloc" in SINGDAP_PROFILE
+        self._owns_tracemalloc = False
+        self._snapshot = None
+        self._started = None
+        self._stopped = False
+
+    def start(self):
+        import tracemalloc
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._snapshot = tracemalloc.take_snapshot()
+        self._started = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        _active.session = self
+        return self
+
+    def stop(self, **extra):
+        import pstats
+        import tracemalloc
+
+        if self._stopped:
+            return
+        self._stopped = True
+        if self.profiler is not None:
+            self.profiler.disable()
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        if getattr(_active, "session", None) is self:
+            _active.session = None
+
+        stats = pstats.Stats(self.profiler) if self.profiler is not None else None
+        snapshot = peak = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+
+        # Formatear y escribir fuera del hilo de UI: comparar snapshots es caro
+        threading.Thread(
+            target=self._write_report,
+            args=(elapsed_ms, stats, self._snapshot, snapshot, peak, extra),
+            daemon=True,
+        ).start()
+
+    def _write_report(self, elapsed_ms, stats, before, after, peak, extra):
+        try:
+            if not os.path.exists(PROFILE_DIR):
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            base = os.path.join(PROFILE_DIR, f"{stamp}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', self.name)}")
+
+            out = io.StringIO()
+            out.write(f"Scope: {self.name}\n")
+            out.write(f"Fecha: {datetime.now().isoformat(timespec='seconds')}\n")
+            out.write(f"Duración: {elapsed_ms:.1f} ms\n")
+            for key, value in extra.items():
+                out.write(f"{key}: {value}\n")
+
+            if stats is not None:
+                stats.dump_stats(f"{base}.prof")
+                out.write(f"\n=== cProfile (top {PROFILE_TOP_FUNCTIONS} por tiempo acumulado) ===\n")
+                stats.stream = out
+                stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+
+            if after is not None and before is not None:
+                out.write(f"\n=== tracemalloc (pico {peak / 1024:.0f} KB, top {PROFILE_TOP_ALLOCATIONS} por línea) ===\n")
+                for diff in after.compare_to(before, "lineno")[:PROFILE_TOP_ALLOCATIONS]:
+                    out.write(f"{diff}\n")
+
+            with open(f"{base}.txt", "w", encoding="utf-8") as f:
+                f.write(out.getvalue())
+            LoggerService().log_event(f"PERF: {self.name} {elapsed_ms:.0f} ms -> {base}.txt")
+        except Exception as e:
+            LoggerService().log_error(f"Error escribiendo perfil {self.name}", e)
+
+
+def start_profile(name):
+    """ProfileSession iniciada, o None si el perfilado está apagado o ya hay un scope activo."""
+    if not profiling_enabled(name) or getattr(_active, "session", None) is not None:
+        return None
+    return ProfileSession(name).start()
+
+
+@contextmanager
+def profile_scope(name, **extra):
+    session = start_profile(name)
+    try:
+        yield session
+    finally:
+        if session is not None:
+            session.stop(**extra)
+
+
+# ===============================
+# Watchdog de bloqueos del hilo de UI
+# ===============================
+class StallWatchdog(QObject):
+    """
+    El hilo de UI marca un latido cada STALL_WATCHDOG_HEARTBEAT_MS; un hilo monitor
+    revisa el atraso. Si supera el umbral, muestrea el stack del hilo principal con
+    sys._current_frames() (una vez por umbral mientras siga bloqueado, sin repetir
+    stacks idénticos) y, al recuperarse, registra la duración total.
+    """
+
+    MAX_SAMPLES_PER_STALL = 5
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._beat)
+        self._thread = None
+        self._stop = threading.Event()
+        self._main_ident = None
+        self._last_beat = time.monotonic()
+        self.threshold_ms = 0
+        self.stall_count = 0
+        self.log_path = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, threshold_ms=STALL_WATCHDOG_MS, heartbeat_ms=STALL_WATCHDOG_HEARTBEAT_MS):
+        """Debe llamarse desde el hilo principal; threshold_ms <= 0 lo deja apagado."""
+        if threshold_ms <= 0 or self.is_running():
+            return
+        self.threshold_ms = threshold_ms
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self.log_path = os.path.join(LOG_DIR, f"stalls_{datetime.now().strftime('%Y%m%d_%H%M')}.log")
+
+        self._timer.start(max(10, heartbeat_ms))
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._monitor, args=(max(10, heartbeat_ms) / 2000.0,), daemon=True
+        )
+        self._thread.start()
+
+        # Sin event loop no hay latidos: al salir no debe reportarse como bloqueo
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+        LoggerService().log_event(f"Watchdog de UI activo (umbral {threshold_ms} ms)")
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def _monitor(self, poll_s):
+        threshold_s = self.threshold_ms / 1000.0
+        stall_beat = None     # latido en que empezó el bloqueo en curso
+        samples = []
+        next_sample = 0.0
+
+        while not self._stop.wait(poll_s):
+            beat = self._last_beat
+            lag = time.monotonic() - beat
+
+            if stall_beat is not None and beat != stall_beat:
+                # El event loop volvió a correr: cerrar el bloqueo
+                duration_ms = (beat - stall_beat) * 1000
+                self._report_recovery(duration_ms, len(samples))
+                stall_beat, samples = None, []
+                continue
+
+            if lag < threshold_s:
+                continue
+
+            if stall_beat is None:
+                stall_beat = beat
+                self.stall_count += 1
+                next_sample = threshold_s
+
+            if lag >= next_sample and len(samples) < self.MAX_SAMPLES_PER_STALL:
+                next_sample += threshold_s
+                stack = self._main_stack()
+                if stack and stack not in samples:
+                    samples.append(stack)
+                    self._write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] UI bloqueada hace {lag * 1000:.0f} ms "
+                                f"(bloqueo #{self.stall_count})\n{stack}{'-' * 50}\n")
+
+    def _main_stack(self):
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return ""
+        return "".join(traceback.format_stack(frame))
+
+    def _report_recovery(self, duration_ms, sample_count):
+        self._write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] Bloqueo #{self.stall_count} terminó: "
+                    f"{duration_ms:.0f} ms ({sample_count} muestras)\n{'=' * 50}\n")
+        LoggerService().log_event(f"PERF: UI bloqueada {duration_ms:.0f} ms -> {self.log_path}")
+
+    def _write(self, text):
+        try:
+            if not os.path.exists(LOG_DIR):
+                os.makedirs(LOG_DIR, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(text)
+        except Exception:
+            # El watchdog nunca debe botar la app
+            pass
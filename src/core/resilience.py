@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+
+import requests
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """El circuito del host está abierto: se falla rápido sin tocar la red."""
+
+    def __init__(self, host, retry_in):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(
+            f"Servicio no disponible ({host}). Reintente en {int(retry_in) + 1} s."
+        )
+
+
+class RetryPolicy:
+    """
+    Política de reintentos por método HTTP.
+    Backoff exponencial con jitter completo: sleep = random(0, min(max, base * 2^n)).
+    """
+
+    RETRY_STATUS = (502, 503, 504)
+
+    def __init__(self, max_retries=0, backoff=0.5, backoff_max=8.0,
+                 retry_status=RETRY_STATUS):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.retry_status = tuple(retry_status)
+
+    def should_retry_status(self, status_code):
+        return status_code in self.retry_status
+
+    @staticmethod
+    def should_retry_exception(exc):
+        # Solo errores de transporte; un CircuitOpenError nunca se reintenta
+        if isinstance(exc, CircuitOpenError):
+            return False
+        return isinstance(
+            exc,
+            (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+        )
+
+    def delay(self, attempt):
+        cap = min(self.backoff_max, self.backoff * (2 ** attempt))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por host.
+    closed -> open tras `threshold` fallos consecutivos;
+    open -> half-open cuando vence `cooldown`; half-open deja pasar una sola prueba.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _state(self, host):
+        return self._hosts.setdefault(
+            host, {"state": self.CLOSED, "failures": 0, "opened_at": 0.0, "probing": False}
+        )
+
+    def before_request(self, host):
+        """Lanza CircuitOpenError si el host está abierto."""
+        with self._lock:
+            st = self._state(host)
+            if st["state"] == self.OPEN:
+                elapsed = time.monotonic() - st["opened_at"]
+                if elapsed < self.cooldown:
+                    raise CircuitOpenError(host, self.cooldown - elapsed)
+                st["state"] = self.HALF_OPEN
+                st["probing"] = False
+
+            if st["state"] == self.HALF_OPEN:
+                if st["probing"]:
+                    raise CircuitOpenError(host, 0)
+                st["probing"] = True
+
+    def record_success(self, host):
+        with self._lock:
+            st = self._state(host)
+            st["state"] = self.CLOSED
+            st["failures"] = 0
+            st["probing"] = False
+
+    def record_failure(self, host):
+        with self._lock:
+            st = self._state(host)
+            st["failures"] += 1
+            st["probing"] = False
+            if st["state"] == self.HALF_OPEN or st["failures"] >= self.threshold:
+                st["state"] = self.OPEN
+                st["opened_at"] = time.monotonic()
+
+    def release_probe(self, host):
+        """Libera la prueba half-open sin registrar resultado (la request no llegó a hacerse)."""
+        with self._lock:
+            st = self._state(host)
+            st["probing"] = False
+
+    def is_open(self, host):
+        with self._lock:
+            st = self._hosts.get(host)
+            if not st or st["state"] != self.OPEN:
+                return False
+            return time.monotonic() - st["opened_at"] < self.cooldown
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+class RateLimiter:
+    """
+    Token bucket thread-safe: hasta `rate` solicitudes por segundo,
+    con ráfagas de `burst`. rate <= 0 desactiva el límite.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel_event=None):
+        """Bloquea hasta obtener un token. Devuelve False si `cancel_event` se activa antes."""
+        if self.rate <= 0:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if cancel_event is None:
+                time.sleep(wait)
+            elif cancel_event.wait(wait):
+                return False
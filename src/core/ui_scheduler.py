@@ -0,0 +1,138 @@
+from PySide6.QtCore import QObject, QTimer, QEvent, Signal, Qt
+from PySide6.QtGui import QGuiApplication
+
+
+class UiScheduler(QObject):
+    """
+    Planificador central de trabajo periódico de UI.
+
+    - `tick`: un único reloj compartido (1 s) en lugar de un QTimer por vista.
+      Solo corre mientras haya al menos un suscriptor visible.
+    - `bind_timer`: enlaza un QTimer propio (p.ej. el spinner de LoadingOverlay)
+      a la visibilidad de su widget.
+    Todo se suspende con la ventana minimizada o la app oculta, y se reanuda al volver.
+    """
+
+    tick = Signal()
+
+    CLOCK_INTERVAL_MS = 1000
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._clock = QTimer(self)
+        self._clock.setTimerType(Qt.CoarseTimer)
+        self._clock.timeout.connect(self.tick.emit)
+
+        self._suspended = False
+        self._clock_widgets = {}   # id(widget) -> (widget, slot)
+        self._timers = {}          # id(widget) -> (widget, timer, interval)
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_application_state)
+
+    # ===============================
+    # Reloj compartido
+    # ===============================
+    def subscribe_clock(self, widget, slot):
+        key = id(widget)
+        if key in self._clock_widgets:
+            return
+        self._clock_widgets[key] = (widget, slot)
+        self.tick.connect(slot)
+        widget.installEventFilter(self)
+        widget.destroyed.connect(lambda *_: self._forget(key))
+        self._update_clock()
+
+    def unsubscribe_clock(self, widget):
+        entry = self._clock_widgets.pop(id(widget), None)
+        if entry:
+            try:
+                self.tick.disconnect(entry[1])
+            except (RuntimeError, TypeError):
+                pass
+        self._update_clock()
+
+    def _update_clock(self):
+        active = not self._suspended and any(
+            self._is_visible(w) for w, _ in self._clock_widgets.values()
+        )
+        if active and not self._clock.isActive():
+            self._clock.start(self.CLOCK_INTERVAL_MS)
+            # Al reanudar se refresca de inmediato para no mostrar datos viejos
+            self.tick.emit()
+        elif not active and self._clock.isActive():
+            self._clock.stop()
+
+    # ===============================
+    # Timers propios de widgets
+    # ===============================
+    def bind_timer(self, widget, timer, interval):
+        key = id(widget)
+        self._timers[key] = (widget, timer, interval)
+        widget.installEventFilter(self)
+        widget.destroyed.connect(lambda *_: self._forget(key))
+        self._sync_timer(key)
+
+    def _sync_timer(self, key):
+        entry = self._timers.get(key)
+        if not entry:
+            return
+        widget, timer, interval = entry
+        try:
+            if not self._suspended and self._is_visible(widget):
+                if not timer.isActive():
+                    timer.start(interval)
+            elif timer.isActive():
+                timer.stop()
+        except RuntimeError:
+            # El widget ya fue destruido del lado C++
+            self._timers.pop(key, None)
+
+    # ===============================
+    # Visibilidad / suspensión
+    # ===============================
+    def set_suspended(self, suspended):
+        if suspended == self._suspended:
+            return
+        self._suspended = suspended
+        self._update_clock()
+        for key in list(self._timers):
+            self._sync_timer(key)
+
+    def _on_application_state(self, state):
+        self.set_suspended(state in (Qt.ApplicationHidden, Qt.ApplicationSuspended))
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Show, QEvent.Hide):
+            key = id(obj)
+            if key in self._timers:
+                self._sync_timer(key)
+            if key in self._clock_widgets:
+                self._update_clock()
+        return False
+
+    def _forget(self, key):
+        self._timers.pop(key, None)
+        entry = self._clock_widgets.pop(key, None)
+        if entry:
+            try:
+                self.tick.disconnect(entry[1])
+            except (RuntimeError, TypeError):
+                pass
+        self._update_clock()
+
+    @staticmethod
+    def _is_visible(widget):
+        try:
+            return widget.isVisible() and not widget.window().isMinimized()
+        except RuntimeError:
+            return False
@@ -28,11 +28,14 @@ class CacheManager:
         except Exception as e:
             print(f"Cache save error: {e}")
 
-    def get(self, key):
+    def get(self, key, allow_expired=False):
         with QMutexLocker(self.mutex):
             cache = self._load_cache()
             if key in cache:
                 entry = cache[key]
+                if allow_expired:
+                    # Modo degradado: se sirve aunque haya vencido el TTL
+                    return entry.get("data")
                 timestamp = entry.get("timestamp")
                 if timestamp:
                     try:
@@ -0,0 +1,261 @@
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+
+
+def normalize_text(text):
+    """"Región de Ñuble" -> "region de nuble" (sin tildes, sin mayúsculas)."""
+    text = str(text or "")
+    if text.isascii():
+        return text.casefold()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class CatalogIndex:
+    """
+    Índice de búsqueda sobre las filas de un modelo de catálogo.
+
+    Se arma una vez por catálogo: textos normalizados, id -> fila y las
+    palabras ordenadas para resolver prefijos con bisect. Las subcadenas
+    (3+ caracteres) se resuelven intersectando las listas de sus trigramas sobre
+    el vocabulario; ese índice se arma en la primera búsqueda de ese tipo.
+    """
+
+    SUBSTRING_MIN = 3
+    GRAM = 3
+
+    def __init__(self, entries):
+        # entries: (texto visible, id) en el orden de las filas
+        self.labels = []
+        self.ids = []
+        self.texts = []
+        self.row_by_key = {}
+        words = []
+        for row, (label, key) in enumerate(entries):
+            text = normalize_text(label)
+            self.labels.append(str(label or ""))
+            self.ids.append(key)
+            self.texts.append(text)
+            self.row_by_key.setdefault(str(key), row)
+            words.extend((word, row) for word in text.split())
+        words.sort()
+        self._words = [w for w, _ in words]
+        self._word_rows = [r for _, r in words]
+        self._vocab = None      # palabras distintas, en orden
+        self._grams = None      # trigrama -> set de posiciones en _vocab
+
+    def _gram_index(self):
+        # Sobre el vocabulario y no sobre las filas: una palabra repetida en miles
+        # de filas ("region", "de") se indexa una sola vez
+        if self._grams is None:
+            vocab = []
+            grams = {}
+            n = self.GRAM
+            previous = None
+            for word in self._words:
+                if word == previous:
+                    continue
+                previous = word
+                pos = len(vocab)
+                vocab.append(word)
+                for gram in {word[i:i + n] for i in range(len(word) - n + 1)}:
+                    positions = grams.get(gram)
+                    if positions is None:
+                        grams[gram] = {pos}
+                    else:
+                        positions.add(pos)
+            self._vocab = vocab
+            self._grams = grams
+        return self._grams
+
+    def _substring_rows(self, token):
+        grams = self._gram_index()
+        n = self.GRAM
+        # Postings de menor a mayor: la intersección se achica lo antes posible
+        postings = sorted(
+            (grams.get(token[i:i + n], ()) for i in range(len(token) - n + 1)), key=len
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+
+        rows = set()
+        for pos in candidates:
+            word = self._vocab[pos]
+            # Tener todos los trigramas no garantiza que estén contiguos
+            if token in word:
+                lo = bisect_left(self._words, word)
+                hi = bisect_right(self._words, word, lo)
+                rows.update(self._word_rows[lo:hi])
+        return rows
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(
+            (model.index(row, 0).data(Qt.DisplayRole), model.index(row, 0).data(Qt.UserRole))
+            for row in range(model.rowCount())
+        )
+
+    def search(self, query):
+        """Filas (en orden del catálogo) que calzan con todas las palabras; None = sin filtro."""
+        tokens = normalize_text(query).split()
+        if not tokens:
+            return None
+
+        result = None
+        for token in tokens:
+            lo = bisect_left(self._words, token)
+            hi = bisect_left(self._words, token + "\uffff")
+            rows = set(self._word_rows[lo:hi])
+            if len(token) >= self.SUBSTRING_MIN:
+                rows |= self._substring_rows(token)
+            result = rows if result is None else result & rows
+            if not result:
+                break
+        return sorted(result)
+
+
+class CatalogModelRegistry(QObject):
+    """
+    Un único QStandardItemModel de solo lectura por catálogo (cache_key).
+
+    Los combos de todos los diálogos abiertos se enganchan al mismo modelo en
+    vez de copiar cada opción con addItem. Los combos múltiples lo envuelven en
+    un proxy con sus propios checks (CheckableComboBox). Nadie debe llamar
+    clear() sobre un modelo compartido: se desengancha el combo antes.
+
+    Cuando llega otra versión del catálogo, los combos registrados con attach()
+    se re-enganchan al modelo nuevo y el anterior se libera con deleteLater().
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._models = {}     # cache_key -> (huella de los datos, model, id de la primera opción)
+        self._indexes = {}    # cache_key -> CatalogIndex del modelo vigente
+        self._retired = {}    # cache_key -> modelo invalidado que algún combo aún muestra
+        self._consumers = {}  # cache_key -> {combo: repoint(nuevo_modelo)}
+        self._consumer_keys = {}  # combo -> cache_key
+        self._wired = set()       # combos con destroyed ya conectado (una vez por combo)
+
+    @staticmethod
+    def _fingerprint(data):
+        # Largo + hash de (id, nombre): no se guarda una copia de los datos para comparar
+        return len(data), hash(tuple(
+            (str(entry.get("id")), str(entry.get("nombre", ""))) for entry in data
+        ))
+
+    def model_for(self, cache_key, data, owner=None):
+        """Modelo compartido del catálogo; sin cache_key se arma uno propio de `owner`."""
+        data = data or []
+        if not cache_key:
+            return self._build_model(data, owner, shared=False)
+
+        fingerprint = self._fingerprint(data)
+        entry = self._models.get(cache_key)
+        if entry and entry[0] == fingerprint:
+            return entry[1]
+
+        model = self._build_model(data, self, shared=True)
+        model.setProperty("catalog_key", cache_key)
+        first = data[0].get("id") if data and isinstance(data[0], dict) else None
+        self._models[cache_key] = (fingerprint, model, first)
+        self._indexes.pop(cache_key, None)
+
+        old = entry[1] if entry else self._retired.pop(cache_key, None)
+        if old is not None:
+            # Los combos que mostraban la versión anterior pasan a la nueva
+            for consumer, repoint in list(self._consumers.get(cache_key, {}).items()):
+                repoint(consumer, model)
+            old.deleteLater()
+        return model
+
+    def attach(self, consumer, cache_key, repoint):
+        """Registra un combo que muestra el catálogo; repoint(combo, modelo) lo re-engancha."""
+        if not cache_key:
+            self.detach(consumer)
+            return
+        previous = self._consumer_keys.get(consumer)
+        if previous == cache_key:
+            self._consumers[cache_key][consumer] = repoint
+            return
+        if previous is not None:
+            self._drop_consumer(consumer)
+        # Los combos dependientes se desenganchan y re-enganchan a menudo: se conecta una sola vez
+        if consumer not in self._wired:
+            self._wired.add(consumer)
+            consumer.destroyed.connect(lambda *_args, c=consumer: self._on_consumer_destroyed(c))
+        self._consumer_keys[consumer] = cache_key
+        self._consumers.setdefault(cache_key, {})[consumer] = repoint
+
+    def detach(self, consumer):
+        self._drop_consumer(consumer)
+
+    def _on_consumer_destroyed(self, consumer):
+        self._wired.discard(consumer)
+        self._drop_consumer(consumer)
+
+    def _drop_consumer(self, consumer):
+        cache_key = self._consumer_keys.pop(consumer, None)
+        if cache_key is None:
+            return
+        consumers = self._consumers.get(cache_key, {})
+        consumers.pop(consumer, None)
+        if not consumers:
+            self._consumers.pop(cache_key, None)
+            retired = self._retired.pop(cache_key, None)
+            if retired is not None:
+                retired.deleteLater()
+
+    def index_for(self, model):
+        """Índice de búsqueda; el de un catálogo compartido se construye una sola vez."""
+        key = model.property("catalog_key") if self.is_shared(model) else None
+        current = self._models.get(key)
+        if not key or current is None or current[1] is not model:
+            return CatalogIndex.from_model(model)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = CatalogIndex.from_model(model)
+        return index
+
+    def first_id(self, cache_key):
+        """Id de la primera opción de un catálogo ya cargado en esta sesión; None si no está."""
+        # Se lee desde el worker de guardado: no toca el modelo Qt
+        entry = self._models.get(cache_key) if cache_key else None
+        return entry[2] if entry else None
+
+    def is_shared(self, model):
+        return bool(model is not None and model.property("catalog_shared"))
+
+    def invalidate(self, cache_key):
+        entry = self._models.pop(cache_key, None)
+        self._indexes.pop(cache_key, None)
+        if entry is None:
+            return
+        if self._consumers.get(cache_key):
+            # Sigue visible en combos abiertos: se libera al re-engancharlos o al cerrarse
+            self._retired[cache_key] = entry[1]
+        else:
+            entry[1].deleteLater()
+
+    def _build_model(self, data, parent, shared):
+        model = QStandardItemModel(parent)
+        model.setProperty("catalog_shared", shared)
+        for entry in data:
+            item = QStandardItem(str(entry.get("nombre", "")))
+            item.setData(entry.get("id"), Qt.UserRole)
+            item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+            model.appendRow(item)
+        return model
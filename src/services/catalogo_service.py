@@ -1,3 +1,5 @@
+import requests
+
 from src.core.api_client import ApiClient
 from src.services.cache_manager import CacheManager
 
@@ -13,7 +15,15 @@ class CatalogoService:
                 return cached_data
         
         # If not in cache or no key provided, fetch from API
-        data = self.api.get(endpoint)
+        try:
+            data = self.api.get(endpoint)
+        except requests.exceptions.RequestException:
+            # Backend caído / circuito abierto: usar la copia vencida si existe
+            if cache_key:
+                stale_data = self.cache.get(cache_key, allow_expired=True)
+                if stale_data:
+                    return stale_data
+            raise
         
         if cache_key and data:
             self.cache.set(cache_key, data)
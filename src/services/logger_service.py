@@ -1,3 +1,4 @@
+import atexit
 import os
 import threading
 import queue
@@ -5,6 +6,15 @@ import time
 from datetime import datetime
 import traceback
 
+from src.config.settings import (
+    LOG_FLUSH_INTERVAL,
+    LOG_FLUSH_BYTES,
+    LOG_BATCH_SIZE,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_ROTATE_HOURS,
+)
+
 class LoggerService:
     _instance = None
     _lock = threading.Lock()
@@ -32,10 +42,16 @@ class LoggerService:
         # Queue for fire-and-forget
         self.log_queue = queue.Queue()
         self.running = True
+
+        # Estado del hilo escritor: buffers por archivo y handles persistentes
+        self._buffers = {}
+        self._pending_bytes = 0
+        self._handles = {}
         
         # Background worker
         self.worker_thread = threading.Thread(target=self._process_queue, daemon=True)
         self.worker_thread.start()
+        atexit.register(self.shutdown)
         
         self._initialized = True
 
@@ -53,42 +69,161 @@ class LoggerService:
 
     def log_event(self, message):
         """High level executive summary event"""
-        self.log_queue.put(("event", message))
+        self.log_queue.put(("event", datetime.now(), message))
 
     def log_error(self, message, error=None):
         """Detailed error log with possible cause"""
-        self.log_queue.put(("error", message, error))
+        self.log_queue.put(("error", datetime.now(), message, error))
+
+    def flush(self, timeout=2.0):
+        """Bloquea hasta que el hilo escritor vacíe sus buffers a disco."""
+        if not self.worker_thread.is_alive():
+            return
+        done = threading.Event()
+        self.log_queue.put(("flush", done))
+        done.wait(timeout)
 
+    def shutdown(self, timeout=2.0):
+        """Vacía la cola, escribe lo pendiente y cierra los archivos."""
+        if not self.running:
+            return
+        self.running = False
+        self.log_queue.put(None)
+        self.worker_thread.join(timeout)
+
+    # ===============================
+    # Hilo escritor (por lotes)
+    # ===============================
     def _process_queue(self):
-        while self.running:
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, LOG_FLUSH_INTERVAL - (time.monotonic() - last_flush))
+            try:
+                batch = [self.log_queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+
+            # Drenar lo que ya esté encolado sin volver a bloquear
+            while batch and len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self.log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            waiters = []
+            for item in batch:
+                try:
+                    if item is None:
+                        stop = True
+                        continue
+
+                    log_type = item[0]
+                    if log_type == "event":
+                        self._write_event(item[2], item[1])
+                    elif log_type == "error":
+                        self._write_error(item[2], item[3], item[1])
+                    elif log_type == "flush":
+                        waiters.append(item[1])
+                except Exception:
+                    # Failsafe: logger shouldn't crash app
+                    pass
+                finally:
+                    self.log_queue.task_done()
+
+            if (
+                stop
+                or waiters
+                or self._pending_bytes >= LOG_FLUSH_BYTES
+                or time.monotonic() - last_flush >= LOG_FLUSH_INTERVAL
+            ):
+                self._flush_buffers()
+                last_flush = time.monotonic()
+
+            for done in waiters:
+                done.set()
+
+            if stop:
+                self._close_handles()
+                return
+
+    def _buffer(self, path, entry):
+        if not path:
+            return
+        self._buffers.setdefault(path, []).append(entry)
+        self._pending_bytes += len(entry)
+
+    def _flush_buffers(self):
+        buffers, self._buffers = self._buffers, {}
+        self._pending_bytes = 0
+
+        for path, entries in buffers.items():
+            data = "".join(entries)
+            size = len(data.encode("utf-8"))
             try:
-                item = self.log_queue.get()
-                if item is None:
-                    continue
-                
-                log_type = item[0]
-                
-                if log_type == "event":
-                    self._write_event(item[1])
-                elif log_type == "error":
-                    self._write_error(item[1], item[2])
-                    
-                self.log_queue.task_done()
+                handle = self._get_handle(path, size)
+                handle["fh"].write(data)
+                handle["fh"].flush()
+                handle["size"] += size
             except Exception:
-                # Failsafe: logger shouldn't crash app
                 pass
 
-    def _write_event(self, message):
+        # Archivos de una sesión anterior (init_session cambió el destino)
+        active = {self.event_file, self.error_file}
+        for path in list(self._handles):
+            if path not in active:
+                self._close_handle(path)
+
+    def _get_handle(self, path, incoming):
+        handle = self._handles.get(path)
+        if handle and self._should_rotate(handle, incoming):
+            self._close_handle(path)
+            self._rotate(path)
+            handle = None
+
+        if handle is None:
+            fh = open(path, "a", encoding="utf-8", buffering=LOG_FLUSH_BYTES)
+            handle = {"fh": fh, "size": os.path.getsize(path), "opened_at": time.time()}
+            self._handles[path] = handle
+        return handle
+
+    def _should_rotate(self, handle, incoming):
+        if LOG_MAX_BYTES > 0 and handle["size"] > 0 and handle["size"] + incoming > LOG_MAX_BYTES:
+            return True
+        if LOG_ROTATE_HOURS > 0 and time.time() - handle["opened_at"] >= LOG_ROTATE_HOURS * 3600:
+            return True
+        return False
+
+    def _rotate(self, path):
+        # archivo.log -> archivo.log.1 -> ... -> archivo.log.N (se descarta el más antiguo)
+        if LOG_BACKUP_COUNT <= 0:
+            os.remove(path)
+            return
+        for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+            src = f"{path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{path}.{i + 1}")
+        if os.path.exists(path):
+            os.replace(path, f"{path}.1")
+
+    def _close_handle(self, path):
+        handle = self._handles.pop(path, None)
+        if handle:
+            try:
+                handle["fh"].close()
+            except Exception:
+                pass
+
+    def _close_handles(self):
+        for path in list(self._handles):
+            self._close_handle(path)
+
+    def _write_event(self, message, when=None):
         if not self.event_file: return
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = (when or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
         entry = f"[{timestamp}] {message}\n"
-        
-        try:
-            with open(self.event_file, "a", encoding="utf-8") as f:
-                f.write(entry)
-        except:
-            pass
+        self._buffer(self.event_file, entry)
 
     def _determine_cause(self, error):
         error_str = str(error).lower()
@@ -106,10 +241,10 @@ class LoggerService:
             return "El servidor tardó demasiado en responder."
         return "Error técnico no identificado, requiere revisión de logs detallados."
 
-    def _write_error(self, message, error):
+    def _write_error(self, message, error, when=None):
         if not self.error_file: return
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = (when or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
         cause = self._determine_cause(error) if error else "N/A"
         error_detail = str(error) if error else "Sin detalle técnico"
         
@@ -119,9 +254,4 @@ class LoggerService:
             f"    -> Causa Probable: {cause}\n"
             f"{'-'*50}\n"
         )
-        
-        try:
-            with open(self.error_file, "a", encoding="utf-8") as f:
-                f.write(entry)
-        except:
-            pass
+        self._buffer(self.error_file, entry)
@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from src.config.settings import METRICS_EXPORT_INTERVAL
+
+# Límites superiores (ms) de los buckets del histograma; el último es "resto"
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+_UUID_RE = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_NUM_RE = re.compile(r"^\d+$")
+_RUN_RE = re.compile(r"^\d{1,3}(\.?\d{3})*-[\dkK]$")
+
+
+def endpoint_template(url):
+    """/rat/5f0c...-.../full?x=1 -> /rat/{id}/full (ids, números y RUN se agrupan)."""
+    path = urlsplit(url).path or "/"
+    parts = []
+    for segment in path.split("/"):
+        if _UUID_RE.match(segment) or _NUM_RE.match(segment) or _RUN_RE.match(segment):
+            parts.append("{id}")
+        else:
+            parts.append(segment)
+    return "/".join(parts)
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.ttfb_ms = 0.0
+        self.ttfb_count = 0
+        self.bytes = 0
+        self.status = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def add(self, status, total_ms, ttfb_ms, size, retries, failed):
+        self.count += 1
+        self.retries += retries
+        if failed:
+            self.errors += 1
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        if ttfb_ms is not None:
+            self.ttfb_ms += ttfb_ms
+            self.ttfb_count += 1
+        self.bytes += size or 0
+        key = str(status)
+        self.status[key] = self.status.get(key, 0) + 1
+        for i, limit in enumerate(LATENCY_BUCKETS_MS):
+            if total_ms <= limit:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, pct):
+        # Aproximación por bucket: cota superior del bucket que contiene el percentil
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                limit = LATENCY_BUCKETS_MS[i]
+                return self.max_ms if limit == float("inf") else min(limit, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+            "p99_ms": round(self.percentile(99), 1),
+            "max_ms": round(self.max_ms, 1),
+            "avg_ttfb_ms": round(self.ttfb_ms / self.ttfb_count, 1) if self.ttfb_count else None,
+            "bytes_total": self.bytes,
+            "bytes_avg": int(self.bytes / self.count) if self.count else 0,
+            "status": dict(self.status),
+            "histogram": {
+                ("inf" if limit == float("inf") else str(limit)): n
+                for limit, n in zip(LATENCY_BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+class MetricsService:
+    """
+    Métricas en memoria por plantilla de endpoint (método + ruta normalizada).
+    ApiClient registra cada request; el panel de diagnóstico y el export periódico leen snapshot().
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(MetricsService, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        self._dirty = False
+        self.started_at = datetime.now()
+
+        self.log_dir = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Log"
+        )
+        self._export_thread = None
+        self._stop = threading.Event()
+
+        self._initialized = True
+
+    def record(self, method, url, status, total_ms, ttfb_ms=None, size=0, retries=0, failed=False):
+        key = f"{method.upper()} {endpoint_template(url)}"
+        with self._stats_lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _EndpointStats()
+            stats.add(status, total_ms, ttfb_ms, size, retries, failed)
+            self._dirty = True
+
+    def snapshot(self):
+        with self._stats_lock:
+            rows = [{"endpoint": key, **stats.as_dict()} for key, stats in self._stats.items()]
+        rows.sort(key=lambda r: r["p95_ms"], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._stats_lock:
+            self._stats.clear()
+            self._dirty = False
+        self.started_at = datetime.now()
+
+    # ===============================
+    # Export
+    # ===============================
+    def export(self, path=None):
+        if path is None:
+            if not os.path.exists(self.log_dir):
+                os.makedirs(self.log_dir)
+            path = os.path.join(
+                self.log_dir, f"metrics_{self.started_at.strftime('%Y%m%d_%H%M')}.json"
+            )
+
+        data = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "since": self.started_at.isoformat(timespec="seconds"),
+            "endpoints": self.snapshot(),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        with self._stats_lock:
+            self._dirty = False
+        return path
+
+    def start_periodic_export(self, interval=METRICS_EXPORT_INTERVAL):
+        if interval <= 0 or (self._export_thread and self._export_thread.is_alive()):
+            return
+        self._stop.clear()
+        self._export_thread = threading.Thread(
+            target=self._export_loop, args=(interval,), daemon=True
+        )
+        self._export_thread.start()
+
+    def stop_periodic_export(self):
+        self._stop.set()
+
+    def _export_loop(self, interval):
+        while not self._stop.wait(interval):
+            if not self._dirty:
+                continue
+            try:
+                self.export()
+            except Exception:
+                # Las métricas nunca deben botar la app
+                pass
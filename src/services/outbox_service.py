@@ -0,0 +1,324 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import requests
+from PySide6.QtCore import QStandardPaths
+
+from src.core.api_client import ApiClient
+from src.services.logger_service import LoggerService
+
+
+class OutboxService:
+    """
+    Cola persistente (SQLite) de escrituras pendientes.
+
+    Cuando el backend no responde, los PUT/POST de los formularios se guardan
+    aquí con una Idempotency-Key y se reenvían en orden al recuperar conexión.
+    Cada escritura encolada deja además un borrador legible offline.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(OutboxService, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        self.db_path = os.path.join(data_dir, "outbox.sqlite3")
+
+        self._db_lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        self._initialized = True
+
+    def _create_schema(self):
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT UNIQUE NOT NULL,
+                    user_id TEXT,
+                    method TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    payload TEXT,
+                    draft_key TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS drafts (
+                    draft_key TEXT PRIMARY KEY,
+                    user_id TEXT,
+                    endpoint TEXT,
+                    record_id TEXT,
+                    payload TEXT,
+                    idempotency_key TEXT,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    # ===============================
+    # Helpers
+    # ===============================
+    @staticmethod
+    def is_offline_error(error):
+        """Errores de transporte (incluye circuito abierto); no los HTTP 4xx/5xx."""
+        return isinstance(
+            error,
+            (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+        )
+
+    @staticmethod
+    def draft_key_for(endpoint, record_id=None, idempotency_key=None):
+        if record_id is not None:
+            return f"{endpoint}/{record_id}"
+        return f"{endpoint}/nuevo/{idempotency_key}"
+
+    def _user_id(self):
+        return ApiClient().user_id
+
+    # ===============================
+    # Outbox
+    # ===============================
+    def writer(self, endpoint, record_id, draft_values=None):
+        return OutboxWriter(self, endpoint, record_id, draft_values)
+
+    def enqueue(self, method, path, payload, endpoint=None, record_id=None, draft_values=None):
+        """Encola una escritura y guarda su borrador. Retorna la Idempotency-Key."""
+        idempotency_key = str(uuid.uuid4())
+        draft_key = self.draft_key_for(endpoint or path, record_id, idempotency_key)
+        now = time.time()
+        user_id = self._user_id()
+
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO outbox (idempotency_key, user_id, method, path, payload, draft_key, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (idempotency_key, user_id, method.upper(), path,
+                 json.dumps(payload, ensure_ascii=False), draft_key, now),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO drafts (draft_key, user_id, endpoint, record_id, payload, idempotency_key, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (draft_key, user_id, endpoint or path,
+                 None if record_id is None else str(record_id),
+                 json.dumps(draft_values if draft_values is not None else payload, ensure_ascii=False),
+                 idempotency_key, now),
+            )
+
+        LoggerService().log_event(f"Escritura encolada sin conexión: {method.upper()} {path}")
+        return idempotency_key
+
+    def pending(self, draft_key=None):
+        query = (
+            "SELECT id, idempotency_key, method, path, payload, draft_key, attempts "
+            "FROM outbox WHERE status = 'pending' AND user_id IS ?"
+        )
+        params = [self._user_id()]
+        if draft_key:
+            query += " AND draft_key = ?"
+            params.append(draft_key)
+        query += " ORDER BY id"
+
+        with self._db_lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "id": r[0],
+                "idempotency_key": r[1],
+                "method": r[2],
+                "path": r[3],
+                "payload": json.loads(r[4]) if r[4] else None,
+                "draft_key": r[5],
+                "attempts": r[6],
+            }
+            for r in rows
+        ]
+
+    def pending_count(self):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'pending' AND user_id IS ?",
+                (self._user_id(),),
+            ).fetchone()
+        return row[0] if row else 0
+
+    # 4xx que no juzgan la escritura (sesión vencida, sin permiso momentáneo,
+    # timeout, throttling): se reintentan como un 5xx en el próximo ciclo
+    TRANSIENT_STATUS = (401, 403, 408, 429)
+
+    def replay(self, draft_key=None, blocking=False):
+        """
+        Reenvía en orden las escrituras pendientes del usuario actual (o solo las
+        de `draft_key`). Se detiene en el primer error de conexión, 5xx o 4xx
+        transitorio (TRANSIENT_STATUS) para no desordenar la cola; un rechazo del
+        contenido (400/409/422, 404...) marca la entrada como 'failed' y sigue
+        con la próxima.
+        Con blocking=True espera a que termine un reenvío en curso en vez de omitirlo.
+        Retorna (enviadas, fallidas).
+        """
+        if not self._replay_lock.acquire(blocking=blocking):
+            return 0, 0
+
+        sent = failed = 0
+        api = ApiClient()
+        try:
+            for entry in self.pending(draft_key):
+                headers = {"Idempotency-Key": entry["idempotency_key"]}
+                try:
+                    if entry["method"] == "PUT":
+                        api.put(entry["path"], entry["payload"], headers=headers)
+                    elif entry["method"] == "PATCH":
+                        api.patch(entry["path"], entry["payload"], headers=headers)
+                    else:
+                        api.post(entry["path"], entry["payload"], headers=headers)
+                except requests.exceptions.HTTPError as e:
+                    status = e.response.status_code if e.response is not None else 0
+                    if status >= 500 or status in self.TRANSIENT_STATUS or not status:
+                        # 401/403/408/429/5xx: la entrada y su borrador quedan pendientes
+                        self._mark_attempt(entry["id"], str(e))
+                        break
+                    self._mark_failed(entry, str(e))
+                    LoggerService().log_error(
+                        f"Escritura encolada rechazada por el servidor: {entry['method']} {entry['path']}", e
+                    )
+                    failed += 1
+                    continue
+                except requests.exceptions.RequestException as e:
+                    self._mark_attempt(entry["id"], str(e))
+                    break
+
+                self._mark_sent(entry)
+                sent += 1
+        finally:
+            self._replay_lock.release()
+
+        if sent:
+            LoggerService().log_event(f"Cola offline sincronizada: {sent} escritura(s) enviadas")
+        return sent, failed
+
+    def _mark_attempt(self, entry_id, error):
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, entry_id),
+            )
+
+    def _mark_failed(self, entry, error):
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, entry["id"]),
+            )
+            # El servidor rechazó la escritura: el borrador ya no representa algo que
+            # vaya a aplicarse y no debe seguir tapando los datos del servidor al abrir
+            # (se conserva si aún quedan escrituras pendientes de una edición posterior)
+            self._conn.execute(
+                "DELETE FROM drafts WHERE draft_key = ? AND NOT EXISTS ("
+                "SELECT 1 FROM outbox WHERE outbox.draft_key = drafts.draft_key AND status = 'pending')",
+                (entry["draft_key"],),
+            )
+
+    def _mark_sent(self, entry):
+        with self._db_lock, self._conn:
+            self._conn.execute("DELETE FROM outbox WHERE id = ?", (entry["id"],))
+            # El borrador solo se descarta si no fue reemplazado por una edición posterior
+            self._conn.execute(
+                "DELETE FROM drafts WHERE draft_key = ? AND idempotency_key = ?",
+                (entry["draft_key"], entry["idempotency_key"]),
+            )
+
+    # ===============================
+    # Borradores
+    # ===============================
+    def get_draft(self, draft_key):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT payload FROM drafts WHERE draft_key = ? AND user_id IS ?",
+                (draft_key, self._user_id()),
+            ).fetchone()
+        if not row or not row[0]:
+            return None
+        try:
+            return json.loads(row[0])
+        except Exception:
+            return None
+
+    def discard_draft(self, draft_key):
+        """
+        Tras guardar en línea: el registro del servidor ya tiene el estado final,
+        así que se descartan el borrador y las escrituras aún encoladas del mismo
+        registro (reenviarlas después pisaría lo recién guardado).
+        """
+        with self._replay_lock, self._db_lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM outbox WHERE draft_key = ? AND status = 'pending' AND user_id IS ?",
+                (draft_key, self._user_id()),
+            )
+            self._conn.execute(
+                "DELETE FROM drafts WHERE draft_key = ? AND user_id IS ?",
+                (draft_key, self._user_id()),
+            )
+
+
+class OutboxWriter:
+    """
+    Sustituto de ApiClient para guardados de varios pasos (p.ej. RAT con secciones).
+    Las escrituras se encolan compartiendo un mismo borrador; las lecturas fallan
+    como si no hubiera red, igual que lo haría el cliente real.
+    """
+
+    def __init__(self, outbox, endpoint, record_id, draft_values=None):
+        self.outbox = outbox
+        self.endpoint = endpoint
+        self.record_id = record_id
+        self.draft_values = draft_values
+
+    def _enqueue(self, method, path, payload):
+        self.outbox.enqueue(
+            method, path, payload,
+            endpoint=self.endpoint, record_id=self.record_id,
+            draft_values=self.draft_values,
+        )
+        return {}
+
+    def put(self, path, payload, headers=None):
+        return self._enqueue("PUT", path, payload)
+
+    def post(self, path, data, headers=None):
+        return self._enqueue("POST", path, data)
+
+    def patch(self, path, payload, headers=None):
+        return self._enqueue("PATCH", path, payload)
+
+    def get(self, path):
+        raise requests.exceptions.ConnectionError(f"Sin conexión: GET {path} no disponible offline")
+
+    def delete(self, path):
+        raise requests.exceptions.ConnectionError(f"Sin conexión: DELETE {path} no disponible offline")
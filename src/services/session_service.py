@@ -0,0 +1,145 @@
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from src.services.user_service import UserService
+from src.workers.api_worker import ApiWorker
+
+
+class SessionService(QObject):
+    """
+    Perfil de la sesión actual (usuario, permisos y catálogo de privilegios).
+
+    Se carga una sola vez después del login y lo comparten todas las vistas:
+    se suscriben a `profile_changed` y piden `refresh()` solo cuando corresponde.
+    """
+
+    profile_changed = Signal(dict)
+    profile_error = Signal(str)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.user_service = UserService()
+        self._profile = None
+        self._generation = 0
+        self._fetch_lock = threading.Lock()
+        self._worker = None
+        self._worker_generation = None
+        # Workers de una sesión anterior que siguen corriendo: se guardan hasta que
+        # terminen para que Python no destruya el QThread en marcha
+        self._stale_workers = []
+
+    # ===============================
+    # Estado
+    # ===============================
+    @property
+    def is_loaded(self):
+        return self._profile is not None
+
+    @property
+    def profile(self):
+        return self._profile
+
+    @property
+    def user(self):
+        return (self._profile or {}).get("user") or {}
+
+    @property
+    def permissions(self):
+        return (self._profile or {}).get("permissions") or {}
+
+    @property
+    def privilege_name_by_code(self):
+        return (self._profile or {}).get("privilege_name_by_code") or {}
+
+    # ===============================
+    # Carga
+    # ===============================
+    def load_blocking(self, force=False):
+        """Para hilos de trabajo: retorna el perfil, pidiéndolo al backend solo si falta."""
+        if self._profile is not None and not force:
+            return self._profile
+
+        generation = self._generation
+        with self._fetch_lock:
+            # Otro hilo pudo haberlo cargado mientras esperábamos el lock
+            if self._profile is not None and not force:
+                return self._profile
+
+            me = self.user_service.get_me()
+            permissions = self.user_service.get_permissions(str(me["id"]))
+            try:
+                privilegios = self.user_service.list_privilegios()
+                privilege_name_by_code = {
+                    p.get("codigo", ""): p.get("nombre", "") for p in privilegios
+                }
+            except Exception:
+                privilegios = []
+                privilege_name_by_code = {}
+
+            profile = {
+                "user": me,
+                "permissions": permissions,
+                "privilegios": privilegios,
+                "privilege_name_by_code": privilege_name_by_code,
+            }
+
+            # Si hubo logout durante la carga, no se publica un perfil ajeno
+            if generation != self._generation:
+                return profile
+
+            self._profile = profile
+
+        self.profile_changed.emit(profile)
+        return profile
+
+    def _is_loading(self):
+        # Un worker de antes del último clear() no cuenta: su perfil se descarta
+        return bool(
+            self._worker and self._worker.isRunning()
+            and self._worker_generation == self._generation
+        )
+
+    def _refresh_blocking(self, generation):
+        try:
+            return self.load_blocking(force=True)
+        except Exception:
+            if generation != self._generation:
+                # Error de la sesión anterior: no se informa a la nueva
+                return None
+            raise
+
+    def refresh(self):
+        """Recarga explícita en segundo plano; los suscriptores reciben profile_changed."""
+        if self._is_loading():
+            return
+        self._stale_workers = [w for w in self._stale_workers if w.isRunning()]
+        if self._worker and self._worker.isRunning():
+            self._stale_workers.append(self._worker)
+
+        self._worker_generation = self._generation
+        self._worker = ApiWorker(self._refresh_blocking, self._generation)
+        self._worker.error.connect(self.profile_error.emit)
+        self._worker.start()
+
+    def subscribe(self, on_profile, on_error=None):
+        self.profile_changed.connect(on_profile)
+        if on_error:
+            self.profile_error.connect(on_error)
+
+        if self._profile is not None:
+            on_profile(self._profile)
+        else:
+            self.refresh()
+
+    def clear(self):
+        self._generation += 1
+        self._profile = None
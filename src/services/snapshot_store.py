@@ -0,0 +1,95 @@
+import os
+import re
+import threading
+import time
+
+from PySide6.QtCore import QStandardPaths
+
+from src.core import json_codec
+from src.services.logger_service import LoggerService
+
+
+class SnapshotStore:
+    """
+    Snapshots de grillas (stale-while-revalidate): un archivo JSON por clave.
+
+    A diferencia de CacheManager no se reescribe un único archivo con todas las
+    claves: cada grilla escribe solo el suyo, y la serialización + escritura
+    corren en un hilo aparte. Si llegan varias escrituras de la misma clave
+    antes de que el hilo las tome, solo se escribe la última.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(SnapshotStore, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, ttl_minutes=7 * 24 * 60):
+        if self._initialized:
+            return
+
+        data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        self.folder = os.path.join(data_dir, "grid_snapshots")
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder, exist_ok=True)
+        self.ttl_minutes = ttl_minutes
+
+        self._pending = {}    # key -> datos aún no escritos
+        self._pending_lock = threading.Lock()
+        self._writer = None
+
+        self._initialized = True
+
+    def _path(self, key):
+        return os.path.join(self.folder, re.sub(r"[^A-Za-z0-9_.-]+", "_", key) + ".json")
+
+    def get(self, key):
+        # Lo que aún espera al hilo de escritura es lo más nuevo
+        with self._pending_lock:
+            if key in self._pending:
+                return self._pending[key]
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = json_codec.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            LoggerService().log_error(f"Error leyendo snapshot {key}", e)
+            return None
+        if time.time() - entry.get("timestamp", 0) >= self.ttl_minutes * 60:
+            return None
+        return entry.get("data")
+
+    def set_async(self, key, data):
+        with self._pending_lock:
+            self._pending[key] = data
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._drain, daemon=True)
+                self._writer.start()
+
+    def _drain(self):
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    self._writer = None
+                    return
+                key, data = self._pending.popitem()
+            self._write(key, data)
+
+    def _write(self, key, data):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            payload = json_codec.dumps({"timestamp": time.time(), "data": data})
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            # Reemplazo atómico: un cierre a mitad de escritura no deja el snapshot corrupto
+            os.replace(tmp_path, path)
+        except Exception as e:
+            LoggerService().log_error(f"Error guardando snapshot {key}", e)
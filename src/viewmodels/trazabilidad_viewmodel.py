@@ -1,9 +1,71 @@
 from typing import List, Dict, Optional
-from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtCore import QObject, Signal, Slot, QThreadPool
+from functools import partial
 from src.core.api_client import ApiClient
+from src.core.resilience import RateLimiter
+from src.config.settings import (
+    TRAZABILIDAD_BATCH_CONCURRENCY,
+    TRAZABILIDAD_BATCH_RATE,
+    TRAZABILIDAD_CACHE_TTL,
+)
 from src.workers.api_worker import ApiWorker
+from src.workers.combo_loader import ComboLoaderRunnable
+from src.services.logger_service import LoggerService
+import threading
+import time
 import re
 
+# Separadores aceptados al pegar o cargar RUNs (líneas, comas, punto y coma, tabs, espacios)
+RUN_SEPARATORS = re.compile(r"[\s,;|]+")
+RUN_PATTERN = re.compile(r"^(\d{1,8})-?([\dK])$")
+
+
+def normalize_run(run: str) -> Optional[str]:
+    """"12.345.678-k" -> "12345678-K"; None si no tiene forma de RUN."""
+    clean = str(run or "").strip().strip("\"'").replace(".", "").replace(" ", "").upper()
+    match = RUN_PATTERN.match(clean)
+    if not match:
+        return None
+    return f"{int(match.group(1))}-{match.group(2)}"
+
+
+def run_dv_valido(run: str) -> bool:
+    """Valida el dígito verificador (módulo 11) de un RUN ya normalizado."""
+    body, dv = run.split("-")
+    total, factor = 0, 2
+    for digit in reversed(body):
+        total += int(digit) * factor
+        factor = 2 if factor == 7 else factor + 1
+    expected = 11 - (total % 11)
+    expected_dv = "0" if expected == 11 else "K" if expected == 10 else str(expected)
+    return dv == expected_dv
+
+
+def parse_runs(text: str):
+    """
+    Separa un texto pegado o un archivo CSV/TXT en RUNs.
+    Devuelve (válidos normalizados sin duplicados, inválidos tal como vinieron).
+    """
+    validos, invalidos, vistos = [], [], set()
+    for token in RUN_SEPARATORS.split(text or ""):
+        token = token.strip().strip("\"'")
+        if not token:
+            continue
+        run = normalize_run(token)
+        if run is None:
+            # Encabezados de CSV ("run", "rut") no cuentan como error
+            if token.lower() not in ("run", "rut"):
+                invalidos.append(token)
+            continue
+        if not run_dv_valido(run):
+            invalidos.append(token)
+            continue
+        if run not in vistos:
+            vistos.add(run)
+            validos.append(run)
+    return validos, invalidos
+
+
 class TrazabilidadViewModel(QObject):
     # Signals
     on_loading = Signal(bool)
@@ -11,12 +73,33 @@ class TrazabilidadViewModel(QObject):
     on_results_ready = Signal(list) # Emits list of results
     on_validation_error = Signal(str)
 
+    # Consulta masiva
+    on_batch_started = Signal(int)         # total de RUNs
+    on_batch_result = Signal(dict)         # fila agregada de un RUN, apenas termina
+    on_batch_progress = Signal(int, int)   # completados, total
+    on_batch_finished = Signal(dict)       # resumen
+
     def __init__(self):
         super().__init__()
         self._results = []
         self.client = ApiClient()
         self.worker = None
 
+        # Caché corto por RUN normalizado: run -> (instante, resultados)
+        self._cache = {}
+        self._inflight = {}       # run -> ApiWorker en curso (una sola consulta por RUN)
+        self._current_run = None  # el último RUN pedido es el único que se muestra
+
+        # Pool propio: la concurrencia del lote no compite con los combos del pool global
+        self.batch_pool = QThreadPool(self)
+        self.batch_pool.setMaxThreadCount(max(1, TRAZABILIDAD_BATCH_CONCURRENCY))
+        self._batch_id = 0
+        self._batch_total = 0
+        self._batch_done = 0
+        self._batch_results = []
+        self._batch_cancel = threading.Event()
+        self._active_runnables = [] # Keep refs
+
     def validate_run(self, run: str) -> bool:
         clean_run = run.strip()
         if not clean_run:
@@ -24,23 +107,69 @@ class TrazabilidadViewModel(QObject):
             return False
         return True
 
+    @staticmethod
+    def _run_key(run: str) -> str:
+        return normalize_run(run) or run.strip()
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.monotonic() - stored_at > TRAZABILIDAD_CACHE_TTL:
+            self._cache.pop(key, None)
+            return None
+        return results
+
+    def _store(self, key, results):
+        if TRAZABILIDAD_CACHE_TTL > 0:
+            self._cache[key] = (time.monotonic(), results)
+
+    def invalidate_cache(self, run: Optional[str] = None):
+        if run is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self._run_key(run), None)
+
     @Slot(str)
-    def consultar_trazabilidad(self, run: str):
+    def consultar_trazabilidad(self, run: str, force: bool = False):
         if not self.validate_run(run):
             return
 
+        key = self._run_key(run)
+        self._current_run = key
+
+        if not force:
+            cached = self._cached(key)
+            if cached is not None:
+                # Resultado reciente: se muestra al instante, sin ir al backend
+                self._results = cached
+                self.on_loading.emit(False)
+                self.on_results_ready.emit(self._results)
+                return
+
         self.on_loading.emit(True)
-        
+        if key in self._inflight:
+            # Ya hay una consulta en vuelo para este RUN: se espera su respuesta
+            return
+
         # Backend expects { "run": "..." }
         payload = {"run": run.strip()}
-        
+
         # Use ApiWorker to make the call asynchronous
-        self.worker = ApiWorker(self.client.post, "/trazabilidad/consulta", payload)
-        self.worker.finished.connect(self._handle_success)
-        self.worker.error.connect(self._handle_error)
+        self.worker = ApiWorker(self.client.post, "/trazabilidad/consulta", payload, parent=self)
+        self.worker.finished.connect(partial(self._handle_success, key))
+        self.worker.error.connect(partial(self._handle_error, key))
+        self._inflight[key] = self.worker
         self.worker.start()
 
-    def _handle_success(self, response):
+    def _handle_success(self, key, response):
+        self._inflight.pop(key, None)
+        if isinstance(response, list):
+            self._store(key, response)
+        if key != self._current_run:
+            # Respuesta de un RUN que el usuario ya dejó atrás: queda en caché, no se muestra
+            return
         self.on_loading.emit(False)
         if isinstance(response, list):
             self._results = response
@@ -48,14 +177,126 @@ class TrazabilidadViewModel(QObject):
         else:
             self.on_error.emit("Respuesta inesperada del servidor.")
 
-    def _handle_error(self, error_msg):
+    def _handle_error(self, key, error_msg):
+        self._inflight.pop(key, None)
+        if key != self._current_run:
+            return
         self.on_loading.emit(False)
+        self.on_error.emit(self._error_message(error_msg))
+
+    @staticmethod
+    def _error_message(error_msg):
         if "404" in error_msg:
-            self.on_error.emit("Servicio de trazabilidad no encontrado.")
-        elif "400" in error_msg and "RUN configurado" in error_msg:
-             self.on_error.emit("Su usuario no tiene un RUN configurado para realizar consultas. Contacte al administrador.")
-        else:
-            self.on_error.emit(f"Error al consultar: {error_msg}")
+            return "Servicio de trazabilidad no encontrado."
+        if "400" in error_msg and "RUN configurado" in error_msg:
+            return "Su usuario no tiene un RUN configurado para realizar consultas. Contacte al administrador."
+        return f"Error al consultar: {error_msg}"
 
     def get_results(self) -> List[Dict]:
         return self._results
+
+    # ===============================
+    # Consulta masiva (lote de RUNs)
+    # ===============================
+    def is_batch_running(self) -> bool:
+        return self._batch_done < self._batch_total
+
+    def consultar_lote(self, runs: List[str]):
+        """Encola un lote ya validado con parse_runs; los resultados llegan por on_batch_result."""
+        if self.is_batch_running():
+            self.on_validation_error.emit("Ya hay una consulta masiva en curso.")
+            return
+        if not runs:
+            self.on_validation_error.emit("No hay RUNs válidos para consultar.")
+            return
+
+        self._batch_id += 1
+        self._batch_total = len(runs)
+        self._batch_done = 0
+        self._batch_results = []
+        self._batch_cancel = threading.Event()
+        self._active_runnables = []
+        limiter = RateLimiter(TRAZABILIDAD_BATCH_RATE)
+
+        LoggerService().log_event(f"TRAZABILIDAD: consulta masiva de {len(runs)} RUNs")
+        self.on_batch_started.emit(self._batch_total)
+
+        for run in runs:
+            worker = ComboLoaderRunnable(self._consultar_run, run, limiter, self._batch_cancel)
+            self._active_runnables.append(worker)
+            worker.signals.result.connect(partial(self._on_batch_item, self._batch_id, run))
+            worker.signals.error.connect(partial(self._on_batch_item_error, self._batch_id, run))
+            self.batch_pool.start(worker)
+
+    def cancelar_lote(self):
+        # Las consultas en vuelo terminan; las pendientes se marcan como canceladas sin tocar la red
+        self._batch_cancel.set()
+
+    def _consultar_run(self, run, limiter, cancel_event):
+        # Corre en el pool: nada de Qt aquí, solo red
+        if cancel_event.is_set() or not limiter.acquire(cancel_event):
+            return None
+        return self.client.post("/trazabilidad/consulta", {"run": run})
+
+    def _on_batch_item(self, batch_id, run, response):
+        if batch_id != self._batch_id:
+            return
+        if response is None:
+            row = self._batch_row(run, "Cancelado")
+        elif isinstance(response, list):
+            self._store(run, response)
+            row = self._batch_row(run, "OK" if response else "Sin resultados", resultados=response)
+        else:
+            row = self._batch_row(run, "Error", detalle="Respuesta inesperada del servidor.")
+        self._add_batch_row(row)
+
+    def _on_batch_item_error(self, batch_id, run, error_msg):
+        if batch_id != self._batch_id:
+            return
+        self._add_batch_row(self._batch_row(run, "Error", detalle=self._error_message(error_msg)))
+
+    def _batch_row(self, run, estado, resultados=None, detalle=""):
+        resultados = resultados or []
+        apis = sorted({str(r.get("api_nombre", "")) for r in resultados if isinstance(r, dict) and r.get("api_nombre")})
+        return {
+            "run": run,
+            "estado": estado,
+            "registros": len(resultados),
+            "apis": ", ".join(apis),
+            "detalle": detalle,
+            "resultados": resultados,
+        }
+
+    def _add_batch_row(self, row):
+        self._batch_results.append(row)
+        self._batch_done += 1
+        self.on_batch_result.emit(row)
+        self.on_batch_progress.emit(self._batch_done, self._batch_total)
+
+        if self._batch_done >= self._batch_total:
+            self._active_runnables = []
+            summary = {"total": self._batch_total}
+            for item in self._batch_results:
+                summary[item["estado"]] = summary.get(item["estado"], 0) + 1
+            LoggerService().log_event(f"TRAZABILIDAD: consulta masiva finalizada {summary}")
+            self.on_batch_finished.emit(summary)
+
+    def get_batch_results(self) -> List[Dict]:
+        return self._batch_results
+
+    def exportar_lote_csv(self, file_path: str):
+        """Una fila por resultado de API; los RUNs sin resultados o con error van en una sola fila."""
+        import csv
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["RUN", "Estado", "Origen", "Nombre API", "Tipo", "Fecha Consulta", "Detalle"])
+            for row in self._batch_results:
+                resultados = [r for r in row["resultados"] if isinstance(r, dict)]
+                if not resultados:
+                    writer.writerow([row["run"], row["estado"], "", "", "", "", row["detalle"]])
+                    continue
+                for r in resultados:
+                    writer.writerow([
+                        row["run"], row["estado"], r.get("origen", ""), r.get("api_nombre", ""),
+                        r.get("tipo", "API"), r.get("fecha_consulta", ""), row["detalle"]
+                    ])
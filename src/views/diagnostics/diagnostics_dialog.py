@@ -0,0 +1,116 @@
+from PySide6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+)
+from PySide6.QtCore import Qt, QTimer
+
+from src.services.metrics_service import MetricsService
+from src.services.logger_service import LoggerService
+
+
+class DiagnosticsDialog(QDialog):
+    """Panel oculto (Ctrl+Shift+D) con las métricas por endpoint de ApiClient."""
+
+    COLUMNS = [
+        ("Endpoint", "endpoint"),
+        ("Requests", "count"),
+        ("Errores", "errors"),
+        ("Reintentos", "retries"),
+        ("Prom. ms", "avg_ms"),
+        ("p50 ms", "p50_ms"),
+        ("p95 ms", "p95_ms"),
+        ("p99 ms", "p99_ms"),
+        ("Máx. ms", "max_ms"),
+        ("TTFB ms", "avg_ttfb_ms"),
+        ("KB prom.", "bytes_avg"),
+        ("Status", "status"),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico de red")
+        self.resize(1100, 560)
+        self.metrics = MetricsService()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(10)
+
+        self.lbl_summary = QLabel()
+        self.lbl_summary.setStyleSheet("color: #475569; font-size: 12px;")
+        layout.addWidget(self.lbl_summary)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([c[0] for c in self.COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        btn_reset = QPushButton("Reiniciar")
+        btn_reset.clicked.connect(self._reset)
+        btn_export = QPushButton("Exportar a Log/")
+        btn_export.clicked.connect(self._export)
+        btn_close = QPushButton("Cerrar")
+        btn_close.clicked.connect(self.accept)
+        buttons.addWidget(btn_reset)
+        buttons.addWidget(btn_export)
+        buttons.addWidget(btn_close)
+        layout.addLayout(buttons)
+
+        # Refresco en vivo mientras el panel está abierto
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(2000)
+        self.refresh()
+
+    def refresh(self):
+        rows = self.metrics.snapshot()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (_, key) in enumerate(self.COLUMNS):
+                value = row.get(key)
+                if key == "bytes_avg":
+                    value = round((value or 0) / 1024, 1)
+                elif key == "status":
+                    value = ", ".join(f"{k}×{v}" for k, v in sorted(value.items()))
+
+                item = QTableWidgetItem()
+                if isinstance(value, (int, float)):
+                    item.setData(Qt.DisplayRole, value)
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                else:
+                    item.setText("" if value is None else str(value))
+                self.table.setItem(r, c, item)
+        self.table.setSortingEnabled(True)
+
+        total = sum(r["count"] for r in rows)
+        errors = sum(r["errors"] for r in rows)
+        self.lbl_summary.setText(
+            f"{len(rows)} endpoints · {total} requests · {errors} errores · "
+            f"desde {self.metrics.started_at.strftime('%H:%M:%S')}"
+        )
+
+    def _reset(self):
+        self.metrics.reset()
+        self.refresh()
+
+    def _export(self):
+        try:
+            path = self.metrics.export()
+            self.lbl_summary.setText(f"Métricas exportadas a {path}")
+        except Exception as e:
+            LoggerService().log_error("Error exportando métricas", e)
+            self.lbl_summary.setText(f"No se pudo exportar: {e}")
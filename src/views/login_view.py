@@ -12,9 +12,9 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap, QPalette, QColor
 
 from src.viewmodels.login_viewmodel import LoginViewModel
-from src.views.main_window import MainWindow
 from src.components.loading_overlay import LoadingOverlay
 from src.services.logger_service import LoggerService
+from src.services.session_service import SessionService
 from src.workers.jwt_utils import decode_jwt
 
 
@@ -197,6 +197,12 @@ class LoginView(QWidget):
         LoggerService().init_session(str(user_id))
         LoggerService().log_event("Inicio de sesión exitoso")
 
+        # Perfil compartido (usuario, permisos, privilegios): una sola carga por sesión
+        SessionService.instance().clear()
+        SessionService.instance().refresh()
+
+        # MainWindow (y sus vistas) no se importa hasta que el login resulta exitoso
+        from src.views.main_window import MainWindow
         self.main_window = MainWindow()
         self.main_window.logout_signal.connect(self.show)
         self.main_window.show()
@@ -1,17 +1,25 @@
+import importlib
+
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
     QHBoxLayout,
     QStackedWidget,
 )
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, QTimer, QEvent
+from PySide6.QtGui import QKeySequence, QShortcut
 
 from src.views.sidebar import Sidebar
-from src.views.activos.activos_view import ActivosView
-from src.views.usuarios.usuarios_view import UsuariosView
-from src.views.eipd.eipd_view import EipdView
-from src.views.rat.rat_view import RatView
-from src.views.trazabilidad.trazabilidad_view import TrazabilidadView
+from src.services.outbox_service import OutboxService
+from src.services.logger_service import LoggerService
+from src.services.metrics_service import MetricsService
+from src.workers.api_worker import ApiWorker
+from src.core.ui_scheduler import UiScheduler
+from src.config.settings import (
+    OUTBOX_REPLAY_INTERVAL_MS,
+    PRELOAD_VIEWS_ON_IDLE,
+    PRELOAD_VIEWS_DELAY_MS,
+)
 
 
 class MainWindow(QMainWindow):
@@ -40,18 +48,22 @@ class MainWindow(QMainWindow):
         # ===============================
         self.stack = QStackedWidget()
 
-        self.activos_view = ActivosView()
-        self.usuarios_view = UsuariosView()
-        self.eipd_view = EipdView()
-        self.rat_view = RatView()
-        self.trazabilidad_view = TrazabilidadView()
-
-        # Stack indexes
-        self.stack.addWidget(self.activos_view)        # 0
-        self.stack.addWidget(self.eipd_view)           # 1
-        self.stack.addWidget(self.usuarios_view)       # 2
-        self.stack.addWidget(self.rat_view)            # 3
-        self.stack.addWidget(self.trazabilidad_view)   # 4
+        # Las vistas se importan, construyen y cargan recién en el primer _navigate;
+        # hasta entonces cada índice del stack tiene un placeholder vacío.
+        # (Módulos listados también en hiddenimports de main.spec.)
+        self._view_factories = [
+            ("activos_view", "src.views.activos.activos_view:ActivosView"),                  # 0
+            ("eipd_view", "src.views.eipd.eipd_view:EipdView"),                              # 1
+            ("usuarios_view", "src.views.usuarios.usuarios_view:UsuariosView"),              # 2
+            ("rat_view", "src.views.rat.rat_view:RatView"),                                  # 3
+            ("trazabilidad_view", "src.views.trazabilidad.trazabilidad_view:TrazabilidadView"),  # 4
+        ]
+        self._built_views = set()
+        self._preload_scheduled = False
+
+        for attr, _ in self._view_factories:
+            setattr(self, attr, None)
+            self.stack.addWidget(QWidget())
 
         # ===============================
         # Layout
@@ -99,7 +111,30 @@ class MainWindow(QMainWindow):
         
         self.sidebar.logout_requested.connect(self._on_logout_requested)
 
+        # ===============================
+        # Reenvío de escrituras offline
+        # ===============================
+        self._outbox_worker = None
+        self.outbox_timer = QTimer(self)
+        self.outbox_timer.timeout.connect(self._replay_outbox)
+        self.outbox_timer.start(OUTBOX_REPLAY_INTERVAL_MS)
+        QTimer.singleShot(0, self._replay_outbox)
+
+        # ===============================
+        # Diagnóstico (oculto): Ctrl+Shift+D
+        # ===============================
+        MetricsService().start_periodic_export()
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self._open_diagnostics)
+
+    def changeEvent(self, event):
+        # Minimizada: se pausan reloj, spinners y recargas hasta volver a mostrarse
+        if event.type() == QEvent.WindowStateChange:
+            UiScheduler.instance().set_suspended(self.isMinimized())
+        super().changeEvent(event)
+
     def _on_logout_requested(self):
+        self.outbox_timer.stop()
         self.close()
         self.logout_signal.emit()
 
@@ -108,5 +143,63 @@ class MainWindow(QMainWindow):
     # ======================================================
 
     def _navigate(self, stack_index: int, sidebar_index: int):
+        self._ensure_view(stack_index)
         self.stack.setCurrentIndex(stack_index)
         self.sidebar.set_active(sidebar_index)
+
+        if PRELOAD_VIEWS_ON_IDLE and not self._preload_scheduled:
+            self._preload_scheduled = True
+            QTimer.singleShot(PRELOAD_VIEWS_DELAY_MS, self._preload_next_view)
+
+    def _ensure_view(self, index: int):
+        if index in self._built_views or not (0 <= index < len(self._view_factories)):
+            return self.stack.widget(index)
+
+        attr, target = self._view_factories[index]
+        module_path, class_name = target.split(":")
+        view = getattr(importlib.import_module(module_path), class_name)()
+        setattr(self, attr, view)
+        self._built_views.add(index)
+
+        current = self.stack.currentIndex()
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, view)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stack.setCurrentIndex(current)
+        return view
+
+    def _preload_next_view(self):
+        # Una vista por tick para no bloquear la UI; se reprograma hasta completar
+        self._preload_scheduled = False
+        pending = [i for i in range(len(self._view_factories)) if i not in self._built_views]
+        if not pending or not self.isVisible():
+            return
+        self._ensure_view(pending[0])
+        if len(pending) > 1:
+            self._preload_scheduled = True
+            QTimer.singleShot(PRELOAD_VIEWS_DELAY_MS, self._preload_next_view)
+
+    def _open_diagnostics(self):
+        from src.views.diagnostics.diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog(self).exec()
+
+    # ======================================================
+    # Outbox
+    # ======================================================
+
+    def _replay_outbox(self):
+        if self._outbox_worker and self._outbox_worker.isRunning():
+            return
+        try:
+            if OutboxService().pending_count() == 0:
+                return
+        except Exception as e:
+            LoggerService().log_error("Error leyendo cola offline", e)
+            return
+
+        self._outbox_worker = ApiWorker(OutboxService().replay, parent=self)
+        self._outbox_worker.error.connect(
+            lambda err: LoggerService().log_error("Error reenviando cola offline", err)
+        )
+        self._outbox_worker.start()
@@ -14,6 +14,7 @@ from PySide6.QtGui import QPixmap
 from src.core.api_client import ApiClient
 from src.components.alert_dialog import AlertDialog
 from src.services.cache_manager import CacheManager
+from src.services.session_service import SessionService
 from utils import icon, resource_path
 
 
@@ -202,6 +203,7 @@ class Sidebar(QWidget):
                 CacheManager().clear()
                 api = ApiClient()
                 api.clear_session()
+                SessionService.instance().clear()
     
             except Exception:
                 pass
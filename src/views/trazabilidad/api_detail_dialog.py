@@ -7,14 +7,141 @@ from PySide6.QtWidgets import (
     QPushButton,
     QWidget,
     QScrollArea,
-    QTableWidget,
-    QTableWidgetItem,
+    QStackedWidget,
+    QTableView,
     QHeaderView,
+    QAbstractItemView,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from functools import lru_cache
 import re
 
 
+ACRONYMS = {"RUN", "RUT", "DV", "AFC", "CIC", "FCS", "API"}
+LIST_CHUNK = 25          # Registros por tanda en la vista de listado
+TABLE_VISIBLE_ROWS = 15  # Alto máximo de cada tabla; el resto se desplaza
+
+
+@lru_cache(maxsize=4096)
+def humanize_label(key):
+    """"DN_NOMBRE_COMPLETO" -> "Nombre Completo" (memoizado: las mismas claves se repiten por fila)."""
+    normalized = re.sub(r"^(DN_|DG_|CD_|ID_)+", "", str(key).upper())
+    tokens = [token for token in normalized.split("_") if token]
+    words = [token if token in ACRONYMS else token.capitalize() for token in tokens]
+    return " ".join(words).strip() or str(key)
+
+
+class DetailTableModel(QAbstractTableModel):
+    """
+    Modelo de solo lectura sobre las filas de la respuesta, sin tope de filas.
+    Las celdas se formatean al pintarse, así que solo se procesan las visibles.
+    """
+
+    def __init__(self, columns, rows, parent=None):
+        super().__init__(parent)
+        self._keys = [col.get("key") for col in columns]
+        self._labels = [col.get("label", col.get("key", "")) for col in columns]
+        self._rows = rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._labels[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            row = self._rows[index.row()]
+            value = row.get(self._keys[index.column()], "") if isinstance(row, dict) else ""
+            return "" if value is None else str(value)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        return None
+
+
+class CollapsibleSection(QFrame):
+    """Tarjeta con cabecera plegable; el contenido se construye al expandir por primera vez."""
+
+    def __init__(self, title, builder, badge=None, expanded=False, parent=None):
+        super().__init__(parent)
+        self._title = title
+        self._builder = builder
+        self._content = None
+
+        self.setObjectName("detailSection")
+        self.setStyleSheet(
+            "QFrame#detailSection {"
+            "  background-color: #ffffff;"
+            "  border: 1px solid #edf2f7;"
+            "  border-radius: 12px;"
+            "}"
+        )
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(16, 10, 16, 12)
+        self._layout.setSpacing(10)
+
+        top = QHBoxLayout()
+        self.btn_toggle = QPushButton()
+        self.btn_toggle.setCursor(Qt.PointingHandCursor)
+        self.btn_toggle.setFlat(True)
+        self.btn_toggle.clicked.connect(self.toggle)
+        self.btn_toggle.setStyleSheet(
+            "QPushButton {"
+            "  color: #0f172a;"
+            "  font-size: 14px;"
+            "  font-weight: 700;"
+            "  text-align: left;"
+            "  border: none;"
+            "  padding: 4px 0;"
+            "}"
+            "QPushButton:hover { color: #006FB3; }"
+        )
+        top.addWidget(self.btn_toggle)
+        top.addStretch()
+
+        if badge:
+            lbl_badge = QLabel(badge)
+            lbl_badge.setStyleSheet(
+                "QLabel {"
+                "  color: #334155;"
+                "  background-color: #eef3f9;"
+                "  border: 1px solid #dde6f0;"
+                "  border-radius: 10px;"
+                "  padding: 3px 10px;"
+                "  font-size: 11px;"
+                "  font-weight: 600;"
+                "}"
+            )
+            top.addWidget(lbl_badge)
+        self._layout.addLayout(top)
+
+        self._expanded = False
+        self.set_expanded(expanded)
+
+    def is_built(self):
+        return self._content is not None
+
+    def toggle(self):
+        self.set_expanded(not self._expanded)
+
+    def set_expanded(self, expanded):
+        self._expanded = expanded
+        if expanded and self._content is None:
+            self._content = self._builder()
+            self._layout.addWidget(self._content)
+        if self._content is not None:
+            self._content.setVisible(expanded)
+        arrow = "▾" if expanded else "▸"
+        self.btn_toggle.setText(f"{arrow}  {self._title}")
+
+
 class ApiDetailDialog(QDialog):
     def __init__(self, data, title="Detalle de Información", parent=None):
         super().__init__(parent)
@@ -106,18 +233,37 @@ class ApiDetailDialog(QDialog):
         content_layout = QVBoxLayout(content_host)
         content_layout.setContentsMargins(22, 18, 22, 18)
 
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setFrameShape(QFrame.NoFrame)
+        # Una página por modo (tabla / listado); se arma la primera vez que se muestra
+        self.body_stack = QStackedWidget()
+        self._mode_pages = {}
+
+        content_layout.addWidget(self.body_stack)
+        self.main_layout.addWidget(content_host)
+
+    def _build_mode_page(self):
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
 
-        self.body = QWidget()
-        self.body_layout = QVBoxLayout(self.body)
+        body = QWidget()
+        self.body_layout = QVBoxLayout(body)
         self.body_layout.setContentsMargins(2, 2, 2, 2)
         self.body_layout.setSpacing(14)
 
-        self.scroll.setWidget(self.body)
-        content_layout.addWidget(self.scroll)
-        self.main_layout.addWidget(content_host)
+        if self.presentacion:
+            if self.current_view_mode == "table":
+                self._render_canonical_table(self.presentacion)
+            else:
+                self._render_canonical_list(self.presentacion)
+        else:
+            if self.current_view_mode == "table":
+                self._render_legacy_table(self.raw_payload)
+            else:
+                self._render_legacy_list(self.raw_payload)
+
+        self.body_layout.addStretch()
+        scroll.setWidget(body)
+        return scroll
 
     def _build_footer(self):
         footer = QFrame()
@@ -147,21 +293,13 @@ class ApiDetailDialog(QDialog):
         self.main_layout.addWidget(footer)
 
     def _refresh_body(self):
-        self._clear_body()
         self._update_toggle_button()
 
-        if self.presentacion:
-            if self.current_view_mode == "table":
-                self._render_canonical_table(self.presentacion)
-            else:
-                self._render_canonical_list(self.presentacion)
-        else:
-            if self.current_view_mode == "table":
-                self._render_legacy_table(self.raw_payload)
-            else:
-                self._render_legacy_list(self.raw_payload)
-
-        self.body_layout.addStretch()
+        page = self._mode_pages.get(self.current_view_mode)
+        if page is None:
+            page = self._mode_pages[self.current_view_mode] = self._build_mode_page()
+            self.body_stack.addWidget(page)
+        self.body_stack.setCurrentWidget(page)
 
     def _toggle_view(self):
         self.current_view_mode = "list" if self.current_view_mode == "table" else "table"
@@ -179,94 +317,74 @@ class ApiDetailDialog(QDialog):
         payload = self.raw_payload.get("data") if isinstance(self.raw_payload, dict) else self.raw_payload
         return isinstance(payload, (list, dict))
 
-    def _clear_body(self):
-        while self.body_layout.count():
-            item = self.body_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-
     def _render_canonical_table(self, model):
         if model.get("template") == "smart_table":
-            self.body_layout.addWidget(self._build_table_section("Resultados", model.get("table")))
+            self.body_layout.addWidget(self._build_table_section("Resultados", model.get("table"), expanded=True))
             return
 
         groups = model.get("groups", [])
         if groups:
             self.body_layout.addWidget(self._build_groups_table(groups))
 
-        for section in model.get("collections", []):
+        for idx, section in enumerate(model.get("collections", [])):
             title = f"{section.get('title', 'Registros')} ({section.get('count', 0)})"
-            self.body_layout.addWidget(self._build_table_section(title, section.get("table")))
+            # Solo la primera colección se materializa al abrir; el resto al expandir
+            self.body_layout.addWidget(self._build_table_section(title, section.get("table"), expanded=idx == 0))
 
         if not groups and not model.get("collections"):
             self.body_layout.addWidget(self._empty("No hay información para visualizar."))
 
     def _render_canonical_list(self, model):
         if model.get("template") == "smart_table":
-            self.body_layout.addWidget(self._build_list_section("Listado", model.get("table")))
+            self.body_layout.addWidget(self._build_list_section("Listado", model.get("table"), expanded=True))
             return
 
         groups = model.get("groups", [])
         if groups:
             self.body_layout.addWidget(self._build_groups_list(groups))
 
-        for section in model.get("collections", []):
+        for idx, section in enumerate(model.get("collections", [])):
             title = f"{section.get('title', 'Registros')} ({section.get('count', 0)})"
-            self.body_layout.addWidget(self._build_list_section(title, section.get("table")))
+            self.body_layout.addWidget(self._build_list_section(title, section.get("table"), expanded=idx == 0))
 
         if not groups and not model.get("collections"):
             self.body_layout.addWidget(self._empty("No hay información para visualizar."))
 
-    def _render_legacy_table(self, data):
+    def _legacy_table_model(self, data):
         payload = data.get("data") if isinstance(data, dict) else data
 
         if isinstance(payload, list) and payload and isinstance(payload[0], dict):
-            columns = sorted(list({k for row in payload if isinstance(row, dict) for k in row.keys()}))
-            table_model = {
+            columns = sorted({k for row in payload if isinstance(row, dict) for k in row.keys()})
+            # Las filas se usan tal cual: el modelo formatea cada celda al pintarla
+            return {
                 "columns": [{"key": col, "label": self._humanize_label(col)} for col in columns],
-                "rows": [{k: self._display(v) for k, v in row.items()} for row in payload],
+                "rows": payload,
             }
-            self.body_layout.addWidget(self._build_table_section("Contenido", table_model))
-            return
 
         if isinstance(payload, dict) and payload:
-            table_model = {
+            return {
                 "columns": [
                     {"key": "campo", "label": "Campo"},
                     {"key": "valor", "label": "Valor"},
                 ],
-                "rows": [{"campo": self._humanize_label(k), "valor": self._display(v)} for k, v in payload.items()],
+                "rows": [{"campo": self._humanize_label(k), "valor": v} for k, v in payload.items()],
             }
-            self.body_layout.addWidget(self._build_table_section("Contenido", table_model))
-            return
-
-        self.body_layout.addWidget(self._empty("No fue posible estructurar la respuesta para su visualización."))
 
-    def _render_legacy_list(self, data):
-        payload = data.get("data") if isinstance(data, dict) else data
+        return None
 
-        if isinstance(payload, list) and payload and isinstance(payload[0], dict):
-            columns = sorted(list({k for row in payload if isinstance(row, dict) for k in row.keys()}))
-            table_model = {
-                "columns": [{"key": col, "label": self._humanize_label(col)} for col in columns],
-                "rows": [{k: self._display(v) for k, v in row.items()} for row in payload],
-            }
-            self.body_layout.addWidget(self._build_list_section("Listado", table_model))
+    def _render_legacy_table(self, data):
+        table_model = self._legacy_table_model(data)
+        if table_model is None:
+            self.body_layout.addWidget(self._empty("No fue posible estructurar la respuesta para su visualización."))
             return
+        self.body_layout.addWidget(self._build_table_section("Contenido", table_model, expanded=True))
 
-        if isinstance(payload, dict) and payload:
-            table_model = {
-                "columns": [
-                    {"key": "campo", "label": "Campo"},
-                    {"key": "valor", "label": "Valor"},
-                ],
-                "rows": [{"campo": self._humanize_label(k), "valor": self._display(v)} for k, v in payload.items()],
-            }
-            self.body_layout.addWidget(self._build_list_section("Listado", table_model))
+    def _render_legacy_list(self, data):
+        table_model = self._legacy_table_model(data)
+        if table_model is None:
+            self.body_layout.addWidget(self._empty("No fue posible estructurar la respuesta para su visualización."))
             return
-
-        self.body_layout.addWidget(self._empty("No fue posible estructurar la respuesta para su visualización."))
+        self.body_layout.addWidget(self._build_list_section("Listado", table_model, expanded=True))
 
     def _build_groups_table(self, groups):
         container = self._section_card()
@@ -274,27 +392,15 @@ class ApiDetailDialog(QDialog):
         layout.setContentsMargins(16, 14, 16, 16)
         layout.setSpacing(12)
 
+        columns = [{"key": "campo", "label": "Campo"}, {"key": "valor", "label": "Valor"}]
         for group in groups:
             title = QLabel(group.get("title", "Sección"))
             title.setStyleSheet("color: #0f172a; font-size: 14px; font-weight: 700;")
             layout.addWidget(title)
 
-            items = group.get("items", [])
-            table = QTableWidget()
-            table.setColumnCount(2)
-            table.setHorizontalHeaderLabels(["Campo", "Valor"])
-            table.setRowCount(len(items))
-            self._configure_resizable_table(table, default_column_width=340)
-            table.setSelectionMode(QTableWidget.NoSelection)
-
-            for i, item in enumerate(items):
-                field = QTableWidgetItem(item.get("label", ""))
-                field.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                value = QTableWidgetItem(self._display(item.get("value", "")))
-                value.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                table.setItem(i, 0, field)
-                table.setItem(i, 1, value)
-
+            rows = [{"campo": item.get("label", ""), "valor": item.get("value", "")} for item in group.get("items", [])]
+            table = self._create_table_view(columns, rows, default_column_width=340)
+            table.setSelectionMode(QAbstractItemView.NoSelection)
             layout.addWidget(table)
 
         return container
@@ -310,116 +416,98 @@ class ApiDetailDialog(QDialog):
             title.setStyleSheet("color: #0f172a; font-size: 14px; font-weight: 700;")
             layout.addWidget(title)
 
-            block = self._list_block(group.get("items", []), show_title=False)
+            items = [
+                {"label": item.get("label", ""), "value": self._display(item.get("value", ""))}
+                for item in group.get("items", [])
+            ]
+            block = self._list_block(items, show_title=False)
             layout.addWidget(block)
 
         return container
 
-    def _build_table_section(self, title, table_model):
-        section = self._section_card()
-        layout = QVBoxLayout(section)
-        layout.setContentsMargins(16, 14, 16, 16)
-        layout.setSpacing(10)
-
-        top = QHBoxLayout()
-
-        lbl = QLabel(title)
-        lbl.setStyleSheet("color: #0f172a; font-size: 14px; font-weight: 700;")
-        top.addWidget(lbl)
-
+    def _build_table_section(self, title, table_model, expanded=False):
         rows_count = len(table_model.get("rows", [])) if table_model else 0
-        badge = QLabel(f"{rows_count} registros")
-        badge.setStyleSheet(
-            "QLabel {"
-            "  color: #334155;"
-            "  background-color: #eef3f9;"
-            "  border: 1px solid #dde6f0;"
-            "  border-radius: 10px;"
-            "  padding: 3px 10px;"
-            "  font-size: 11px;"
-            "  font-weight: 600;"
-            "}"
+        return CollapsibleSection(
+            title,
+            lambda: self._build_table_content(table_model),
+            badge=f"{rows_count} registros",
+            expanded=expanded,
         )
-        top.addStretch()
-        top.addWidget(badge)
-        layout.addLayout(top)
 
+    def _build_table_content(self, table_model):
         if not table_model or not table_model.get("columns"):
-            layout.addWidget(self._empty("Sin registros para esta sección."))
-            return section
+            return self._empty("Sin registros para esta sección.")
+        return self._create_table_view(table_model.get("columns", []), table_model.get("rows", []))
 
-        columns = table_model.get("columns", [])
-        rows = table_model.get("rows", [])
-        max_rows = 200
-        rows_to_render = rows[:max_rows]
-
-        table = QTableWidget()
-        table.setColumnCount(len(columns))
-        table.setRowCount(len(rows_to_render))
-        table.setHorizontalHeaderLabels([col.get("label", col.get("key", "")) for col in columns])
-        self._configure_resizable_table(table)
-
-        for i, row in enumerate(rows_to_render):
-            for j, col in enumerate(columns):
-                key = col.get("key")
-                item = QTableWidgetItem(self._display(row.get(key, "")))
-                item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                table.setItem(i, j, item)
-
-        layout.addWidget(table)
-
-        if len(rows) > max_rows:
-            info = QLabel(f"Mostrando {max_rows} de {len(rows)} registros.")
-            info.setStyleSheet("color: #64748b; font-size: 12px;")
-            layout.addWidget(info)
-
-        return section
-
-    def _build_list_section(self, title, table_model):
-        section = self._section_card()
-        layout = QVBoxLayout(section)
-        layout.setContentsMargins(16, 14, 16, 16)
-        layout.setSpacing(14)
-
-        lbl = QLabel(title)
-        lbl.setStyleSheet("color: #0f172a; font-size: 14px; font-weight: 700;")
-        layout.addWidget(lbl)
+    def _build_list_section(self, title, table_model, expanded=False):
+        return CollapsibleSection(title, lambda: self._build_list_content(table_model), expanded=expanded)
 
+    def _build_list_content(self, table_model):
         if not table_model or not table_model.get("columns"):
-            layout.addWidget(self._empty("Sin registros para esta sección."))
-            return section
+            return self._empty("Sin registros para esta sección.")
 
         columns = table_model.get("columns", [])
         rows = table_model.get("rows", [])
 
-        max_rows = 200
-        rows_to_render = rows[:max_rows]
+        content = QWidget()
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(14)
 
-        for idx, row in enumerate(rows_to_render, start=1):
-            items = [
-                {"label": col.get("label", col.get("key", "")), "value": self._display(row.get(col.get("key"), ""))}
-                for col in columns
-            ]
-            block = self._list_block(items, title=f"Registro {idx}")
-            layout.addWidget(block)
+        btn_more = QPushButton()
+        btn_more.setCursor(Qt.PointingHandCursor)
+        btn_more.setFixedHeight(32)
+        btn_more.setStyleSheet(
+            "QPushButton {"
+            "  background-color: #eef3f9;"
+            "  color: #006FB3;"
+            "  border: 1px solid #dde6f0;"
+            "  border-radius: 8px;"
+            "  padding: 0 14px;"
+            "  font-weight: 600;"
+            "}"
+            "QPushButton:hover { background-color: #e2ebf5; }"
+        )
+        layout.addWidget(btn_more)
+
+        state = {"rendered": 0}
 
-        if len(rows) > max_rows:
-            info = QLabel(f"Mostrando {max_rows} de {len(rows)} registros.")
-            info.setStyleSheet("color: #64748b; font-size: 12px;")
-            layout.addWidget(info)
+        def render_next_chunk():
+            # Los registros se agregan por tandas, antes del botón "Mostrar más"
+            start = state["rendered"]
+            for idx, row in enumerate(rows[start:start + LIST_CHUNK], start=start + 1):
+                items = [
+                    {"label": col.get("label", col.get("key", "")), "value": self._display(row.get(col.get("key"), ""))}
+                    for col in columns
+                ]
+                layout.insertWidget(layout.count() - 1, self._list_block(items, title=f"Registro {idx}"))
+            state["rendered"] = min(len(rows), start + LIST_CHUNK)
 
-        return section
+            remaining = len(rows) - state["rendered"]
+            btn_more.setVisible(remaining > 0)
+            btn_more.setText(f"Mostrar más ({remaining} restantes de {len(rows)})")
+
+        btn_more.clicked.connect(render_next_chunk)
+        render_next_chunk()
+        return content
 
     def _list_block(self, items, title=None, show_title=True):
         block = QFrame()
-        block.setStyleSheet("background-color: #ffffff; border: none;")
+        # Una sola hoja de estilo por bloque; las etiquetas se distinguen por objectName
+        block.setStyleSheet(
+            "QFrame { background-color: #ffffff; border: none; }"
+            "QLabel#listTitle { color: #0f172a; font-size: 12px; font-weight: 700; }"
+            "QLabel#listField { color: #64748b; font-size: 12px; font-weight: 600; }"
+            "QLabel#listValue { color: #0f172a; font-size: 12px; }"
+            "QFrame#listLine { color: #f1f5f9; background-color: #f1f5f9; min-height: 1px; }"
+        )
         layout = QVBoxLayout(block)
         layout.setContentsMargins(4, 4, 4, 4)
         layout.setSpacing(2)
 
         if show_title and title:
             title_lbl = QLabel(title)
-            title_lbl.setStyleSheet("color: #0f172a; font-size: 12px; font-weight: 700;")
+            title_lbl.setObjectName("listTitle")
             layout.addWidget(title_lbl)
 
         for idx, item in enumerate(items):
@@ -427,12 +515,12 @@ class ApiDetailDialog(QDialog):
             row.setSpacing(16)
 
             lbl_field = QLabel(item.get("label", ""))
+            lbl_field.setObjectName("listField")
             lbl_field.setFixedWidth(300)
-            lbl_field.setStyleSheet("color: #64748b; font-size: 12px; font-weight: 600;")
 
             lbl_value = QLabel(item.get("value", ""))
+            lbl_value.setObjectName("listValue")
             lbl_value.setWordWrap(True)
-            lbl_value.setStyleSheet("color: #0f172a; font-size: 12px;")
 
             row.addWidget(lbl_field)
             row.addWidget(lbl_value, 1)
@@ -440,8 +528,8 @@ class ApiDetailDialog(QDialog):
 
             if idx < len(items) - 1:
                 line = QFrame()
+                line.setObjectName("listLine")
                 line.setFrameShape(QFrame.HLine)
-                line.setStyleSheet("color: #f1f5f9; background-color: #f1f5f9; min-height: 1px;")
                 layout.addWidget(line)
 
         return block
@@ -457,33 +545,39 @@ class ApiDetailDialog(QDialog):
         )
         return frame
 
+    def _create_table_view(self, columns, rows, default_column_width=220):
+        table = QTableView()
+        table.setModel(DetailTableModel(columns, rows, table))
+        self._configure_resizable_table(table, default_column_width)
+        return table
+
     def _configure_resizable_table(self, table, default_column_width=220):
         table.verticalHeader().setVisible(False)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
         table.setAlternatingRowColors(True)
         table.setWordWrap(False)
         table.setTextElideMode(Qt.ElideNone)
         table.setShowGrid(False)
         table.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        table.setHorizontalScrollMode(QTableWidget.ScrollPerPixel)
+        table.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
 
         table.setStyleSheet(
-            "QTableWidget {"
+            "QTableView {"
             "  background-color: #ffffff;"
             "  border: 1px solid #dbe4ee;"
             "  border-radius: 10px;"
             "  gridline-color: transparent;"
             "  alternate-background-color: #f8fbff;"
             "}"
-            "QTableWidget::item {"
+            "QTableView::item {"
             "  padding: 8px 10px;"
             "  border-bottom: 1px solid #eef3f8;"
             "  color: #1f2937;"
             "  font-size: 12px;"
             "}"
-            "QTableWidget::item:selected {"
+            "QTableView::item:selected {"
             "  background-color: #e6f1fb;"
             "  color: #111827;"
             "}"
@@ -504,20 +598,30 @@ class ApiDetailDialog(QDialog):
         header.setStretchLastSection(False)
         header.setMinimumSectionSize(120)
 
-        for idx in range(table.columnCount()):
+        for idx in range(table.model().columnCount()):
             table.setColumnWidth(idx, default_column_width)
 
+        # Filas de alto fijo: la vista solo pinta las visibles, sin medir cada fila
+        rows_header = table.verticalHeader()
+        rows_header.setSectionResizeMode(QHeaderView.Fixed)
+        rows_header.setDefaultSectionSize(36)
+        table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+
+        visible_rows = max(1, min(table.model().rowCount(), TABLE_VISIBLE_ROWS))
+        table.setFixedHeight(
+            header.sizeHint().height()
+            + visible_rows * rows_header.defaultSectionSize()
+            + 2 * table.frameWidth()
+            + table.horizontalScrollBar().sizeHint().height()
+        )
+
     def _display(self, value):
         if value is None:
             return ""
         return str(value)
 
     def _humanize_label(self, key):
-        normalized = re.sub(r"^(DN_|DG_|CD_|ID_)+", "", str(key).upper())
-        tokens = [token for token in normalized.split("_") if token]
-        acronyms = {"RUN", "RUT", "DV", "AFC", "CIC", "FCS", "API"}
-        words = [token if token in acronyms else token.capitalize() for token in tokens]
-        return " ".join(words).strip() or str(key)
+        return humanize_label(key)
 
     def _empty(self, text):
         label = QLabel(text)
@@ -1,13 +1,118 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-    QFrame, QMessageBox, QTableWidgetItem, QHeaderView, QStackedWidget
+    QFrame, QMessageBox, QHeaderView, QStackedWidget,
+    QPlainTextEdit, QProgressBar, QTableView, QFileDialog, QAbstractItemView,
+    QStyledItemDelegate, QStyle
 )
-from PySide6.QtCore import Qt
-from src.viewmodels.trazabilidad_viewmodel import TrazabilidadViewModel
-from src.views.trazabilidad.api_detail_dialog import ApiDetailDialog
-from PySide6.QtWidgets import QTableWidget
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, Signal
+from PySide6.QtGui import QStandardItemModel, QStandardItem, QColor, QFont
+from src.viewmodels.trazabilidad_viewmodel import TrazabilidadViewModel, parse_runs
 from utils import icon
 
+
+class TrazabilidadResultsModel(QAbstractTableModel):
+    """Resultados de un RUN; cambiar de RUN es un solo reset del modelo."""
+
+    COLUMNS = [
+        ("origen", "Origen"),
+        ("api_nombre", "Nombre API"),
+        ("tipo", "Tipo"),
+        ("fecha_consulta", "Fecha Consulta"),
+        (None, "Acciones"),
+    ]
+    DEFAULTS = {"tipo": "API"}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows or [])
+        self.endResetModel()
+
+    def row_data(self, row):
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self.COLUMNS[index.column()][0]
+        if role == Qt.DisplayRole:
+            if key is None:
+                return " Ver Contenido"
+            row = self._rows[index.row()]
+            value = row.get(key, self.DEFAULTS.get(key, "")) if isinstance(row, dict) else ""
+            return "" if value is None else str(value)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        return None
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Pinta el botón "Ver Contenido" de cada fila; no hay un QPushButton por fila."""
+
+    clicked = Signal(QModelIndex)
+
+    BUTTON_WIDTH = 150
+    BUTTON_HEIGHT = 34
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._icon = icon("src/resources/icons/file.svg")
+        self._color = QColor("#3b82f6")
+        self._hover_color = QColor("#2563eb")
+        self._font = QFont()
+        self._font.setPixelSize(13)
+
+    def _button_rect(self, cell):
+        width = min(self.BUTTON_WIDTH, cell.width() - 10)
+        return QRect(
+            cell.x() + (cell.width() - width) // 2,
+            cell.y() + (cell.height() - self.BUTTON_HEIGHT) // 2,
+            width,
+            self.BUTTON_HEIGHT,
+        )
+
+    def paint(self, painter, option, index):
+        rect = self._button_rect(option.rect)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self._hover_color if hovered else self._color)
+        painter.drawRoundedRect(rect, 8, 8)
+
+        icon_size = 16
+        text = index.data(Qt.DisplayRole) or ""
+        painter.setFont(self._font)
+        text_width = painter.fontMetrics().horizontalAdvance(text)
+        left = rect.x() + (rect.width() - icon_size - text_width) // 2
+        self._icon.paint(painter, QRect(left, rect.y() + (rect.height() - icon_size) // 2, icon_size, icon_size))
+        painter.setPen(Qt.white)
+        painter.drawText(QRect(left + icon_size, rect.y(), text_width + 2, rect.height()), Qt.AlignVCenter, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if self._button_rect(option.rect).contains(event.position().toPoint()):
+                self.clicked.emit(index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
 class TrazabilidadView(QWidget):
     def __init__(self):
         super().__init__()
@@ -103,6 +208,24 @@ class TrazabilidadView(QWidget):
         card_layout.addWidget(label_run)
         card_layout.addWidget(self.txt_run_card)
         card_layout.addWidget(self.btn_consultar_card)
+
+        self.btn_open_batch = QPushButton("Consulta masiva de RUNs (lista o archivo)")
+        self.btn_open_batch.setCursor(Qt.PointingHandCursor)
+        self.btn_open_batch.setFlat(True)
+        self.btn_open_batch.setStyleSheet("""
+            QPushButton {
+                color: #3b82f6;
+                font-size: 13px;
+                font-weight: 600;
+                border: none;
+                background: transparent;
+            }
+            QPushButton:hover {
+                color: #1d4ed8;
+                text-decoration: underline;
+            }
+        """)
+        card_layout.addWidget(self.btn_open_batch)
         
         search_layout.addWidget(self.card)
         self.stack.addWidget(self.search_state)
@@ -208,10 +331,13 @@ class TrazabilidadView(QWidget):
         """)
         summary_layout.addWidget(self.btn_force_refresh)
         
-        # Grid
-        self.grid = QTableWidget()
-        self.grid.setColumnCount(5)
-        self.grid.setHorizontalHeaderLabels(["Origen", "Nombre API", "Tipo", "Fecha Consulta", "Acciones"])
+        # Grid: modelo + delegate para el botón de acciones
+        self.results_model = TrazabilidadResultsModel(self)
+        self.grid = QTableView()
+        self.grid.setModel(self.results_model)
+        self.action_delegate = ActionButtonDelegate(self.grid)
+        self.grid.setItemDelegateForColumn(4, self.action_delegate)
+        self.grid.setMouseTracking(True) # Hover del botón pintado
         
         # Proportions
         header = self.grid.horizontalHeader()
@@ -225,21 +351,22 @@ class TrazabilidadView(QWidget):
         
         # Row height for buttons
         self.grid.verticalHeader().setVisible(False)
+        self.grid.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.grid.verticalHeader().setDefaultSectionSize(64) # Ample space for buttons
         
         self.grid.setAlternatingRowColors(True)
-        self.grid.setSelectionBehavior(QTableWidget.SelectRows)
-        self.grid.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.grid.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.grid.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.grid.setShowGrid(False)
         self.grid.setWordWrap(True)
         self.grid.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border-radius: 12px;
                 border: 1px solid #e2e8f0;
                 gridline-color: transparent;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 0px; 
                 border-bottom: 1px solid #f1f5f9;
             }
@@ -258,13 +385,168 @@ class TrazabilidadView(QWidget):
         self.results_layout.addWidget(self.grid)
         
         self.stack.addWidget(self.results_state)
+
+        # --- STATE 2: Consulta masiva ---
+        self.batch_state = self._build_batch_page()
+        self.stack.addWidget(self.batch_state)
+
         self.layout.addWidget(self.stack)
 
+    # ===============================
+    # Consulta masiva: UI
+    # ===============================
+    BATCH_COLUMNS = ["RUN", "Estado", "Registros", "APIs", "Detalle"]
+    BATCH_STATUS_COLORS = {
+        "OK": "#15803d",
+        "Sin resultados": "#64748b",
+        "Error": "#dc2626",
+        "Cancelado": "#b45309",
+    }
+
+    def _build_batch_page(self):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(18)
+
+        top_bar = QHBoxLayout()
+        self.btn_batch_back = QPushButton()
+        self.btn_batch_back.setIcon(icon("src/resources/icons/arrow-left.svg"))
+        self.btn_batch_back.setFixedSize(40, 40)
+        self.btn_batch_back.setCursor(Qt.PointingHandCursor)
+        self.btn_batch_back.setStyleSheet(self.btn_back.styleSheet())
+
+        title_layout = QVBoxLayout()
+        title = QLabel("Consulta masiva de Trazabilidad")
+        title.setStyleSheet("color: #0f172a; font-size: 24px; font-weight: bold;")
+        subtitle = QLabel("Pegue RUNs (uno por línea, o separados por coma) o cargue un archivo CSV/TXT")
+        subtitle.setStyleSheet("color: #64748b; font-size: 14px;")
+        title_layout.addWidget(title)
+        title_layout.addWidget(subtitle)
+
+        top_bar.addWidget(self.btn_batch_back)
+        top_bar.addLayout(title_layout)
+        top_bar.addStretch()
+        layout.addLayout(top_bar)
+
+        self.txt_batch_runs = QPlainTextEdit()
+        self.txt_batch_runs.setPlaceholderText("12345678-5\n11111111-1\n...")
+        self.txt_batch_runs.setFixedHeight(120)
+        self.txt_batch_runs.setStyleSheet("""
+            QPlainTextEdit {
+                border: 1px solid #cbd5e1;
+                border-radius: 8px;
+                padding: 8px;
+                background-color: #f8fafc;
+                font-size: 13px;
+                color: #1e293b;
+            }
+        """)
+        layout.addWidget(self.txt_batch_runs)
+
+        button_style = """
+            QPushButton {
+                background-color: %s;
+                color: white;
+                font-weight: bold;
+                border-radius: 8px;
+                padding: 0 16px;
+            }
+            QPushButton:hover {
+                background-color: %s;
+            }
+            QPushButton:disabled {
+                background-color: #94a3b8;
+            }
+        """
+        actions = QHBoxLayout()
+        self.btn_batch_file = QPushButton("Cargar archivo")
+        self.btn_batch_start = QPushButton("Iniciar consulta")
+        self.btn_batch_cancel = QPushButton("Cancelar")
+        self.btn_batch_export = QPushButton("Exportar CSV")
+        for btn, colors in (
+            (self.btn_batch_file, ("#64748b", "#475569")),
+            (self.btn_batch_start, ("#3b82f6", "#2563eb")),
+            (self.btn_batch_cancel, ("#dc2626", "#b91c1c")),
+            (self.btn_batch_export, ("#0f766e", "#115e59")),
+        ):
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setFixedHeight(38)
+            btn.setStyleSheet(button_style % colors)
+        self.btn_batch_cancel.setEnabled(False)
+        self.btn_batch_export.setEnabled(False)
+
+        actions.addWidget(self.btn_batch_file)
+        actions.addWidget(self.btn_batch_start)
+        actions.addWidget(self.btn_batch_cancel)
+        actions.addStretch()
+        actions.addWidget(self.btn_batch_export)
+        layout.addLayout(actions)
+
+        progress_row = QHBoxLayout()
+        self.batch_progress = QProgressBar()
+        self.batch_progress.setFixedHeight(18)
+        self.batch_progress.setTextVisible(True)
+        self.lbl_batch_summary = QLabel("")
+        self.lbl_batch_summary.setStyleSheet("color: #475569; font-size: 13px;")
+        progress_row.addWidget(self.batch_progress, 1)
+        progress_row.addWidget(self.lbl_batch_summary)
+        layout.addLayout(progress_row)
+
+        # Resultados agregados: una fila por RUN, agregada apenas termina su consulta
+        self.batch_model = QStandardItemModel(0, len(self.BATCH_COLUMNS), self)
+        self.batch_model.setHorizontalHeaderLabels(self.BATCH_COLUMNS)
+        self.batch_grid = QTableView()
+        self.batch_grid.setModel(self.batch_model)
+        self.batch_grid.verticalHeader().setVisible(False)
+        self.batch_grid.setAlternatingRowColors(True)
+        self.batch_grid.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.batch_grid.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.batch_grid.setShowGrid(False)
+        self.batch_grid.setSortingEnabled(True)
+        self.batch_grid.setToolTip("Doble clic para ver el detalle del RUN")
+        batch_header = self.batch_grid.horizontalHeader()
+        batch_header.setSectionResizeMode(QHeaderView.Interactive)
+        batch_header.setSectionResizeMode(3, QHeaderView.Stretch)
+        self.batch_grid.setColumnWidth(0, 140)
+        self.batch_grid.setColumnWidth(1, 130)
+        self.batch_grid.setColumnWidth(2, 100)
+        self.batch_grid.setColumnWidth(4, 260)
+        self.batch_grid.setStyleSheet("""
+            QTableView {
+                background-color: white;
+                border-radius: 12px;
+                border: 1px solid #e2e8f0;
+                gridline-color: transparent;
+            }
+            QHeaderView::section {
+                background-color: #f8fafc;
+                padding: 10px;
+                border: none;
+                border-bottom: 2px solid #e2e8f0;
+                font-weight: bold;
+                color: #475569;
+            }
+        """)
+        layout.addWidget(self.batch_grid)
+        return page
+
     def connect_signals(self):
         self.btn_consultar_card.clicked.connect(self.on_consultar)
         self.btn_refresh.clicked.connect(self.on_refresh)
-        self.btn_force_refresh.clicked.connect(self.on_refresh)
+        self.btn_force_refresh.clicked.connect(self.on_force_refresh)
         self.btn_back.clicked.connect(lambda: self.stack.setCurrentIndex(0))
+
+        self.btn_open_batch.clicked.connect(lambda: self.stack.setCurrentIndex(2))
+        self.btn_batch_back.clicked.connect(lambda: self.stack.setCurrentIndex(0))
+        self.btn_batch_file.clicked.connect(self.on_batch_file)
+        self.btn_batch_start.clicked.connect(self.on_batch_start)
+        self.btn_batch_cancel.clicked.connect(self.viewmodel.cancelar_lote)
+        self.btn_batch_export.clicked.connect(self.on_batch_export)
+        self.batch_grid.doubleClicked.connect(self.on_batch_row_activated)
+        self.action_delegate.clicked.connect(
+            lambda index: self.show_detail(self.results_model.row_data(index.row()))
+        )
         
         self.txt_run_card.returnPressed.connect(self.on_consultar)
         self.mini_search_input.returnPressed.connect(self.on_refresh)
@@ -273,17 +555,26 @@ class TrazabilidadView(QWidget):
         self.viewmodel.on_error.connect(self.handle_error)
         self.viewmodel.on_validation_error.connect(self.handle_validation_error)
         self.viewmodel.on_results_ready.connect(self.populate_grid)
+
+        self.viewmodel.on_batch_started.connect(self.handle_batch_started)
+        self.viewmodel.on_batch_result.connect(self.append_batch_row)
+        self.viewmodel.on_batch_progress.connect(self.handle_batch_progress)
+        self.viewmodel.on_batch_finished.connect(self.handle_batch_finished)
         
     def on_consultar(self):
         run = self.txt_run_card.text()
         self.lbl_summary_run.setText(f"Consultando RUN: {run}")
         self.viewmodel.consultar_trazabilidad(run)
         
-    def on_refresh(self):
+    def on_refresh(self, force=False):
         run = self.mini_search_input.text()
         if run:
             self.lbl_summary_run.setText(f"Consultando RUN: {run}")
-            self.viewmodel.consultar_trazabilidad(run)
+            self.viewmodel.consultar_trazabilidad(run, force=force)
+
+    def on_force_refresh(self):
+        # "Refrescar datos" ignora el caché del RUN y vuelve a consultar al backend
+        self.on_refresh(force=True)
         
     def populate_grid(self, results):
         if not results:
@@ -297,47 +588,7 @@ class TrazabilidadView(QWidget):
         current_run = self.mini_search_input.text()
         self.lbl_summary_run.setText(f"Resultados para RUN: {current_run}")
         
-        self.grid.setRowCount(len(results))
-        for i, row_data in enumerate(results):
-            self.grid.setItem(i, 0, self._create_item(row_data.get("origen", "")))
-            self.grid.setItem(i, 1, self._create_item(row_data.get("api_nombre", "")))
-            self.grid.setItem(i, 2, self._create_item(row_data.get("tipo", "API")))
-            self.grid.setItem(i, 3, self._create_item(row_data.get("fecha_consulta", "")))
-            
-            # Action Button
-            btn_container = QWidget()
-            btn_container.setStyleSheet("background: transparent;")
-            btn_layout = QHBoxLayout(btn_container)
-            btn_layout.setContentsMargins(5, 5, 5, 5) 
-            btn_layout.setSpacing(0)
-            btn_layout.setAlignment(Qt.AlignCenter)
-            
-            btn_detail = QPushButton(" Ver Contenido")
-            btn_detail.setIcon(icon("src/resources/icons/file.svg"))
-            btn_detail.setCursor(Qt.PointingHandCursor)
-            btn_detail.setFixedHeight(34)
-            btn_detail.setMinimumWidth(150)
-            btn_detail.setStyleSheet("""
-                QPushButton {
-                    background-color: #3b82f6;
-                    color: white;
-                    border-radius: 8px;
-                    font-size: 13px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #2563eb;
-                }
-            """)
-            btn_detail.clicked.connect(lambda checked=False, row=row_data: self.show_detail(row))
-            btn_layout.addWidget(btn_detail)
-            
-            self.grid.setCellWidget(i, 4, btn_container)
-
-    def _create_item(self, text):
-        it = QTableWidgetItem(text)
-        it.setTextAlignment(Qt.AlignCenter)
-        return it
+        self.results_model.set_rows(results)
 
     def handle_loading(self, is_loading):
         self.btn_consultar_card.setEnabled(not is_loading)
@@ -357,5 +608,101 @@ class TrazabilidadView(QWidget):
 
     def show_detail(self, row_data):
         api_name = row_data.get("api_nombre", "Detalle de API") if isinstance(row_data, dict) else "Detalle de API"
+        # El visor de detalle se carga recién al abrir el primer resultado
+        from src.views.trazabilidad.api_detail_dialog import ApiDetailDialog
         dialog = ApiDetailDialog(row_data, title=api_name, parent=self)
         dialog.exec()
+
+    # ===============================
+    # Consulta masiva: acciones
+    # ===============================
+    def on_batch_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Cargar RUNs", "", "Archivos de RUNs (*.csv *.txt);;Todos los archivos (*)"
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, "rb") as f:
+                raw = f.read()
+            try:
+                text = raw.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                # Exportaciones de Excel en Windows
+                text = raw.decode("latin-1")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo leer el archivo:\n{e}")
+            return
+        self.txt_batch_runs.setPlainText(text)
+
+    def on_batch_start(self):
+        runs, invalidos = parse_runs(self.txt_batch_runs.toPlainText())
+        if invalidos:
+            preview = ", ".join(invalidos[:10]) + (" ..." if len(invalidos) > 10 else "")
+            answer = QMessageBox.question(
+                self, "RUNs inválidos",
+                f"Se omitirán {len(invalidos)} RUN(s) inválidos:\n{preview}\n\n"
+                f"¿Consultar los {len(runs)} RUN(s) válidos?"
+            )
+            if answer != QMessageBox.Yes:
+                return
+        self.viewmodel.consultar_lote(runs)
+
+    def handle_batch_started(self, total):
+        self.batch_model.removeRows(0, self.batch_model.rowCount())
+        self.batch_grid.setSortingEnabled(False) # Filas en orden de llegada mientras corre
+        self.batch_progress.setRange(0, total)
+        self.batch_progress.setValue(0)
+        self.lbl_batch_summary.setText(f"0 / {total}")
+        self.btn_batch_start.setEnabled(False)
+        self.btn_batch_file.setEnabled(False)
+        self.btn_batch_cancel.setEnabled(True)
+        self.btn_batch_export.setEnabled(False)
+
+    def append_batch_row(self, row):
+        color = QColor(self.BATCH_STATUS_COLORS.get(row["estado"], "#1e293b"))
+        values = [row["run"], row["estado"], row["registros"], row["apis"], row["detalle"]]
+        items = []
+        for value in values:
+            item = QStandardItem()
+            item.setData(value, Qt.DisplayRole)
+            items.append(item)
+        items[0].setData(row["run"], Qt.UserRole)
+        items[1].setForeground(color)
+        items[4].setToolTip(row["detalle"])
+        self.batch_model.appendRow(items)
+
+    def handle_batch_progress(self, done, total):
+        self.batch_progress.setValue(done)
+        self.lbl_batch_summary.setText(f"{done} / {total}")
+
+    def handle_batch_finished(self, summary):
+        self.btn_batch_start.setEnabled(True)
+        self.btn_batch_file.setEnabled(True)
+        self.btn_batch_cancel.setEnabled(False)
+        self.btn_batch_export.setEnabled(True)
+        self.batch_grid.setSortingEnabled(True)
+        parts = [f"{estado}: {count}" for estado, count in summary.items() if estado != "total"]
+        self.lbl_batch_summary.setText(f"{summary.get('total', 0)} RUNs — " + ", ".join(parts))
+
+    def on_batch_export(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Exportar CSV", "trazabilidad_masiva.csv", "CSV (*.csv)")
+        if not file_path:
+            return
+        if not file_path.endswith('.csv'):
+            file_path += '.csv'
+        try:
+            self.viewmodel.exportar_lote_csv(file_path)
+            QMessageBox.information(self, "Exportar", "Archivo CSV exportado correctamente.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"No se pudo exportar el archivo:\n{e}")
+
+    def on_batch_row_activated(self, index):
+        # Abre el RUN en la vista de resultados con lo ya consultado, sin volver a llamar al backend
+        run = self.batch_model.index(index.row(), 0).data(Qt.UserRole)
+        row = next((r for r in self.viewmodel.get_batch_results() if r["run"] == run), None)
+        if not row or not row["resultados"]:
+            return
+        self.mini_search_input.setText(run)
+        self.stack.setCurrentIndex(1)
+        self.populate_grid(row["resultados"])
@@ -22,6 +22,7 @@ from src.components.loading_overlay import LoadingOverlay
 from src.core.api_client import ApiClient
 from src.services.cache_manager import CacheManager
 from src.services.user_service import UserService
+from src.services.session_service import SessionService
 from src.workers.api_worker import ApiWorker
 
 
@@ -202,16 +203,11 @@ class UsuariosView(QWidget):
                 "privilege_name_by_code": {},
             }
 
-            me = self.user_service.get_me()
-            me_permissions = self.user_service.get_permissions(str(me["id"]))
-
-            try:
-                privilegios = self.user_service.list_privilegios()
-                result["privilege_name_by_code"] = {
-                    p.get("codigo", ""): p.get("nombre", "") for p in privilegios
-                }
-            except Exception:
-                result["privilege_name_by_code"] = {}
+            # Usuario actual, sus permisos y el catálogo de privilegios vienen del perfil de sesión
+            profile = SessionService.instance().load_blocking()
+            me = profile["user"]
+            me_permissions = profile["permissions"]
+            result["privilege_name_by_code"] = dict(profile.get("privilege_name_by_code") or {})
 
             users = []
             if self.api.is_admin:
@@ -0,0 +1,78 @@
+import unittest
+
+from src.services.catalog_models import CatalogIndex, normalize_text
+
+ENTRIES = [
+    ("Región de Ñuble", 1),
+    ("Región Metropolitana de Santiago", 2),
+    ("Región de Valparaíso", 3),
+    ("Región del Biobío", 4),
+    ("Araucanía", 5),
+    ("Santa Cruz", 6),
+]
+
+
+class NormalizeTextTest(unittest.TestCase):
+
+    def test_accents_and_case(self):
+        self.assertEqual(normalize_text("Región de Ñuble"), "region de nuble")
+        self.assertEqual(normalize_text("VALPARAÍSO"), "valparaiso")
+        self.assertEqual(normalize_text(None), "")
+
+
+class CatalogIndexSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = CatalogIndex(ENTRIES)
+
+    def _ids(self, query):
+        rows = self.index.search(query)
+        return None if rows is None else [self.index.ids[r] for r in rows]
+
+    def test_empty_query_means_no_filter(self):
+        self.assertIsNone(self.index.search(""))
+        self.assertIsNone(self.index.search("   "))
+
+    def test_accent_and_case_insensitive(self):
+        self.assertEqual(self._ids("ÑUBLE"), [1])
+        self.assertEqual(self._ids("valparaíso"), [3])
+        self.assertEqual(self._ids("ARAUCANIA"), [5])
+
+    def test_prefix_hits_short_tokens(self):
+        # 1-2 caracteres: solo prefijo de palabra (bisect)
+        self.assertEqual(self._ids("sa"), [2, 6])
+        self.assertEqual(self._ids("ñ"), [1])
+        self.assertEqual(self._ids("c"), [6])
+
+    def test_substring_hits_with_trigrams(self):
+        self.assertEqual(self._ids("bio"), [4])        # prefijo y subcadena de "biobio"
+        self.assertEqual(self._ids("paraiso"), [3])
+        self.assertEqual(self._ids("tiago"), [2])
+        self.assertEqual(self._ids("cania"), [5])
+
+    def test_every_token_must_match(self):
+        self.assertEqual(self._ids("region sant"), [2])
+        self.assertEqual(self._ids("de bio"), [4])
+        self.assertEqual(self._ids("santa cruz"), [6])
+
+    def test_trigrams_present_but_not_contiguous(self):
+        # "egion" y "ion" están, pero "egionx" no existe en ninguna palabra
+        self.assertEqual(self._ids("egionx"), [])
+        # todos los trigramas de "biobiob" existen en "biobio", la cadena no
+        self.assertEqual(self._ids("biobiob"), [])
+
+    def test_no_match(self):
+        self.assertEqual(self._ids("xyz"), [])
+        self.assertEqual(self._ids("q"), [])
+        self.assertEqual(self._ids("nuble xyz"), [])
+
+    def test_results_follow_catalog_order(self):
+        self.assertEqual(self._ids("region"), [1, 2, 3, 4])
+
+    def test_row_by_key(self):
+        self.assertEqual(self.index.row_by_key["3"], 2)
+        self.assertEqual(self.index.labels[0], "Región de Ñuble")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from src.core.api_client import ApiClient
+from src.core.resilience import CircuitBreaker, CircuitOpenError
+
+
+def _response(status):
+    response = requests.models.Response()
+    response.status_code = status
+    response.url = "http://backend.test/x"
+    return response
+
+
+class HalfOpenProbeTest(unittest.TestCase):
+    """Una prueba half-open debe liberar el circuito por cualquier vía de salida."""
+
+    HOST = "backend.test"
+    URL = "http://backend.test/x"
+
+    def setUp(self):
+        self.client = ApiClient()
+        self.original_breaker = self.client.breaker
+        self.client.breaker = CircuitBreaker(threshold=1, cooldown=30.0)
+        self._open_and_expire()
+
+    def tearDown(self):
+        self.client.breaker = self.original_breaker
+
+    def _open_and_expire(self):
+        self.client.breaker.record_failure(self.HOST)
+        self.client.breaker._hosts[self.HOST]["opened_at"] = time.monotonic() - 31.0
+
+    def _expire(self):
+        self.client.breaker._hosts[self.HOST]["opened_at"] = time.monotonic() - 31.0
+
+    def _call(self, side_effect):
+        with mock.patch("src.core.api_client.requests.request", side_effect=side_effect), \
+                mock.patch("src.core.api_client.time.sleep"):
+            return self.client._request("POST", self.URL)
+
+    def test_probe_with_non_retryable_5xx_reopens_and_recovers(self):
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self._call([_response(500)])
+        # El fallo de la prueba reabre el circuito (no queda "probing" colgado)
+        self.assertTrue(self.client.breaker.is_open(self.HOST))
+
+        self._expire()
+        self.assertEqual(self._call([_response(200)]).status_code, 200)
+        self.assertEqual(self._call([_response(200)]).status_code, 200)
+        self.assertFalse(self.client.breaker.is_open(self.HOST))
+
+    def test_probe_with_non_transport_exception_releases_probe(self):
+        with self.assertRaises(requests.exceptions.InvalidURL):
+            self._call(requests.exceptions.InvalidURL("bad"))
+        self.assertFalse(self.client.breaker._hosts[self.HOST]["probing"])
+
+        self._expire()
+        self.assertEqual(self._call([_response(200)]).status_code, 200)
+
+    def test_probe_with_unexpected_exception_releases_probe(self):
+        with self.assertRaises(ValueError):
+            self._call(ValueError("boom"))
+        self.assertFalse(self.client.breaker._hosts[self.HOST]["probing"])
+        self.assertEqual(self._call([_response(200)]).status_code, 200)
+
+    def test_concurrent_probe_fails_fast(self):
+        self.client.breaker.before_request(self.HOST)
+        with self.assertRaises(CircuitOpenError):
+            self.client.breaker.before_request(self.HOST)
+
+
+if __name__ == "__main__":
+    unittest.main()
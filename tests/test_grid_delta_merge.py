@@ -0,0 +1,130 @@
+import os
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from src.components.generic_grid_view import GenericGridView
+
+SYNC = {
+    "habilitado": True,
+    "param_desde": "updated_since",
+    "campo_token": "sync_token",
+    "campo_eliminados": "deleted_ids",
+}
+
+
+class FakeApi:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get(self, url):
+        self.calls.append(url)
+        query = parse_qs(urlsplit(url).query)
+        return self.responses["delta" if "updated_since" in query else "full"]
+
+
+class GridStub:
+    """Solo lo que usan _fetch_listado/_merge_delta; sin widgets."""
+
+    _fetch_listado = GenericGridView._fetch_listado
+    _build_sync_store = GenericGridView._build_sync_store
+    _merge_delta = GenericGridView._merge_delta
+    _sync_config = GenericGridView._sync_config
+
+    def __init__(self, responses):
+        self.config = {
+            "campo_id": "id",
+            "endpoints": {"listado": "/rat"},
+            "sincronizacion": SYNC,
+        }
+        self.api = FakeApi(responses)
+
+
+def _row(record_id, nombre):
+    return {"id": record_id, "nombre": nombre}
+
+
+class MergeDeltaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = {
+            "query": "page=1&size=3",
+            "token": "t1",
+            "items": [_row(1, "a"), _row(2, "b"), _row(3, "c")],
+            "pages": 4,
+        }
+
+    def _merge(self, delta):
+        return GridStub({})._merge_delta(self.store, delta, SYNC)
+
+    def test_updated_row_replaces_in_place(self):
+        result = self._merge({"sync_token": "t2", "items": [_row(2, "B")]})
+
+        self.assertEqual(result["listado"]["items"], [_row(1, "a"), _row(2, "B"), _row(3, "c")])
+        self.assertEqual(result["sync"]["token"], "t2")
+        self.assertEqual(result["sync"]["items"], result["listado"]["items"])
+
+    def test_rows_and_pages_outside_the_delta_are_kept(self):
+        # "pages" del delta pagina los cambios, no el listado
+        result = self._merge({"sync_token": "t2", "items": [], "pages": 1})
+
+        self.assertEqual(result["listado"]["items"], self.store["items"])
+        self.assertEqual(result["listado"]["pages"], 4)
+        self.assertEqual(result["sync"]["pages"], 4)
+
+    def test_store_is_not_mutated(self):
+        self._merge({"sync_token": "t2", "items": [_row(1, "A")]})
+        self.assertEqual(self.store["items"][0], _row(1, "a"))
+
+    def test_deleted_row_is_removed_on_single_page(self):
+        self.store["pages"] = 1
+        result = self._merge({"sync_token": "t2", "items": [], "deleted_ids": [2]})
+
+        self.assertEqual(result["listado"]["items"], [_row(1, "a"), _row(3, "c")])
+
+    def test_deleted_row_with_more_pages_needs_full_fetch(self):
+        # La página siguiente correría una fila hacia esta
+        self.assertIsNone(self._merge({"sync_token": "t2", "items": [], "deleted_ids": [2]}))
+
+    def test_deleted_row_from_another_page_is_ignored(self):
+        result = self._merge({"sync_token": "t2", "items": [], "deleted_ids": [99]})
+        self.assertEqual(result["listado"]["items"], self.store["items"])
+
+    def test_new_row_needs_full_fetch(self):
+        self.assertIsNone(self._merge({"sync_token": "t2", "items": [_row(4, "d")]}))
+
+    def test_paginated_delta_or_missing_token_needs_full_fetch(self):
+        self.assertIsNone(self._merge({"sync_token": "t2", "items": [], "pages": 2}))
+        self.assertIsNone(self._merge({"items": [_row(2, "B")]}))
+        self.assertIsNone(self._merge([_row(2, "B")]))
+
+
+class FetchListadoTest(unittest.TestCase):
+
+    def test_new_row_is_inserted_through_full_fetch(self):
+        full = {"items": [_row(4, "d"), _row(1, "a")], "pages": 2, "sync_token": "t3"}
+        grid = GridStub({"delta": {"sync_token": "t2", "items": [_row(4, "d")]}, "full": full})
+        store = {"query": "page=1&size=2", "token": "t1", "items": [_row(1, "a")], "pages": 2}
+
+        result = grid._fetch_listado({"page": 1, "size": 2}, store)
+
+        self.assertEqual(len(grid.api.calls), 2)
+        self.assertEqual(result["listado"], full)
+        self.assertEqual(result["sync"]["items"], full["items"])
+        self.assertEqual(result["sync"]["token"], "t3")
+
+    def test_delta_applied_without_full_fetch(self):
+        grid = GridStub({"delta": {"sync_token": "t2", "items": [_row(1, "A")]}})
+        store = {"query": "page=1&size=2", "token": "t1", "items": [_row(1, "a")], "pages": 2}
+
+        result = grid._fetch_listado({"page": 1, "size": 2}, store)
+
+        self.assertEqual(len(grid.api.calls), 1)
+        self.assertIn("updated_since=t1", grid.api.calls[0])
+        self.assertEqual(result["listado"], {"items": [_row(1, "A")], "pages": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from src.core.api_client import ApiClient
+from src.services.outbox_service import OutboxService
+
+
+def _http_error(status):
+    response = requests.models.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status}", response=response)
+
+
+class OutboxServiceTest(unittest.TestCase):
+    """Cola offline sobre una base SQLite temporal (el singleton se rearma por test)."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.previous_instance = OutboxService._instance
+        OutboxService._instance = None
+        with mock.patch(
+            "src.services.outbox_service.QStandardPaths.writableLocation", return_value=self.tmp_dir
+        ):
+            self.outbox = OutboxService()
+
+        self.api = ApiClient()
+        self.previous_user = self.api.user_id
+        self.api.set_user_id("u-test")
+
+        self.sent = []
+        patcher = mock.patch.multiple(
+            ApiClient,
+            put=mock.DEFAULT, post=mock.DEFAULT, patch=mock.DEFAULT,
+        )
+        mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        for method, api_mock in mocks.items():
+            api_mock.side_effect = self._recorder(method.upper())
+        self.responses = []
+
+    def tearDown(self):
+        self.outbox._conn.close()
+        OutboxService._instance = self.previous_instance
+        self.api.set_user_id(self.previous_user)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _recorder(self, method):
+        def call(path, payload, headers=None):
+            outcome = self.responses.pop(0) if self.responses else None
+            if isinstance(outcome, Exception):
+                raise outcome
+            self.sent.append((method, path, payload, headers["Idempotency-Key"]))
+            return {}
+        return call
+
+    def _enqueue_edit(self, record_id, payload):
+        return self.outbox.enqueue(
+            "PUT", f"/activos/{record_id}", payload,
+            endpoint="/activos", record_id=record_id, draft_values=payload,
+        )
+
+    def _draft(self, record_id):
+        return self.outbox.get_draft(OutboxService.draft_key_for("/activos", record_id))
+
+    def test_enqueue_keeps_order_and_replay_sends_in_order(self):
+        keys = [
+            self._enqueue_edit(1, {"v": 1}),
+            self.outbox.enqueue("POST", "/activos", {"v": 2}, endpoint="/activos"),
+            self._enqueue_edit(3, {"v": 3}),
+        ]
+
+        self.assertEqual([e["idempotency_key"] for e in self.outbox.pending()], keys)
+        self.assertEqual(self.outbox.replay(), (3, 0))
+        self.assertEqual([s[3] for s in self.sent], keys)
+        self.assertEqual([s[0] for s in self.sent], ["PUT", "POST", "PUT"])
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+    def test_replay_stops_on_connection_error_and_keeps_entries(self):
+        self._enqueue_edit(1, {"v": 1})
+        self._enqueue_edit(2, {"v": 2})
+        self.responses = [requests.exceptions.ConnectionError("sin red")]
+
+        self.assertEqual(self.outbox.replay(), (0, 0))
+        pending = self.outbox.pending()
+        self.assertEqual(len(pending), 2)
+        self.assertEqual(pending[0]["attempts"], 1)
+        self.assertEqual(pending[1]["attempts"], 0)
+        self.assertEqual(self._draft(1), {"v": 1})
+
+    def test_replay_stops_on_5xx_and_transient_4xx(self):
+        for status in (503, 401, 403, 408, 429):
+            with self.subTest(status=status):
+                self.outbox.discard_draft(OutboxService.draft_key_for("/activos", 1))
+                self._enqueue_edit(1, {"v": status})
+                self.responses = [_http_error(status)]
+
+                self.assertEqual(self.outbox.replay(), (0, 0))
+                self.assertEqual(self.outbox.pending_count(), 1)
+                self.assertEqual(self._draft(1), {"v": status})
+
+    def test_validation_rejection_fails_entry_and_continues(self):
+        self._enqueue_edit(1, {"v": 1})
+        self._enqueue_edit(2, {"v": 2})
+        self.responses = [_http_error(422)]
+
+        self.assertEqual(self.outbox.replay(), (1, 1))
+        self.assertEqual(self.outbox.pending_count(), 0)
+        self.assertIsNone(self._draft(1))
+        self.assertEqual([s[1] for s in self.sent], ["/activos/2"])
+
+    def test_mark_sent_deletes_draft_only_for_its_own_write(self):
+        self._enqueue_edit(1, {"v": 1})
+        self._enqueue_edit(1, {"v": 2})
+        self.responses = [None, requests.exceptions.ConnectionError("sin red")]
+
+        self.assertEqual(self.outbox.replay(), (1, 0))
+        # El borrador pertenece a la segunda edición, que sigue pendiente
+        self.assertEqual(self._draft(1), {"v": 2})
+
+        self.assertEqual(self.outbox.replay(), (1, 0))
+        self.assertIsNone(self._draft(1))
+
+    def test_discard_draft_drops_draft_and_pending_writes_of_that_record(self):
+        self._enqueue_edit(1, {"v": 1})
+        self._enqueue_edit(2, {"v": 2})
+
+        self.outbox.discard_draft(OutboxService.draft_key_for("/activos", 1))
+
+        self.assertIsNone(self._draft(1))
+        self.assertEqual(self._draft(2), {"v": 2})
+        self.assertEqual([e["path"] for e in self.outbox.pending()], ["/activos/2"])
+
+    def test_replay_filtered_by_draft_key(self):
+        self._enqueue_edit(1, {"v": 1})
+        self._enqueue_edit(2, {"v": 2})
+
+        sent, failed = self.outbox.replay(
+            draft_key=OutboxService.draft_key_for("/activos", 2), blocking=True
+        )
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual([e["path"] for e in self.outbox.pending()], ["/activos/1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
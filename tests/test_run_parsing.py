@@ -0,0 +1,64 @@
+import unittest
+
+from src.viewmodels.trazabilidad_viewmodel import normalize_run, parse_runs, run_dv_valido
+
+
+class NormalizeRunTest(unittest.TestCase):
+
+    def test_dotted_and_lowercase_k(self):
+        self.assertEqual(normalize_run("12.345.678-5"), "12345678-5")
+        self.assertEqual(normalize_run(" 5.000.001-k "), "5000001-K")
+        self.assertEqual(normalize_run('"5000001K"'), "5000001-K")
+
+    def test_leading_zeros_are_dropped(self):
+        self.assertEqual(normalize_run("012345678-5"), None)   # más de 8 dígitos
+        self.assertEqual(normalize_run("00012345-3"), "12345-3")
+
+    def test_not_a_run(self):
+        for value in ("", None, "abc", "12.345.678-X", "1234567890-1", "-5"):
+            with self.subTest(value=value):
+                self.assertIsNone(normalize_run(value))
+
+
+class RunDvTest(unittest.TestCase):
+
+    def test_valid_dvs(self):
+        for run in ("12345678-5", "11111111-1", "5000001-K", "1-9"):
+            with self.subTest(run=run):
+                self.assertTrue(run_dv_valido(run))
+
+    def test_invalid_dvs(self):
+        for run in ("12345678-4", "5000001-0", "11111111-K"):
+            with self.subTest(run=run):
+                self.assertFalse(run_dv_valido(run))
+
+
+class ParseRunsTest(unittest.TestCase):
+
+    def test_mixed_separators(self):
+        text = "12.345.678-5, 11111111-1\n5000001-k;1-9 | 5000015-K\r\n"
+        validos, invalidos = parse_runs(text)
+        self.assertEqual(validos, ["12345678-5", "11111111-1", "5000001-K", "1-9", "5000015-K"])
+        self.assertEqual(invalidos, [])
+
+    def test_duplicates_are_kept_once_in_first_seen_order(self):
+        validos, _ = parse_runs("11111111-1\n12.345.678-5\n11.111.111-1\n12345678-5")
+        self.assertEqual(validos, ["11111111-1", "12345678-5"])
+
+    def test_invalid_dv_and_malformed_go_to_invalidos_as_typed(self):
+        validos, invalidos = parse_runs("12.345.678-4,hola\n5000001-K")
+        self.assertEqual(validos, ["5000001-K"])
+        self.assertEqual(invalidos, ["12.345.678-4", "hola"])
+
+    def test_csv_header_and_quotes(self):
+        validos, invalidos = parse_runs('run\n"12.345.678-5"\n\'11111111-1\'')
+        self.assertEqual(validos, ["12345678-5", "11111111-1"])
+        self.assertEqual(invalidos, [])
+
+    def test_empty_input(self):
+        self.assertEqual(parse_runs(""), ([], []))
+        self.assertEqual(parse_runs(None), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
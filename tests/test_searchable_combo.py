@@ -0,0 +1,71 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QModelIndex
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+from src.components.custom_inputs import SearchableComboBox
+from src.services.catalog_models import CatalogModelRegistry
+
+CATALOGO = [
+    {"id": 10, "nombre": "Región de Ñuble"},
+    {"id": 20, "nombre": "Región Metropolitana de Santiago"},
+    {"id": 30, "nombre": "Región de Valparaíso"},
+    {"id": 40, "nombre": "Región del Biobío"},
+]
+
+
+class SearchableComboBoxTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.combo = SearchableComboBox()
+        model = CatalogModelRegistry.instance().model_for("test_regiones", CATALOGO)
+        self.combo.setModel(model)
+        self.combo.setCurrentIndex(0)
+        self.combo.show()
+
+    def tearDown(self):
+        self.combo.hidePopup()
+        self.combo.close()
+        self.combo.deleteLater()
+        CatalogModelRegistry.instance().invalidate("test_regiones")
+
+    def _completion_labels(self):
+        model = self.combo.completer().completionModel()
+        return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+    def test_completer_uses_filter_after_set_model(self):
+        self.assertIs(self.combo.completer().model(), self.combo._filter)
+
+    def test_typing_narrows_popup(self):
+        self.combo.lineEdit().clear()
+        QTest.keyClicks(self.combo.lineEdit(), "valpa")
+        self.assertEqual(self._completion_labels(), ["Región de Valparaíso"])
+
+        self.combo.lineEdit().clear()
+        QTest.keyClicks(self.combo.lineEdit(), "nuble")
+        self.assertEqual(self._completion_labels(), ["Región de Ñuble"])
+
+    def test_picking_entry_sets_current_data(self):
+        self.combo.lineEdit().clear()
+        QTest.keyClicks(self.combo.lineEdit(), "bio")
+        completion = self.combo.completer().completionModel()
+        self.assertEqual(completion.rowCount(), 1)
+
+        self.combo.completer().activated[QModelIndex].emit(completion.index(0, 0))
+        self.assertEqual(self.combo.currentData(), 40)
+        QApplication.processEvents()
+        self.assertEqual(self.combo.currentData(), 40)
+        self.assertEqual(self.combo.lineEdit().text(), "Región del Biobío")
+        self.assertEqual(self.combo._filter.rowCount(), len(CATALOGO))
+
+
+if __name__ == "__main__":
+    unittest.main()